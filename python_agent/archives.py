@@ -0,0 +1,67 @@
+"""
+Archives Module
+Streams resume files out of zip and tar bundles without unpacking them to disk
+"""
+
+import tarfile
+import zipfile
+from pathlib import Path, PurePosixPath
+from typing import Iterator, List, Optional, Tuple
+
+ARCHIVE_SUFFIXES = ('.zip', '.tar', '.tar.gz', '.tgz', '.tar.bz2', '.tbz2', '.tar.xz', '.txz')
+
+
+def is_archive(path: Path) -> bool:
+    """Return True if a path names a supported archive"""
+    name = path.name.lower()
+    return path.is_file() and name.endswith(ARCHIVE_SUFFIXES)
+
+
+def _wanted(member_name: str, extensions: List[str]) -> bool:
+    path = PurePosixPath(member_name)
+    # Skip resource forks and metadata that macOS adds to zips
+    if path.name.startswith('._') or '__MACOSX' in path.parts:
+        return False
+    return path.suffix.lower().lstrip('.') in extensions
+
+
+def _read_limited(stream, size: int, limit: int, member_name: str) -> bytes:
+    # Declared sizes can lie (zip bombs), so the read itself is bounded too
+    if size > limit:
+        raise ValueError(f"{member_name} is {size / 1024 / 1024:.1f} MB, over the resume size limit")
+    data = stream.read(limit + 1)
+    if len(data) > limit:
+        raise ValueError(f"{member_name} expands past the resume size limit")
+    return data
+
+
+def iterate_archive(archive_path: Path, extensions: List[str],
+                    max_member_bytes: int) -> Iterator[Tuple[Path, Optional[bytes], Optional[Exception]]]:
+    """Yield (path, data, error) for resume members, one member in memory at a time
+
+    Paths are archive_path/member_name; they are never created on disk.
+    """
+    if archive_path.name.lower().endswith('.zip'):
+        with zipfile.ZipFile(archive_path) as archive:
+            for info in archive.infolist():
+                if info.is_dir() or not _wanted(info.filename, extensions):
+                    continue
+                try:
+                    with archive.open(info) as stream:
+                        data = _read_limited(stream, info.file_size, max_member_bytes, info.filename)
+                    yield archive_path / info.filename, data, None
+                except Exception as e:
+                    yield archive_path / info.filename, None, e
+        return
+
+    # Stream mode reads compressed tars front to back without seeking
+    with tarfile.open(archive_path, 'r|*') as archive:
+        for member in archive:
+            if not member.isfile() or not _wanted(member.name, extensions):
+                continue
+            try:
+                stream = archive.extractfile(member)
+                data = _read_limited(stream, member.size, max_member_bytes, member.name)
+                yield archive_path / member.name, data, None
+            except Exception as e:
+                yield archive_path / member.name, None, e
@@ -0,0 +1,197 @@
+"""
+Candidate Index Module
+Hashed TF-IDF + SVD candidate vectors in a persisted IVF index for job-to-candidate search
+"""
+
+import time
+import logging
+from pathlib import Path
+from typing import Dict, List, Any, Iterable, Optional, Tuple
+
+import numpy as np
+from sklearn.decomposition import TruncatedSVD
+from sklearn.feature_extraction.text import HashingVectorizer, TfidfTransformer
+
+from results_index import write_indexed_results, ResultsReader
+from skills_taxonomy import SkillsTaxonomy
+from text_corpus import TextCorpus, candidate_text
+
+# Bump when the on-disk index layout changes
+INDEX_FORMAT_VERSION = 1
+
+# Resume texts of the indexed candidates, when built with the corpus enabled
+CORPUS_FILE = 'texts.bin'
+
+
+def candidate_document(candidate: Dict[str, Any], corpus: Optional[TextCorpus] = None,
+                       skill_weight: int = 3) -> str:
+    """Text a candidate is embedded from: resume text plus boosted skill ID tokens"""
+    skill_tokens = " ".join(f"skill_{skill_id}" for skill_id in candidate.get('skill_ids', []))
+    return " ".join([candidate_text(candidate, corpus), *[skill_tokens] * skill_weight])
+
+
+def job_document(job_description: Dict[str, Any], taxonomy: SkillsTaxonomy, skill_weight: int = 3) -> str:
+    """Text a job description is embedded from, using the same skill ID tokens"""
+    parts = [job_description.get('title', ''), job_description.get('description', ''),
+             *job_description.get('requirements', []), *job_description.get('preferredSkills', [])]
+    text = "\n".join(parts)
+    skill_tokens = " ".join(f"skill_{skill_id}" for skill_id in sorted(taxonomy.find_ids(text)))
+    return " ".join([text, *[skill_tokens] * skill_weight])
+
+
+class CandidateEmbedder:
+    """Offline embedding: hashed term counts, TF-IDF weighting, SVD to a dense unit vector"""
+
+    def __init__(self, n_features: int = 1 << 15, dimensions: int = 128):
+        self.n_features = n_features
+        self.dimensions = dimensions
+        self._hasher = HashingVectorizer(n_features=n_features, alternate_sign=False, norm=None,
+                                         ngram_range=(1, 1), dtype=np.float32)
+        self._tfidf = TfidfTransformer(sublinear_tf=True)
+        self._svd: Optional[TruncatedSVD] = None
+
+    def fit_transform(self, documents: Iterable[str]) -> np.ndarray:
+        """Fit IDF weights and the SVD projection on a corpus and embed it"""
+        weighted = self._tfidf.fit_transform(self._hasher.transform(documents))
+        dimensions = max(1, min(self.dimensions, weighted.shape[0] - 1, weighted.shape[1] - 1))
+        self._svd = TruncatedSVD(n_components=dimensions, random_state=0)
+        return self._normalize(self._svd.fit_transform(weighted))
+
+    def transform(self, documents: Iterable[str]) -> np.ndarray:
+        """Embed documents with the fitted weights and projection"""
+        return self._normalize(self._svd.transform(self._tfidf.transform(self._hasher.transform(documents))))
+
+    @staticmethod
+    def _normalize(vectors: np.ndarray) -> np.ndarray:
+        vectors = np.asarray(vectors, dtype=np.float32)
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        return vectors / np.maximum(norms, 1e-12)
+
+    def state(self) -> Dict[str, np.ndarray]:
+        return {'idf': self._tfidf.idf_.astype(np.float32),
+                'components': self._svd.components_.astype(np.float32),
+                'n_features': np.array(self.n_features)}
+
+    @classmethod
+    def from_state(cls, state: Dict[str, np.ndarray]) -> 'CandidateEmbedder':
+        components = state['components']
+        embedder = cls(int(state['n_features']), components.shape[0])
+        embedder._tfidf.idf_ = state['idf']
+        embedder._svd = TruncatedSVD(n_components=components.shape[0])
+        embedder._svd.components_ = components
+        return embedder
+
+
+def spherical_kmeans(vectors: np.ndarray, clusters: int, iterations: int = 10,
+                     sample_size: int = 20000, seed: int = 0) -> np.ndarray:
+    """Cosine k-means on unit vectors; returns unit centroids"""
+    rng = np.random.RandomState(seed)
+    sample = vectors[rng.choice(len(vectors), min(sample_size, len(vectors)), replace=False)]
+    centroids = sample[rng.choice(len(sample), clusters, replace=False)].copy()
+
+    for _ in range(iterations):
+        assignment = np.argmax(sample @ centroids.T, axis=1)
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, assignment, sample)
+        empty = ~sums.any(axis=1)
+        # Empty clusters are reseeded from random sample points
+        sums[empty] = sample[rng.choice(len(sample), int(empty.sum()))]
+        centroids = sums / np.maximum(np.linalg.norm(sums, axis=1, keepdims=True), 1e-12)
+
+    return centroids.astype(np.float32)
+
+
+class CandidateIndex:
+    """Inverted-file (IVF) index over candidate vectors, stored list by list on disk"""
+
+    def __init__(self, embedder: CandidateEmbedder, vectors: np.ndarray, rows: np.ndarray,
+                 centroids: np.ndarray, list_offsets: np.ndarray, records: Optional[ResultsReader] = None):
+        self.logger = logging.getLogger(__name__)
+        self.embedder = embedder
+        self.vectors = vectors            # in inverted-list order
+        self.rows = rows                  # list position -> candidate row
+        self.centroids = centroids
+        self.list_offsets = list_offsets  # list i spans list_offsets[i]:list_offsets[i + 1]
+        self.records = records
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    @classmethod
+    def build(cls, documents: List[str], config: Dict[str, Any]) -> 'CandidateIndex':
+        """Embed documents and partition them into inverted lists"""
+        index_config = config.get('candidate_index', {})
+        embedder = CandidateEmbedder(index_config.get('n_features', 1 << 15), index_config.get('dimensions', 128))
+        vectors = embedder.fit_transform(documents)
+
+        # About sqrt(n) lists balances scanning centroids against scanning list members
+        lists = index_config.get('lists') or int(np.sqrt(len(vectors)))
+        lists = max(1, min(lists, len(vectors)))
+        centroids = spherical_kmeans(vectors, lists)
+
+        assignment = np.argmax(vectors @ centroids.T, axis=1)
+        rows = np.argsort(assignment, kind='stable')
+        list_offsets = np.concatenate([[0], np.cumsum(np.bincount(assignment, minlength=lists))])
+        return cls(embedder, vectors[rows], rows, centroids, list_offsets)
+
+    def search(self, query: np.ndarray, k: int, nprobe: int = 32) -> Tuple[np.ndarray, np.ndarray]:
+        """Approximate top-k candidate rows and cosine similarities for one query vector"""
+        order = np.argsort(-(self.centroids @ query))
+
+        # Probe at least nprobe lists, and more until there are a few times k vectors to choose from
+        wanted = min(len(self.rows), 4 * k)
+        sizes = np.diff(self.list_offsets)[order]
+        probes = max(nprobe, int(np.searchsorted(np.cumsum(sizes), wanted)) + 1)
+
+        spans = [np.arange(self.list_offsets[i], self.list_offsets[i + 1]) for i in order[:probes]]
+        positions = np.concatenate(spans) if spans else np.empty(0, dtype=np.int64)
+        return self._top_k(positions, self.vectors[positions] @ query, k)
+
+    def brute_force(self, query: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Exact top-k by scanning every vector"""
+        return self._top_k(np.arange(len(self.rows)), self.vectors @ query, k)
+
+    def _top_k(self, positions: np.ndarray, similarities: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        k = min(k, len(positions))
+        best = np.argpartition(-similarities, k - 1)[:k] if k else np.empty(0, dtype=np.int64)
+        best = best[np.argsort(-similarities[best], kind='stable')]
+        return self.rows[positions[best]], similarities[best]
+
+    def candidates(self, rows: Iterable[int]) -> List[Dict[str, Any]]:
+        """Load stored candidate records by row"""
+        return [self.records.candidate_at(int(row)) for row in rows]
+
+    def save(self, folder: Path, candidates: List[Dict[str, Any]]):
+        """Persist vectors, lists, embedding state and candidate records"""
+        folder.mkdir(parents=True, exist_ok=True)
+        np.save(folder / 'vectors.npy', self.vectors)
+        np.savez(folder / 'index.npz', format=np.array(INDEX_FORMAT_VERSION), rows=self.rows,
+                 centroids=self.centroids, list_offsets=self.list_offsets, **self.embedder.state())
+        write_indexed_results({'built': time.strftime('%Y-%m-%dT%H:%M:%S'), 'candidates': candidates},
+                              folder / 'candidates.json')
+
+    @classmethod
+    def load(cls, folder: Path) -> 'CandidateIndex':
+        """Open a saved index; vectors are memory-mapped rather than read"""
+        with np.load(folder / 'index.npz') as archive:
+            if int(archive['format']) != INDEX_FORMAT_VERSION:
+                raise ValueError(f"{folder} holds a candidate index of an unsupported format")
+            state = {name: archive[name] for name in archive.files}
+
+        return cls(CandidateEmbedder.from_state(state), np.load(folder / 'vectors.npy', mmap_mode='r'),
+                   state['rows'], state['centroids'], state['list_offsets'],
+                   ResultsReader(folder / 'candidates.json'))
+
+    def close(self):
+        if self.records is not None:
+            self.records.close()
+
+
+def recall_at_k(index: CandidateIndex, queries: np.ndarray, k: int, nprobe: int) -> float:
+    """Fraction of the exact top-k that the approximate search returns, averaged over queries"""
+    found = 0
+    for query in queries:
+        approximate, _ = index.search(query, k, nprobe)
+        exact, _ = index.brute_force(query, k)
+        found += len(np.intersect1d(approximate, exact))
+    return found / max(1, len(queries) * min(k, len(index)))
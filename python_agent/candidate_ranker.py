@@ -4,10 +4,78 @@ Ranks candidates and generates final results
 """
 
 import logging
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional, Tuple
 from datetime import datetime
 import time
 
+def ranking_key(candidate: Dict[str, Any]) -> Tuple[int, str]:
+    """Sort key for ranking: best score first, ties broken by file name"""
+    # The file name tie-break keeps sharded and single-node rankings identical
+    return (-candidate.get('match_score', 0), candidate.get('file_name') or '')
+
+class RankingStatistics:
+    """Mergeable counts, sums and score histogram behind the results statistics"""
+    
+    def __init__(self):
+        self.count = 0
+        self.score_sum = 0
+        self.score_histogram = [0] * 101  # match scores are integers 0-100
+        self.total_skills = 0
+        self.experience_sum = 0
+        self.experience_count = 0
+    
+    def add(self, candidate: Dict[str, Any], sign: int = 1):
+        """Account for one analyzed candidate (sign=-1 takes one back out)"""
+        score = min(100, max(0, int(candidate.get('match_score', 0))))
+        self.count += sign
+        self.score_sum += sign * score
+        self.score_histogram[score] += sign
+        self.total_skills += sign * candidate.get('skill_count', len(candidate.get('skills', [])))
+        if candidate.get('experience'):
+            self.experience_sum += sign * candidate['experience']
+            self.experience_count += sign
+    
+    def remove(self, candidate: Dict[str, Any]):
+        """Take back a candidate added earlier, e.g. one folded as a duplicate after merging"""
+        self.add(candidate, -1)
+    
+    def merge(self, other: 'RankingStatistics') -> 'RankingStatistics':
+        """Fold another set of statistics into this one"""
+        self.count += other.count
+        self.score_sum += other.score_sum
+        self.score_histogram = [a + b for a, b in zip(self.score_histogram, other.score_histogram)]
+        self.total_skills += other.total_skills
+        self.experience_sum += other.experience_sum
+        self.experience_count += other.experience_count
+        return self
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return dict(self.__dict__)
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'RankingStatistics':
+        statistics = cls()
+        statistics.__dict__.update(data)
+        return statistics
+    
+    def summary(self) -> Dict[str, Any]:
+        """Statistics as reported in screening results"""
+        if not self.count:
+            return {}
+        
+        scores = [score for score, count in enumerate(self.score_histogram) if count]
+        return {
+            'average_match_score': self.score_sum / self.count,
+            'highest_match_score': scores[-1],
+            'lowest_match_score': scores[0],
+            'candidates_above_80': sum(self.score_histogram[80:]),
+            'candidates_above_60': sum(self.score_histogram[60:]),
+            'candidates_below_40': sum(self.score_histogram[:40]),
+            'total_skills_identified': self.total_skills,
+            'average_experience': (self.experience_sum / self.experience_count
+                                   if self.experience_count else 0)
+        }
+
 class CandidateRanker:
     """Ranks candidates and generates screening results"""
     
@@ -16,12 +84,20 @@ class CandidateRanker:
         self.logger = logging.getLogger(__name__)
         self.start_time = time.time()
     
-    def rank_candidates(self, candidates: List[Dict[str, Any]], job_description: Dict[str, Any]) -> Dict[str, Any]:
-        """Rank candidates and generate final results"""
+    def rank_candidates(self, candidates: List[Dict[str, Any]], job_description: Dict[str, Any],
+                        statistics: Optional[RankingStatistics] = None) -> Dict[str, Any]:
+        """Rank candidates and generate final results
+        
+        When statistics are given (e.g. merged from shards), they describe the full
+        candidate pool and candidates may be only its top entries.
+        """
         self.logger.info(f"Ranking {len(candidates)} candidates")
         
         # Sort candidates by match score (descending)
-        ranked_candidates = sorted(candidates, key=lambda x: x.get('match_score', 0), reverse=True)
+        ranked_candidates = sorted(candidates, key=ranking_key)
+        
+        if statistics is None:
+            statistics = self.collect_statistics(ranked_candidates)
         
         # Get top matches (top 3 or all if less than 3)
         top_matches = ranked_candidates[:3]
@@ -36,10 +112,10 @@ class CandidateRanker:
             'company': job_description.get('company', 'Unknown Company'),
             'analysis_date': datetime.now().isoformat(),
             'processing_time': processing_time,
-            'total_resumes': len(candidates),
+            'total_resumes': statistics.count,
             'candidates': ranked_candidates,
             'top_matches': top_matches,
-            'statistics': self._generate_statistics(ranked_candidates),
+            'statistics': statistics.summary(),
             'agent_reasoning': self._generate_agent_reasoning(ranked_candidates, job_description)
         }
         
@@ -47,27 +123,23 @@ class CandidateRanker:
         
         return results
     
+    @staticmethod
+    def collect_statistics(candidates: List[Dict[str, Any]]) -> RankingStatistics:
+        """Accumulate mergeable statistics for a list of analyzed candidates"""
+        statistics = RankingStatistics()
+        for candidate in candidates:
+            statistics.add(candidate)
+        return statistics
+    
     def _generate_statistics(self, candidates: List[Dict[str, Any]]) -> Dict[str, Any]:
         """Generate statistical analysis of candidates"""
-        if not candidates:
-            return {}
-        
-        match_scores = [c.get('match_score', 0) for c in candidates]
-        
-        return {
-            'average_match_score': sum(match_scores) / len(match_scores),
-            'highest_match_score': max(match_scores),
-            'lowest_match_score': min(match_scores),
-            'candidates_above_80': len([s for s in match_scores if s >= 80]),
-            'candidates_above_60': len([s for s in match_scores if s >= 60]),
-            'candidates_below_40': len([s for s in match_scores if s < 40]),
-            'total_skills_identified': sum(len(c.get('skills', [])) for c in candidates),
-            'average_experience': sum(c.get('experience', 0) for c in candidates if c.get('experience')) / 
-                                len([c for c in candidates if c.get('experience')])
-        }
+        return self.collect_statistics(candidates).summary()
     
     def _generate_agent_reasoning(self, candidates: List[Dict[str, Any]], job_description: Dict[str, Any]) -> Dict[str, Any]:
         """Generate explanation of agent's reasoning process"""
+        scoring_config = self.config.get('scoring', {})
+        weight = lambda key, default: f"{scoring_config.get(key, default) * 100:.0f}% weight"
+        
         return {
             'process_steps': [
                 "PDF text extraction and parsing",
@@ -83,11 +155,11 @@ class CandidateRanker:
                 "Summary generation and reporting"
             ],
             'scoring_methodology': {
-                'skills_matching': "40% weight - Direct matching of candidate skills with job requirements",
-                'experience_level': "25% weight - Years of experience compared to job requirements",
-                'education_relevance': "15% weight - Educational background alignment with role",
-                'preferred_skills': "10% weight - Bonus points for preferred qualifications",
-                'role_relevance': "10% weight - Current/previous role similarity to target position"
+                'skills_matching': f"{weight('skills_weight', 0.40)} - Direct matching of candidate skills with job requirements",
+                'experience_level': f"{weight('experience_weight', 0.25)} - Years of experience compared to job requirements",
+                'education_relevance': f"{weight('education_weight', 0.15)} - Educational background alignment with role",
+                'preferred_skills': f"{weight('preferred_weight', 0.10)} - Bonus points for preferred qualifications",
+                'role_relevance': f"{weight('role_weight', 0.10)} - Current/previous role similarity to target position"
             },
             'decision_factors': [
                 "Technical skill alignment with job requirements",
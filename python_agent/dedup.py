@@ -0,0 +1,162 @@
+"""
+Deduplication Module
+Near-duplicate resume detection using MinHash signatures and LSH banding
+"""
+
+import re
+import zlib
+import base64
+import logging
+from typing import Dict, List, Any, Iterable, Optional, Tuple
+
+import numpy as np
+
+from text_corpus import TextCorpus, candidate_text, candidate_text_length
+
+# Mersenne prime used for the universal hash family; keeps a*h + b within uint64
+MERSENNE_PRIME = (1 << 31) - 1
+
+WORD_PATTERN = re.compile(r'[a-z0-9]+')
+
+
+def encode_signature(signature: np.ndarray) -> str:
+    """Encode a signature for JSON; values are below 2**31, so 32 bits each suffice"""
+    return base64.b64encode(signature.astype('<u4').tobytes()).decode('ascii')
+
+
+def decode_signature(data: str) -> np.ndarray:
+    """Decode a signature written by encode_signature"""
+    return np.frombuffer(base64.b64decode(data), dtype='<u4').astype(np.uint64)
+
+
+class MinHasher:
+    """Computes MinHash signatures over word shingles"""
+
+    def __init__(self, num_perm: int = 64, shingle_size: int = 5, seed: int = 1):
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+
+        rng = np.random.RandomState(seed)
+        self._a = rng.randint(1, MERSENNE_PRIME, size=num_perm, dtype=np.uint64)
+        self._b = rng.randint(0, MERSENNE_PRIME, size=num_perm, dtype=np.uint64)
+
+    def shingles(self, text: str) -> np.ndarray:
+        """Hash the word k-shingles of a text into 32-bit integers"""
+        words = WORD_PATTERN.findall(text.lower())
+        k = self.shingle_size
+
+        if len(words) < k:
+            grams = [" ".join(words)]
+        else:
+            grams = [" ".join(words[i:i + k]) for i in range(len(words) - k + 1)]
+
+        hashes = {zlib.crc32(gram.encode('utf-8')) for gram in grams}
+        return np.fromiter(hashes, dtype=np.uint64, count=len(hashes))
+
+    def signature(self, text: str) -> np.ndarray:
+        """Compute the MinHash signature of a text"""
+        hashes = self.shingles(text) % MERSENNE_PRIME
+        permuted = (np.outer(self._a, hashes) + self._b[:, None]) % MERSENNE_PRIME
+        return permuted.min(axis=1)
+
+
+class NearDuplicateDetector:
+    """Clusters near-duplicate resumes before scoring"""
+
+    def __init__(self, config: Dict[str, Any], corpus: Optional[TextCorpus] = None):
+        self.config = config
+        self.logger = logging.getLogger(__name__)
+        self.corpus = corpus
+
+        dedup_config = config.get('dedup', {})
+        self.enabled = dedup_config.get('enabled', True)
+        self.threshold = dedup_config.get('threshold', 0.85)
+        num_perm = dedup_config.get('num_perm', 64)
+        self.bands = dedup_config.get('bands', 16)
+
+        if num_perm % self.bands:
+            raise ValueError("dedup.num_perm must be divisible by dedup.bands")
+        self.rows = num_perm // self.bands
+
+        self.hasher = MinHasher(num_perm, dedup_config.get('shingle_size', 5))
+        # Signatures of the candidates the last deduplicate() kept, in the same order, and of the
+        # copies it folded (without their texts), so shard merges can cluster like a single-node run
+        self.signatures: List[np.ndarray] = []
+        self.folded: List[Tuple[Dict[str, Any], np.ndarray]] = []
+
+    def find_clusters(self, texts: Iterable[str]) -> List[List[int]]:
+        """Group text indices into near-duplicate clusters"""
+        # Only signatures are kept, so texts can be streamed from the corpus
+        return self.cluster_signatures([self.hasher.signature(text) for text in texts])
+
+    def cluster_signatures(self, signatures: List[np.ndarray]) -> List[List[int]]:
+        """Group signature indices into near-duplicate clusters"""
+        parent = list(range(len(signatures)))
+
+        def find(i: int) -> int:
+            while parent[i] != i:
+                parent[i] = parent[parent[i]]
+                i = parent[i]
+            return i
+
+        for band in range(self.bands):
+            start = band * self.rows
+            buckets: Dict[bytes, int] = {}
+
+            for i, signature in enumerate(signatures):
+                key = signature[start:start + self.rows].tobytes()
+                first = buckets.setdefault(key, i)
+                if first == i:
+                    continue
+
+                # Verify against the bucket's first member to filter LSH false positives
+                similarity = float(np.mean(signatures[first] == signature))
+                if similarity >= self.threshold:
+                    root_a, root_b = find(first), find(i)
+                    if root_a != root_b:
+                        parent[root_b] = root_a
+
+        clusters: Dict[int, List[int]] = {}
+        for i in range(len(signatures)):
+            clusters.setdefault(find(i), []).append(i)
+
+        return list(clusters.values())
+
+    def deduplicate(self, candidates: List[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """Keep one candidate per near-duplicate cluster and report folded files"""
+        self.signatures, self.folded = [], []
+        if not self.enabled or not candidates:
+            return candidates, []
+
+        signatures = [self.hasher.signature(candidate_text(c, self.corpus)) for c in candidates]
+        clusters = self.cluster_signatures(signatures)
+
+        unique_candidates = []
+        folded = []
+        for cluster in clusters:
+            # The copy with the most extracted text is scored on behalf of the cluster
+            members = sorted(cluster, key=lambda i: candidate_text_length(candidates[i]), reverse=True)
+            representative = candidates[members[0]]
+            unique_candidates.append(representative)
+            self.signatures.append(signatures[members[0]])
+
+            for i in members[1:]:
+                member = {key: candidates[i].get(key) for key in ('id', 'name', 'file_name', 'resume_file')}
+                member['text_length'] = candidate_text_length(candidates[i])
+                self.folded.append((member, signatures[i]))
+
+            if len(members) > 1:
+                duplicate_files = [candidates[i].get('file_name') for i in members[1:]]
+                representative['duplicate_files'] = duplicate_files
+                folded.append({
+                    'candidate_id': representative.get('id'),
+                    'name': representative.get('name'),
+                    'kept_file': representative.get('file_name'),
+                    'folded_files': duplicate_files
+                })
+
+        if folded:
+            self.logger.info(f"Folded {len(candidates) - len(unique_candidates)} near-duplicate resumes "
+                             f"into {len(folded)} clusters")
+
+        return unique_candidates, folded
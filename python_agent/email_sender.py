@@ -59,10 +59,8 @@ class EmailSender:
         self.logger.info(f"To: {self.recipient_email}")
         self.logger.info(f"From: {self.sender_email}")
         self.logger.info(f"Subject: {subject}")
-        self.logger.info("Email content:")
-        self.logger.info("-" * 50)
-        self.logger.info(body)
-        self.logger.info("-" * 50)
+        self.logger.info(f"Email body: {len(body)} characters (logged at DEBUG level)")
+        self.logger.debug("Email content:\n%s\n%s\n%s", "-" * 50, body, "-" * 50)
         self.logger.info("Email sent successfully (simulated)")
     
     def _send_actual_email(self, message: MIMEMultipart) -> bool:
@@ -0,0 +1,133 @@
+"""
+Export Module
+Streams ranked candidates into Excel or CSV spreadsheets for HR
+"""
+
+import csv
+import logging
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Any, Optional
+
+from job_analyzer import SCORE_COMPONENTS, is_explained
+
+EXPORT_FORMATS = ('xlsx', 'csv')
+
+# Excel's sheet size and cell text limits
+XLSX_MAX_ROWS = 1048576
+XLSX_MAX_CELL_CHARS = 32767
+
+# Spreadsheet apps evaluate CSV cells starting with these, so resume text is escaped
+FORMULA_PREFIXES = ('=', '+', '-', '@', '\t', '\r')
+
+COLUMNS = (['Rank', 'Candidate ID', 'Name', 'Email', 'Phone', 'Location', 'Match Score']
+           + [f"{component.title()} Score" for component in SCORE_COMPONENTS]
+           + ['Experience (years)', 'Current Role', 'Education', 'Skills', 'Strengths', 'Concerns', 'Resume File'])
+
+
+def export_format(path: Path) -> str:
+    """Spreadsheet format named by a file's extension"""
+    fmt = path.suffix.lower().lstrip('.')
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Cannot export to .{fmt} files (use {' or '.join(EXPORT_FORMATS)})")
+    return fmt
+
+
+def _text(value: Any) -> str:
+    if isinstance(value, list):
+        return "; ".join(str(item) for item in value)
+    return "" if value is None else str(value)
+
+
+def _csv_safe(value: Any) -> Any:
+    return "'" + value if isinstance(value, str) and value.startswith(FORMULA_PREFIXES) else value
+
+
+def candidate_row(rank: int, candidate: Dict[str, Any]) -> List[Any]:
+    """One spreadsheet row for a ranked candidate; numbers stay numeric"""
+    breakdown = candidate.get('score_breakdown', {})
+    return ([rank, _text(candidate.get('id')), _text(candidate.get('name')), _text(candidate.get('email')),
+             _text(candidate.get('phone')), _text(candidate.get('location')), candidate.get('match_score', 0)]
+            + [round(breakdown.get(component, 0), 1) for component in SCORE_COMPONENTS]
+            + [candidate.get('experience', 0), _text(candidate.get('current_role')),
+               _text(candidate.get('education')), _text(candidate.get('skills', [])),
+               _text(candidate.get('strengths', [])), _text(candidate.get('concerns', [])),
+               _text(candidate.get('resume_file') or candidate.get('file_name'))])
+
+
+def export_rankings(candidates: Iterable[Dict[str, Any]], path: Path, summary: Optional[Dict[str, Any]] = None,
+                    explain: Optional[Callable[[Dict[str, Any]], Dict[str, Any]]] = None) -> int:
+    """Write candidates, already in rank order, to an .xlsx or .csv file; returns the row count
+
+    Rows are written as they are read, so memory does not grow with the candidate count.
+    explain, if given, fills in strengths and concerns for candidates that lack them.
+    """
+    fmt = export_format(path)
+    if explain is not None:
+        candidates = (candidate if is_explained(candidate) else explain(candidate) for candidate in candidates)
+    if fmt == 'csv':
+        return _export_csv(candidates, path)
+    return _export_xlsx(candidates, path, summary)
+
+
+def _export_csv(candidates: Iterable[Dict[str, Any]], path: Path) -> int:
+    count = 0
+    # utf-8-sig so Excel detects the encoding when the file is opened directly
+    with open(path, 'w', newline='', encoding='utf-8-sig') as f:
+        writer = csv.writer(f)
+        writer.writerow(COLUMNS)
+        for count, candidate in enumerate(candidates, 1):
+            writer.writerow([_csv_safe(value) for value in candidate_row(count, candidate)])
+    return count
+
+
+def _export_xlsx(candidates: Iterable[Dict[str, Any]], path: Path, summary: Optional[Dict[str, Any]]) -> int:
+    # Write-only workbooks stream rows to disk instead of building cell objects
+    from openpyxl import Workbook
+    from openpyxl.cell import WriteOnlyCell
+    from openpyxl.cell.cell import ILLEGAL_CHARACTERS_RE
+
+    logger = logging.getLogger(__name__)
+    workbook = Workbook(write_only=True)
+
+    def new_sheet(number: int):
+        sheet = workbook.create_sheet('Rankings' if number == 1 else f"Rankings ({number})")
+        sheet.freeze_panes = 'A2'
+        sheet.append(COLUMNS)
+        return sheet
+
+    def cell(value: Any) -> Any:
+        if not isinstance(value, str):
+            return value
+        value = ILLEGAL_CHARACTERS_RE.sub('', value)[:XLSX_MAX_CELL_CHARS]
+        if not value.startswith('='):
+            return value
+        # openpyxl stores '=' strings as formulas unless typed as text
+        text_cell = WriteOnlyCell(sheet, value)
+        text_cell.data_type = 's'
+        return text_cell
+
+    sheets = 1
+    sheet = new_sheet(sheets)
+    rows_in_sheet = 1
+    count = 0
+    for count, candidate in enumerate(candidates, 1):
+        if rows_in_sheet == XLSX_MAX_ROWS:
+            sheets += 1
+            sheet = new_sheet(sheets)
+            rows_in_sheet = 1
+        sheet.append([cell(value) for value in candidate_row(count, candidate)])
+        rows_in_sheet += 1
+
+    if sheets > 1:
+        logger.warning(f"{count} candidates exceed one Excel sheet; split across {sheets} sheets "
+                       f"(CSV keeps them in one table)")
+
+    if summary is not None:
+        sheet = workbook.create_sheet('Summary')
+        for key in ('job_title', 'company', 'analysis_date', 'total_resumes'):
+            sheet.append([key.replace('_', ' ').title(), cell(summary.get(key))])
+        for key, value in summary.get('statistics', {}).items():
+            sheet.append([key.replace('_', ' ').title(), cell(value)])
+
+    workbook.save(path)
+    return count
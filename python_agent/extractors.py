@@ -0,0 +1,388 @@
+"""
+Extractors Module
+Format-dispatching text extraction for PDF, DOCX, TXT and HTML resumes
+"""
+
+import io
+import os
+import json
+import codecs
+import hashlib
+import logging
+import time
+import threading
+import zipfile
+import xml.etree.ElementTree as ET
+from collections import OrderedDict
+from html.parser import HTMLParser
+from pathlib import Path
+from typing import Dict, List, Any, Optional, BinaryIO, Tuple
+
+from pdf_backends import PDFBackend, PyPDF2Backend, get_pdf_backends
+
+# Read size used by the streaming extractors
+CHUNK_SIZE = 64 * 1024
+
+WORD_NS = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+
+
+class NoTextExtractedError(ValueError):
+    """Raised when a resume yields no text, e.g. an image-only PDF"""
+
+
+class TextExtractor:
+    """Base class for format-specific text extractors"""
+
+    name = 'base'
+    extensions: List[str] = []
+    # Bump when an extractor's output changes, so cached texts from the old version are re-extracted
+    version = 1
+
+    def extract(self, stream: BinaryIO) -> str:
+        """Extract plain text from a binary stream"""
+        raise NotImplementedError
+
+
+class PDFExtractor(TextExtractor):
+    """Extracts text from PDF files through a chain of PDF backends"""
+
+    name = 'pdf'
+    extensions = ['pdf']
+
+    def __init__(self, backends: Optional[List[PDFBackend]] = None):
+        self.backends = backends or [PyPDF2Backend()]
+        self.logger = logging.getLogger(__name__)
+
+    @property
+    def backend(self) -> str:
+        """Name of the preferred backend; text cached under another one is extracted again"""
+        return self.backends[0].name
+
+    def extract(self, stream: BinaryIO) -> str:
+        """Extract text with the first backend that succeeds for this file"""
+        return self.extract_pages(stream)[0]
+
+    def extract_pages(self, stream: BinaryIO, max_pages: Optional[int] = None) -> Tuple[str, int]:
+        """Extract the first max_pages pages (all if None); returns the text and the page count"""
+        last_error = None
+        # A PDF with no text in the pages read still reports its real page count,
+        # so a partial extraction of blank leading pages is not taken as complete
+        pages_seen = None
+
+        for backend in self.backends:
+            stream.seek(0)
+            try:
+                text, page_count = backend.extract_pages(stream, max_pages)
+            except Exception as e:
+                self.logger.warning(f"PDF backend {backend.name} failed, trying next: {str(e)}")
+                last_error = e
+                continue
+
+            if text:
+                return text, page_count
+            pages_seen = page_count
+
+        if pages_seen is not None:
+            return "", pages_seen
+        if last_error is not None:
+            raise last_error
+        return "", 0
+
+
+class DocxExtractor(TextExtractor):
+    """Extracts text from DOCX files by streaming word/document.xml and its headers and footers"""
+
+    name = 'docx'
+    extensions = ['docx']
+    version = 2
+
+    def extract(self, stream: BinaryIO) -> str:
+        """Extract paragraph text without building a full document model
+
+        Headers come first and footers last, as on the page; resumes often keep
+        the name and contact details there.
+        """
+        with zipfile.ZipFile(stream) as archive:
+            names = archive.namelist()
+            # header2.xml before header10.xml
+            part_order = lambda name: (len(name), name)
+            headers = sorted((name for name in names if name.startswith('word/header') and name.endswith('.xml')),
+                             key=part_order)
+            footers = sorted((name for name in names if name.startswith('word/footer') and name.endswith('.xml')),
+                             key=part_order)
+
+            parts = []
+            for part in headers + ['word/document.xml'] + footers:
+                with archive.open(part) as document:
+                    text = self._paragraphs(document)
+                # First-page, even and default headers often repeat the same text
+                if text and text not in parts:
+                    parts.append(text)
+
+        return "\n".join(parts).strip()
+
+    @staticmethod
+    def _paragraphs(document: BinaryIO) -> str:
+        paragraphs = []
+        current = []
+        for event, element in ET.iterparse(document, events=('end',)):
+            if element.tag == WORD_NS + 't':
+                current.append(element.text or "")
+            elif element.tag == WORD_NS + 'tab':
+                current.append("\t")
+            elif element.tag in (WORD_NS + 'br', WORD_NS + 'cr'):
+                current.append("\n")
+            elif element.tag == WORD_NS + 'p':
+                paragraphs.append("".join(current))
+                current = []
+                # Paragraphs are done once closed; drop them to keep memory flat
+                element.clear()
+        return "\n".join(paragraphs).strip()
+
+
+class PlainTextExtractor(TextExtractor):
+    """Extracts text from plain-text files with incremental decoding"""
+
+    name = 'txt'
+    extensions = ['txt', 'text', 'md']
+
+    def extract(self, stream: BinaryIO) -> str:
+        """Decode the stream chunk by chunk, falling back to latin-1"""
+        head = stream.read(CHUNK_SIZE)
+        encoding = 'utf-8-sig' if head.startswith(codecs.BOM_UTF8) else 'utf-8'
+        decoder = codecs.getincrementaldecoder(encoding)(errors='strict')
+        parts = []
+
+        try:
+            chunk = head
+            while chunk:
+                parts.append(decoder.decode(chunk))
+                chunk = stream.read(CHUNK_SIZE)
+            parts.append(decoder.decode(b"", final=True))
+        except UnicodeDecodeError:
+            stream.seek(0)
+            return stream.read().decode('latin-1').strip()
+
+        return "".join(parts).strip()
+
+
+class _HTMLTextCollector(HTMLParser):
+    """Collects visible text from an HTML document"""
+
+    BLOCK_TAGS = {'p', 'div', 'br', 'li', 'tr', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6',
+                  'section', 'header', 'footer', 'table', 'ul', 'ol'}
+    SKIP_TAGS = {'script', 'style', 'head', 'title'}
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.parts = []
+        self._skip_depth = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag in self.SKIP_TAGS:
+            self._skip_depth += 1
+        elif tag in self.BLOCK_TAGS:
+            self.parts.append("\n")
+
+    def handle_endtag(self, tag):
+        if tag in self.SKIP_TAGS:
+            self._skip_depth = max(0, self._skip_depth - 1)
+        elif tag in self.BLOCK_TAGS:
+            self.parts.append("\n")
+
+    def handle_data(self, data):
+        if not self._skip_depth:
+            self.parts.append(data)
+
+
+class HTMLExtractor(TextExtractor):
+    """Extracts visible text from HTML files by feeding the parser in chunks"""
+
+    name = 'html'
+    extensions = ['html', 'htm']
+
+    def extract(self, stream: BinaryIO) -> str:
+        """Feed decoded chunks to an HTML parser and collapse whitespace"""
+        collector = _HTMLTextCollector()
+        decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+
+        chunk = stream.read(CHUNK_SIZE)
+        while chunk:
+            collector.feed(decoder.decode(chunk))
+            chunk = stream.read(CHUNK_SIZE)
+        collector.feed(decoder.decode(b"", final=True))
+        collector.close()
+
+        lines = [" ".join(line.split()) for line in "".join(collector.parts).split("\n")]
+        return "\n".join(line for line in lines if line).strip()
+
+
+class ExtractionCache:
+    """Caches extracted text keyed by the SHA-256 of the file content"""
+
+    def __init__(self, cache_dir: Optional[str] = None, max_entries: int = 256):
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self.max_entries = max_entries
+        self._memory: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        # The OCR lane writes entries from its own threads
+        self._lock = threading.Lock()
+
+        if self.cache_dir:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    @staticmethod
+    def key_for(data: bytes) -> str:
+        """Compute the cache key for raw file content"""
+        return hashlib.sha256(data).hexdigest()
+
+    def _entry_path(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / f"{key}.json"
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return the cached entry for a key, if any"""
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                self._memory.move_to_end(key)
+                return entry
+
+        if self.cache_dir:
+            entry_path = self._entry_path(key)
+            if entry_path.exists():
+                try:
+                    with open(entry_path, 'r', encoding='utf-8') as f:
+                        entry = json.load(f)
+                except (OSError, ValueError):
+                    return None
+                self._remember(key, entry)
+                return entry
+
+        return None
+
+    def put(self, key: str, text: str, **metadata) -> Dict[str, Any]:
+        """Store extracted text and metadata under a key"""
+        entry = dict(metadata, text=text)
+        self._remember(key, entry)
+
+        if self.cache_dir:
+            entry_path = self._entry_path(key)
+            entry_path.parent.mkdir(exist_ok=True)
+            # Unique per writer, since parser processes can share the cache directory
+            tmp_path = entry_path.with_suffix(f'.{os.getpid()}.{threading.get_ident()}.tmp')
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(entry, f)
+            tmp_path.replace(entry_path)
+
+        return entry
+
+    def _remember(self, key: str, entry: Dict[str, Any]):
+        with self._lock:
+            self._memory[key] = entry
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.max_entries:
+                self._memory.popitem(last=False)
+
+
+class ExtractorRegistry:
+    """Dispatches files to text extractors by extension"""
+
+    def __init__(self, config: Dict[str, Any]):
+        self.config = config
+        self.logger = logging.getLogger(__name__)
+        self._extractors: Dict[str, TextExtractor] = {}
+
+        processing_config = config.get('processing', {})
+        self.max_size_bytes = int(processing_config.get('max_resume_size_mb', 10) * 1024 * 1024)
+
+        extraction_config = config.get('extraction', {})
+        self.cache = None
+        if extraction_config.get('cache_enabled', True):
+            self.cache = ExtractionCache(
+                extraction_config.get('cache_dir'),
+                extraction_config.get('memory_cache_entries', 256)
+            )
+
+        pdf_extractor = PDFExtractor(get_pdf_backends(config))
+        for extractor in (pdf_extractor, DocxExtractor(), PlainTextExtractor(), HTMLExtractor()):
+            self.register(extractor)
+
+    def register(self, extractor: TextExtractor):
+        """Register an extractor for all of its extensions"""
+        for extension in extractor.extensions:
+            self._extractors[extension.lower()] = extractor
+
+    def supported_extensions(self) -> List[str]:
+        """Return the registered extensions"""
+        return sorted(self._extractors)
+
+    def get_extractor(self, file_name: str) -> TextExtractor:
+        """Return the extractor for a file name"""
+        extension = Path(file_name).suffix.lower().lstrip('.')
+        extractor = self._extractors.get(extension)
+        if extractor is None:
+            raise ValueError(f"Unsupported resume format: .{extension}")
+        return extractor
+
+    def read_file(self, file_path: Path) -> bytes:
+        """Read a resume file, refusing ones over the size limit"""
+        if file_path.stat().st_size > self.max_size_bytes:
+            raise ValueError(f"Resume exceeds maximum size of {self.max_size_bytes // (1024 * 1024)} MB")
+
+        with open(file_path, 'rb') as f:
+            return f.read()
+
+    def extract_file(self, file_path: Path) -> str:
+        """Read a file and extract its text"""
+        return self.extract_bytes(self.read_file(file_path), file_path.name)
+
+    def extract_bytes(self, data: bytes, file_name: str) -> str:
+        """Extract text from in-memory file content, consulting the cache"""
+        return self._extract(data, file_name)[0]
+
+    def extract_partial(self, data: bytes, file_name: str, max_pages: int) -> Tuple[str, bool]:
+        """Extract only the first pages of a PDF (other formats whole) for a quick look
+
+        Returns the text and whether it is the complete text. Only complete text is cached.
+        """
+        return self._extract(data, file_name, max_pages)
+
+    def _extract(self, data: bytes, file_name: str, max_pages: Optional[int] = None) -> Tuple[str, bool]:
+        if len(data) > self.max_size_bytes:
+            raise ValueError(f"Resume exceeds maximum size of {self.max_size_bytes // (1024 * 1024)} MB")
+
+        extractor = self.get_extractor(file_name)
+
+        key = None
+        if self.cache:
+            key = ExtractionCache.key_for(data)
+            entry = self.cache.get(key)
+            if entry is not None and self._is_current(entry, extractor):
+                self.logger.debug("Extraction cache hit for %s", file_name)
+                return entry['text'], True
+
+        start = time.perf_counter()
+        try:
+            if isinstance(extractor, PDFExtractor):
+                text, page_count = extractor.extract_pages(io.BytesIO(data), max_pages)
+                complete = max_pages is None or page_count <= max_pages
+            else:
+                text, complete = extractor.extract(io.BytesIO(data)), True
+        except Exception as e:
+            raise ValueError(f"Could not extract text from {extractor.name.upper()}: {str(e)}")
+        elapsed = time.perf_counter() - start
+
+        if self.cache and text and complete:
+            backend = getattr(extractor, 'backend', None)
+            self.cache.put(key, text, format=extractor.name, extractor_version=extractor.version,
+                           extract_seconds=elapsed, **({'backend': backend} if backend else {}))
+
+        return text, complete
+
+    @staticmethod
+    def _is_current(entry: Dict[str, Any], extractor: TextExtractor) -> bool:
+        """Whether a cached entry holds what this extractor, and for PDFs its backend, would produce"""
+        if entry.get('format') == 'ocr':
+            # OCR text does not depend on the extractor that found no text
+            return True
+        return (entry.get('extractor_version', 1) == extractor.version
+                and entry.get('backend') == getattr(extractor, 'backend', None))
@@ -4,99 +4,152 @@ Analyzes candidates against job requirements and calculates match scores
 """
 
 import logging
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional, Set
 import re
 
+from text_corpus import TextCorpus, candidate_text
+from skills_taxonomy import get_taxonomy
+from utils import PER_RESUME
+
+# Sub-score components, in the order they are weighted and summed
+SCORE_COMPONENTS = ('skills', 'experience', 'education', 'preferred', 'role')
+
+def is_explained(candidate: Dict[str, Any]) -> bool:
+    """Return True if a candidate already carries its strengths, concerns and summary"""
+    return 'strengths' in candidate and 'analysis_details' in candidate
+
 class JobAnalyzer:
     """Analyzes candidates against job requirements"""
     
-    def __init__(self, config: Dict[str, Any]):
+    def __init__(self, config: Dict[str, Any], corpus: Optional[TextCorpus] = None):
         self.config = config
         self.logger = logging.getLogger(__name__)
+        self.corpus = corpus
+        self.taxonomy = get_taxonomy(config)
         
-        # Scoring weights
+        # Scoring weights (overridable in the scoring section of config.json)
+        scoring_config = config.get('scoring', {})
         self.weights = {
-            'skills': 0.40,      # 40% - Technical skills matching
-            'experience': 0.25,   # 25% - Years of experience
-            'education': 0.15,    # 15% - Educational background
-            'preferred': 0.10,    # 10% - Preferred skills bonus
-            'role': 0.10         # 10% - Role relevance
+            'skills': scoring_config.get('skills_weight', 0.40),          # 40% - Technical skills matching
+            'experience': scoring_config.get('experience_weight', 0.25),  # 25% - Years of experience
+            'education': scoring_config.get('education_weight', 0.15),    # 15% - Educational background
+            'preferred': scoring_config.get('preferred_weight', 0.10),    # 10% - Preferred skills bonus
+            'role': scoring_config.get('role_weight', 0.10)               # 10% - Role relevance
         }
     
     def analyze_candidate(self, candidate: Dict[str, Any], job_description: Dict[str, Any]) -> Dict[str, Any]:
-        """Analyze a candidate against job requirements"""
-        self.logger.info(f"Analyzing candidate: {candidate.get('name', 'Unknown')}")
-        
-        # Calculate match score
-        match_score = self._calculate_match_score(candidate, job_description)
-        
-        # Analyze strengths and concerns
-        strengths, concerns = self._analyze_strengths_concerns(candidate, job_description)
-        
-        # Generate summary
-        summary = self._generate_summary(candidate, match_score, strengths, concerns)
+        """Analyze a candidate against job requirements: score it and explain the score"""
+        return self.explain_candidate(self.score_candidate(candidate, job_description), job_description)
+    
+    def score_candidate(self, candidate: Dict[str, Any], job_description: Dict[str, Any]) -> Dict[str, Any]:
+        """Score a candidate with only the numbers ranking needs"""
+        self.logger.debug("Scoring candidate: %s", candidate.get('name', 'Unknown'), extra=PER_RESUME)
+        self.taxonomy = get_taxonomy(self.config)
+        
+        # Calculate sub-scores once; the match score is their weighted sum
+        breakdown = self._calculate_score_breakdown(candidate, job_description)
+        
+        scored_candidate = candidate.copy()
+        scored_candidate.update({
+            'match_score': self._weighted_score(breakdown),
+            'score_breakdown': breakdown
+        })
         
-        # Add analysis results to candidate data
-        analyzed_candidate = candidate.copy()
-        analyzed_candidate.update({
-            'match_score': match_score,
+        return scored_candidate
+    
+    def explain_candidate(self, candidate: Dict[str, Any], job_description: Dict[str, Any]) -> Dict[str, Any]:
+        """Add strengths, concerns, a summary and analysis details to a scored candidate, in place"""
+        if is_explained(candidate):
+            return candidate
+        
+        breakdown = candidate['score_breakdown']
+        strengths, concerns = self._analyze_strengths_concerns(candidate, job_description, breakdown)
+        candidate.update({
             'strengths': strengths,
             'concerns': concerns,
-            'summary': summary,
-            'analysis_details': self._get_detailed_analysis(candidate, job_description)
+            'summary': self._generate_summary(candidate, candidate['match_score'], strengths, concerns),
+            'analysis_details': self._get_detailed_analysis(breakdown)
         })
         
-        return analyzed_candidate
+        return candidate
+    
+    def explain_shortlist(self, results: Dict[str, Any], job_description: Dict[str, Any], count: int):
+        """Explain the top count ranked candidates and the top matches of ranked results"""
+        for candidate in results['candidates'][:count] + results.get('top_matches', []):
+            self.explain_candidate(candidate, job_description)
     
     def _calculate_match_score(self, candidate: Dict[str, Any], job_description: Dict[str, Any]) -> int:
         """Calculate overall match score for candidate"""
+        return self._weighted_score(self._calculate_score_breakdown(candidate, job_description))
+    
+    def _calculate_score_breakdown(self, candidate: Dict[str, Any], job_description: Dict[str, Any]) -> Dict[str, float]:
+        """Calculate each weighted sub-score (0-100)"""
+        return {
+            'skills': self._calculate_skills_score(candidate, job_description),
+            'experience': self._calculate_experience_score(candidate, job_description),
+            'education': self._calculate_education_score(candidate, job_description),
+            'preferred': self._calculate_preferred_skills_score(candidate, job_description),
+            'role': self._calculate_role_relevance_score(candidate, job_description)
+        }
+    
+    def _weighted_score(self, breakdown: Dict[str, float], weights: Optional[Dict[str, float]] = None) -> int:
+        """Combine sub-scores into the overall 0-100 match score"""
+        weights = weights or self.weights
         total_score = 0
-        
-        # Skills matching (40%)
-        skills_score = self._calculate_skills_score(candidate, job_description)
-        total_score += skills_score * self.weights['skills']
-        
-        # Experience matching (25%)
-        experience_score = self._calculate_experience_score(candidate, job_description)
-        total_score += experience_score * self.weights['experience']
-        
-        # Education relevance (15%)
-        education_score = self._calculate_education_score(candidate, job_description)
-        total_score += education_score * self.weights['education']
-        
-        # Preferred skills bonus (10%)
-        preferred_score = self._calculate_preferred_skills_score(candidate, job_description)
-        total_score += preferred_score * self.weights['preferred']
-        
-        # Role relevance (10%)
-        role_score = self._calculate_role_relevance_score(candidate, job_description)
-        total_score += role_score * self.weights['role']
+        for component in SCORE_COMPONENTS:
+            total_score += breakdown[component] * weights[component]
         
         return min(100, max(0, int(total_score)))
     
     def _calculate_skills_score(self, candidate: Dict[str, Any], job_description: Dict[str, Any]) -> float:
         """Calculate skills matching score (0-100)"""
-        required_skills = [skill.lower().strip() for skill in job_description.get('requirements', [])]
-        candidate_skills = [skill.lower() for skill in candidate.get('skills', [])]
-        candidate_text = candidate.get('raw_text', '').lower()
+        required_skills = job_description.get('requirements', [])
         
         if not required_skills:
             return 50  # Neutral score if no requirements specified
         
-        matched_skills = 0
-        for req_skill in required_skills:
-            # Check direct skill match
-            skill_matched = any(req_skill in cand_skill or cand_skill in req_skill 
-                              for cand_skill in candidate_skills)
+        matched_skills = self._count_matched_requirements(required_skills, candidate)
+        return (matched_skills / len(required_skills)) * 100
+    
+    def _count_matched_requirements(self, requirements: List[str], candidate: Dict[str, Any]) -> int:
+        """Count requirements met by the candidate, matching on canonical skill IDs"""
+        candidate_ids = self._candidate_skill_ids(candidate)
+        candidate_skills = [skill.lower() for skill in candidate.get('skills', [])]
+        candidate_text = None
+        
+        matched = 0
+        for requirement in requirements:
+            requirement_ids = self.taxonomy.find_ids(requirement)
             
-            # Check if skill mentioned in resume text
-            if not skill_matched:
-                skill_matched = req_skill in candidate_text
+            if requirement_ids:
+                # Any of the named skills (or their aliases) satisfies the requirement
+                skill_matched = bool(requirement_ids & candidate_ids)
+            else:
+                # Requirements naming no known skill fall back to text matching
+                req_skill = requirement.lower().strip()
+                skill_matched = any(req_skill in cand_skill or cand_skill in req_skill
+                                    for cand_skill in candidate_skills)
+                if not skill_matched:
+                    if candidate_text is None:
+                        candidate_text = self._candidate_text(candidate)
+                    skill_matched = req_skill in candidate_text
             
             if skill_matched:
-                matched_skills += 1
+                matched += 1
         
-        return (matched_skills / len(required_skills)) * 100
+        return matched
+    
+    def _candidate_skill_ids(self, candidate: Dict[str, Any]) -> Set[str]:
+        """Get canonical skill IDs for a candidate"""
+        if 'skill_ids' in candidate:
+            return set(candidate['skill_ids'])
+        
+        skill_ids = (self.taxonomy.normalize(skill) for skill in candidate.get('skills', []))
+        return {skill_id for skill_id in skill_ids if skill_id}
+    
+    def _candidate_text(self, candidate: Dict[str, Any]) -> str:
+        """Get lowercased resume text, read from the corpus on demand"""
+        return candidate_text(candidate, self.corpus).lower()
     
     def _calculate_experience_score(self, candidate: Dict[str, Any], job_description: Dict[str, Any]) -> float:
         """Calculate experience matching score (0-100)"""
@@ -126,7 +179,7 @@ class JobAnalyzer:
     
     def _calculate_education_score(self, candidate: Dict[str, Any], job_description: Dict[str, Any]) -> float:
         """Calculate education relevance score (0-100)"""
-        education = candidate.get('education', '').lower()
+        education = (candidate.get('education') or '').lower()
         
         if not education:
             return 50  # Neutral score if education not found
@@ -156,30 +209,14 @@ class JobAnalyzer:
         if not preferred_skills:
             return 0  # No bonus if no preferred skills
         
-        candidate_skills = [skill.lower() for skill in candidate.get('skills', [])]
-        candidate_text = candidate.get('raw_text', '').lower()
-        
-        matched_preferred = 0
-        for pref_skill in preferred_skills:
-            pref_skill_lower = pref_skill.lower().strip()
-            
-            # Check direct skill match
-            skill_matched = any(pref_skill_lower in cand_skill or cand_skill in pref_skill_lower 
-                              for cand_skill in candidate_skills)
-            
-            # Check if skill mentioned in resume text
-            if not skill_matched:
-                skill_matched = pref_skill_lower in candidate_text
-            
-            if skill_matched:
-                matched_preferred += 1
+        matched_preferred = self._count_matched_requirements(preferred_skills, candidate)
         
         return (matched_preferred / len(preferred_skills)) * 100
     
     def _calculate_role_relevance_score(self, candidate: Dict[str, Any], job_description: Dict[str, Any]) -> float:
         """Calculate role relevance score (0-100)"""
         job_title = job_description.get('title', '').lower()
-        current_role = candidate.get('current_role', '').lower()
+        current_role = (candidate.get('current_role') or '').lower()
         previous_roles = [role.lower() for role in candidate.get('previous_roles', [])]
         
         if not job_title:
@@ -205,8 +242,9 @@ class JobAnalyzer:
         
         return 30  # Low score if no relevant roles found
     
-    def _analyze_strengths_concerns(self, candidate: Dict[str, Any], job_description: Dict[str, Any]) -> tuple:
-        """Analyze candidate strengths and concerns"""
+    def _analyze_strengths_concerns(self, candidate: Dict[str, Any], job_description: Dict[str, Any],
+                                    breakdown: Optional[Dict[str, float]] = None) -> tuple:
+        """Analyze candidate strengths and concerns, reusing sub-scores when given"""
         strengths = []
         concerns = []
         
@@ -214,7 +252,8 @@ class JobAnalyzer:
         required_skills = job_description.get('requirements', [])
         candidate_skills = candidate.get('skills', [])
         
-        skills_score = self._calculate_skills_score(candidate, job_description)
+        skills_score = (breakdown['skills'] if breakdown is not None
+                        else self._calculate_skills_score(candidate, job_description))
         if skills_score >= 80:
             strengths.append("Excellent technical skill alignment with job requirements")
         elif skills_score >= 60:
@@ -235,7 +274,7 @@ class JobAnalyzer:
                 concerns.append(f"May lack sufficient experience ({candidate_exp} vs {required_exp} years required)")
         
         # Analyze education
-        education = candidate.get('education', '').lower()
+        education = (candidate.get('education') or '').lower()
         if education:
             if any(keyword in education for keyword in ['computer', 'software', 'engineering']):
                 strengths.append("Relevant educational background in technology")
@@ -243,7 +282,8 @@ class JobAnalyzer:
         # Analyze preferred skills
         preferred_skills = job_description.get('preferredSkills', [])
         if preferred_skills:
-            preferred_score = self._calculate_preferred_skills_score(candidate, job_description)
+            preferred_score = (breakdown['preferred'] if breakdown is not None
+                               else self._calculate_preferred_skills_score(candidate, job_description))
             if preferred_score > 50:
                 matched_count = int((preferred_score / 100) * len(preferred_skills))
                 strengths.append(f"Strong in {matched_count} preferred skill areas")
@@ -289,13 +329,13 @@ class JobAnalyzer:
         
         return summary
     
-    def _get_detailed_analysis(self, candidate: Dict[str, Any], job_description: Dict[str, Any]) -> Dict[str, Any]:
+    def _get_detailed_analysis(self, breakdown: Dict[str, float]) -> Dict[str, Any]:
         """Get detailed scoring breakdown"""
         return {
-            'skills_score': self._calculate_skills_score(candidate, job_description),
-            'experience_score': self._calculate_experience_score(candidate, job_description),
-            'education_score': self._calculate_education_score(candidate, job_description),
-            'preferred_skills_score': self._calculate_preferred_skills_score(candidate, job_description),
-            'role_relevance_score': self._calculate_role_relevance_score(candidate, job_description),
+            'skills_score': breakdown['skills'],
+            'experience_score': breakdown['experience'],
+            'education_score': breakdown['education'],
+            'preferred_skills_score': breakdown['preferred'],
+            'role_relevance_score': breakdown['role'],
             'weights_used': self.weights
         }
\ No newline at end of file
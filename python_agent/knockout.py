@@ -0,0 +1,246 @@
+"""
+Knockout Module
+Hard job requirements checked on the start of a resume, before it is fully parsed
+"""
+
+import re
+import json
+from pathlib import Path
+from typing import Dict, List, Any, Optional, Set
+
+from skills_taxonomy import SkillsTaxonomy
+
+# "Remote" on its own (a location line, "(Remote)") or as remote work, not "remotely" or "remote sensing"
+REMOTE_PATTERN = re.compile(r'\bremote(?=[ \t]*(?:$|[,;|/).])|[ -](?:work|only|first|friendly|position|role|job))',
+                            re.IGNORECASE | re.MULTILINE)
+
+
+class KnockedOut(Exception):
+    """Raised when a resume fails a knockout rule; carries the rule and the time spent on it"""
+
+    def __init__(self, rule: str, reason: str, seconds: float = 0.0):
+        # Passing every field to Exception keeps it picklable across parser processes
+        super().__init__(rule, reason, seconds)
+        self.rule = rule
+        self.reason = reason
+        self.seconds = seconds
+
+    def __str__(self) -> str:
+        return f"Knocked out by rule '{self.rule}': {self.reason}"
+
+
+class KnockoutRule:
+    """Base class for knockout rules; facts are the cheap extractions named in needs"""
+
+    type = 'base'
+    needs: Set[str] = set()
+
+    def __init__(self, spec: Dict[str, Any], taxonomy: SkillsTaxonomy):
+        self.id = spec.get('id') or self.describe(spec)
+        # Missing facts (no location found, no years stated) pass unless configured otherwise
+        self.reject_missing = spec.get('missing', 'pass') == 'reject'
+
+    def describe(self, spec: Dict[str, Any]) -> str:
+        return self.type
+
+    def check(self, facts: Dict[str, Any]) -> Optional[str]:
+        """Return the reason a resume fails this rule, or None if it passes"""
+        raise NotImplementedError
+
+
+class SkillsRule(KnockoutRule):
+    """{"type": "skills", "all": [...], "any": [...]} matched through the skills taxonomy"""
+
+    type = 'skills'
+    needs = {'skill_ids'}
+
+    def __init__(self, spec: Dict[str, Any], taxonomy: SkillsTaxonomy):
+        super().__init__(spec, taxonomy)
+        self.taxonomy = taxonomy
+        self.all_of = self._skill_ids(spec.get('all', []), taxonomy)
+        self.any_of = self._skill_ids(spec.get('any', []), taxonomy)
+        if not self.all_of and not self.any_of:
+            raise ValueError("Knockout skills rule needs an 'all' or 'any' list")
+
+    @staticmethod
+    def _skill_ids(names: List[str], taxonomy: SkillsTaxonomy) -> List[str]:
+        skill_ids = []
+        for name in names:
+            skill_id = taxonomy.normalize(name)
+            if skill_id is None:
+                raise ValueError(f"Knockout skill '{name}' is not in the skills taxonomy")
+            skill_ids.append(skill_id)
+        return skill_ids
+
+    def describe(self, spec: Dict[str, Any]) -> str:
+        parts = [f"{key} of {', '.join(spec[key])}" for key in ('all', 'any') if spec.get(key)]
+        return f"skills: {'; '.join(parts)}"
+
+    def check(self, facts: Dict[str, Any]) -> Optional[str]:
+        found = facts['skill_ids']
+        missing = [skill_id for skill_id in self.all_of if skill_id not in found]
+        if missing:
+            return f"missing {', '.join(self.taxonomy.name(skill_id) for skill_id in missing)}"
+        if self.any_of and not found.intersection(self.any_of):
+            return f"none of {', '.join(self.taxonomy.name(skill_id) for skill_id in self.any_of)}"
+        return None
+
+
+class ExperienceRule(KnockoutRule):
+    """{"type": "experience", "min": years}"""
+
+    type = 'experience'
+    needs = {'experience'}
+
+    def __init__(self, spec: Dict[str, Any], taxonomy: SkillsTaxonomy):
+        super().__init__(spec, taxonomy)
+        self.minimum = spec['min']
+
+    def describe(self, spec: Dict[str, Any]) -> str:
+        return f"experience: at least {spec['min']} years"
+
+    def check(self, facts: Dict[str, Any]) -> Optional[str]:
+        years = facts['experience']
+        if years is None:
+            return "no years of experience stated" if self.reject_missing else None
+        return f"{years} years of experience" if years < self.minimum else None
+
+
+class LocationRule(KnockoutRule):
+    """{"type": "location", "any": ["CA", "Remote", ...]} matched as whole words, case-insensitively"""
+
+    type = 'location'
+    needs = {'location', 'text'}
+
+    def __init__(self, spec: Dict[str, Any], taxonomy: SkillsTaxonomy):
+        super().__init__(spec, taxonomy)
+        self.places = [place.lower() for place in spec['any']]
+        # Whole words only, so "CA" does not match the "ca" in "Chicago, IL"
+        self.pattern = re.compile(r'(?<![a-z0-9])(?:' + '|'.join(re.escape(place) for place in self.places) +
+                                  r')(?![a-z0-9])', re.IGNORECASE)
+
+    def describe(self, spec: Dict[str, Any]) -> str:
+        return f"location: any of {', '.join(spec['any'])}"
+
+    def check(self, facts: Dict[str, Any]) -> Optional[str]:
+        location = facts['location']
+        if location is None:
+            return "no location found" if self.reject_missing else None
+        # Willingness to work remotely often sits outside the address line
+        if self.pattern.search(location) or ('remote' in self.places and REMOTE_PATTERN.search(facts['text'])):
+            return None
+        return f"located in {location}"
+
+
+RULE_TYPES = {rule.type: rule for rule in (SkillsRule, ExperienceRule, LocationRule)}
+
+
+class KnockoutRules:
+    """The knockout rules of one job description, in the order they are checked"""
+
+    def __init__(self, rules: List[KnockoutRule], config: Dict[str, Any]):
+        self.rules = rules
+        knockout_config = config.get('knockout', {})
+        # How much of a resume the rules see: the first pages of a PDF, the first characters of any text
+        self.partial_pages = knockout_config.get('partial_pages', 2)
+        self.partial_chars = int(knockout_config.get('partial_kb', 16) * 1024)
+        self.needs = set().union(*(rule.needs for rule in rules))
+
+    @classmethod
+    def from_job(cls, job_description: Dict[str, Any], config: Dict[str, Any],
+                 taxonomy: SkillsTaxonomy) -> Optional['KnockoutRules']:
+        """Build the rules in a job's "knockout" list, or None if it has none"""
+        specs = job_description.get('knockout') or []
+        if not specs or not config.get('knockout', {}).get('enabled', True):
+            return None
+
+        rules = []
+        for spec in specs:
+            rule_type = RULE_TYPES.get(spec.get('type'))
+            if rule_type is None:
+                raise ValueError(f"Unknown knockout rule type '{spec.get('type')}' "
+                                 f"(expected one of {', '.join(RULE_TYPES)})")
+            rules.append(rule_type(spec, taxonomy))
+        return cls(rules, config)
+
+    @property
+    def ids(self) -> List[str]:
+        return [rule.id for rule in self.rules]
+
+    def check(self, facts: Dict[str, Any], seconds: float = 0.0):
+        """Raise KnockedOut for the first rule the facts fail"""
+        for rule in self.rules:
+            reason = rule.check(facts)
+            if reason is not None:
+                raise KnockedOut(rule.id, reason, seconds)
+
+
+class KnockoutReport:
+    """Rejections of one run (or merged shards), with their cost compared to full parses"""
+
+    def __init__(self, rule_ids: List[str]):
+        self.rule_ids = rule_ids
+        self.rejected: List[Dict[str, Any]] = []
+        self.rejected_seconds = 0.0
+        self.parsed = 0
+        self.parsed_seconds = 0.0
+
+    def add(self, resume_file: Path, error: KnockedOut):
+        """Record a rejected resume"""
+        self.rejected.append({'file_name': resume_file.name, 'resume_file': str(resume_file),
+                              'rule': error.rule, 'reason': error.reason})
+        self.rejected_seconds += error.seconds
+
+    def merge(self, other: 'KnockoutReport'):
+        """Fold another shard's report into this one"""
+        self.rejected.extend(other.rejected)
+        self.rejected_seconds += other.rejected_seconds
+        self.parsed += other.parsed
+        self.parsed_seconds += other.parsed_seconds
+
+    def to_dict(self, rejections: bool = False) -> Dict[str, Any]:
+        """Counts per rule and timings; the per-file rejections only with rejections=True (shard partials)
+
+        Results keep the rejections in their own file (write_rejections), so the
+        results summary stays the same size however many resumes were rejected.
+        """
+        by_rule = {rule_id: 0 for rule_id in self.rule_ids}
+        for rejection in self.rejected:
+            by_rule[rejection['rule']] = by_rule.get(rejection['rule'], 0) + 1
+
+        rejected = len(self.rejected)
+        parsed_each = self.parsed_seconds / self.parsed if self.parsed else 0.0
+        rejected_each = self.rejected_seconds / rejected if rejected else 0.0
+        # Passing resumes paid for the check too; without the filter every resume costs one plain full parse
+        full_parse = max(parsed_each - rejected_each, 0.0)
+        with_filter = self.parsed_seconds + self.rejected_seconds
+        without_filter = (self.parsed + rejected) * full_parse
+        return {
+            'rules': self.rule_ids,
+            'checked': self.parsed + rejected,
+            'rejected': rejected,
+            'by_rule': by_rule,
+            'rejected_ms_per_resume': round(rejected_each * 1000, 2),
+            'parsed_ms_per_resume': round(parsed_each * 1000, 2),
+            # Without a resume that passed there is no full parse to compare against
+            'estimated_speedup': round(without_filter / with_filter, 2) if with_filter and self.parsed else None,
+            'parsed': self.parsed,
+            'parsed_seconds': self.parsed_seconds,
+            'rejected_seconds': self.rejected_seconds,
+            **({'candidates': self.rejected} if rejections else {})
+        }
+
+    def write_rejections(self, path: Path):
+        """Write one JSON line per rejected resume"""
+        with open(path, 'w') as f:
+            for rejection in self.rejected:
+                f.write(json.dumps(rejection) + '\n')
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'KnockoutReport':
+        report = cls(data['rules'])
+        report.rejected = list(data.get('candidates', []))
+        report.rejected_seconds = data['rejected_seconds']
+        report.parsed = data['parsed']
+        report.parsed_seconds = data['parsed_seconds']
+        return report
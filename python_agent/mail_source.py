@@ -0,0 +1,202 @@
+"""
+Mail Source Module
+Streams resume attachments out of local mbox files and Maildir folders
+"""
+
+import os
+import json
+import email
+import hashlib
+import logging
+import mimetypes
+from email import policy
+from email.message import EmailMessage
+from email.utils import getaddresses
+from pathlib import Path, PurePath
+from typing import Callable, Dict, Iterator, List, Any, Optional, Tuple
+
+# Automated senders are not useful as a candidate's contact address
+NO_REPLY_MARKERS = ('noreply', 'no-reply', 'donotreply', 'do-not-reply', 'mailer-daemon')
+
+
+def is_maildir(path: Path) -> bool:
+    """Return True if a folder has the Maildir cur/new/tmp layout"""
+    return path.is_dir() and all((path / sub).is_dir() for sub in ('cur', 'new', 'tmp'))
+
+
+def sender_address(message: EmailMessage) -> Optional[str]:
+    """Best reply address for a message: Reply-To, then From, skipping no-reply senders"""
+    for header in ('Reply-To', 'From'):
+        for _, address in getaddresses([str(value) for value in message.get_all(header, [])]):
+            address = address.strip().lower()
+            if '@' in address and not any(marker in address for marker in NO_REPLY_MARKERS):
+                return address
+    return None
+
+
+class MailboxSource:
+    """Yields resume attachments from an mbox file or Maildir, newer than a saved high-water mark"""
+
+    def __init__(self, path: Path, config: Dict[str, Any], extensions: List[str], rescan: bool = False):
+        self.path = path.resolve()
+        self.logger = logging.getLogger(__name__)
+        self.extensions = extensions
+
+        mailbox_config = config.get('mailbox', {})
+        processing_config = config.get('processing', {})
+        self.state_file = Path(mailbox_config.get('state_file', './cache/mailbox_state.json'))
+        self.max_message_bytes = int(mailbox_config.get('max_message_mb', 50) * 1024 * 1024)
+        self.max_attachment_bytes = int(processing_config.get('max_resume_size_mb', 10) * 1024 * 1024)
+
+        self.maildir = is_maildir(self.path)
+        self.mark = None if rescan else self._load_state().get(str(self.path))
+        self._next_mark = self.mark
+        self._senders: Dict[Path, Optional[str]] = {}
+        self.messages_read = 0
+
+    def iterate(self, keep: Optional[Callable[[Path], bool]] = None
+                ) -> Iterator[Tuple[Path, Optional[bytes], Optional[Exception]]]:
+        """Yield (path, data, error) for each resume attachment in new messages
+
+        keep, if given, selects the attachments to yield (e.g. one shard's); senders are
+        only remembered for attachments that are yielded.
+        """
+        messages = self._maildir_messages() if self.maildir else self._mbox_messages()
+        for key, raw, mark in messages:
+            self.messages_read += 1
+            try:
+                message = email.message_from_bytes(raw, policy=policy.default)
+                sender = sender_address(message)
+                attachments = list(self._attachments(message, key))
+            except Exception as e:
+                yield self.path / key / 'message', None, e
+                attachments = []
+
+            for path, data, error in attachments:
+                if keep is not None and not keep(path):
+                    continue
+                self._senders[path] = sender
+                yield path, data, error
+            # The mark only moves past a message once all its attachments were handed out
+            self._next_mark = mark
+
+    def sender_for(self, path: Path) -> Optional[str]:
+        """Sender address of the message an attachment came from (forgotten once asked)"""
+        return self._senders.pop(path, None)
+
+    def commit(self):
+        """Persist the high-water mark so the next run starts after the mail read here"""
+        # Senders of attachments that were never looked up are not needed past the mark
+        self._senders.clear()
+        if self._next_mark == self.mark:
+            return
+        state = self._load_state()
+        state[str(self.path)] = self._next_mark
+        self.state_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.state_file.with_suffix('.tmp')
+        with open(tmp_path, 'w') as f:
+            json.dump(state, f, indent=2)
+        tmp_path.replace(self.state_file)
+        self.mark = self._next_mark
+        self.logger.info(f"Mailbox {self.path}: read {self.messages_read} new messages, high-water mark saved")
+
+    def _load_state(self) -> Dict[str, Any]:
+        if not self.state_file.exists():
+            return {}
+        with open(self.state_file, 'r') as f:
+            return json.load(f)
+
+    def _attachments(self, message: EmailMessage, key: str) -> Iterator[Tuple[Path, Optional[bytes], Optional[Exception]]]:
+        for part in message.walk():
+            if part.is_multipart():
+                continue
+            file_name = part.get_filename()
+            if not file_name and part.get_content_disposition() != 'attachment':
+                continue
+            file_name = PurePath(file_name or 'attachment' + (mimetypes.guess_extension(part.get_content_type()) or '')).name
+            suffix = PurePath(file_name).suffix.lower()
+            if suffix.lstrip('.') not in self.extensions:
+                continue
+
+            # Everyone sends 'resume.pdf', so names carry a short message digest
+            path = self.path / key / f"{PurePath(file_name).stem}_{hashlib.sha1(key.encode()).hexdigest()[:8]}{suffix}"
+            data = part.get_payload(decode=True) or b''
+            if len(data) > self.max_attachment_bytes:
+                yield path, None, ValueError(f"{file_name} is {len(data) / 1024 / 1024:.1f} MB, over the resume size limit")
+            else:
+                yield path, data, None
+
+    def _mbox_messages(self) -> Iterator[Tuple[str, bytes, Dict[str, Any]]]:
+        """Split an mbox front to back from the saved offset, one message in memory at a time"""
+        with open(self.path, 'rb') as f:
+            offset = 0
+            # Resume from the mark unless the file was replaced or truncated since
+            if self.mark and self.mark['offset'] <= os.fstat(f.fileno()).st_size:
+                if self._mbox_head(f, self.mark['offset']) == self.mark['head']:
+                    offset = self.mark['offset']
+            f.seek(offset)
+
+            start = position = offset
+            lines, size, previous_blank = [], 0, True
+            for line in f:
+                if line.startswith(b'From ') and previous_blank:
+                    if position > start:
+                        yield from self._mbox_message(f, start, position, lines, size)
+                    start, lines, size = position, [], 0
+                    position += len(line)
+                    previous_blank = False
+                    continue
+
+                position += len(line)
+                previous_blank = line in (b'\n', b'\r\n')
+                size += len(line)
+                # Oversized messages are only measured, not buffered
+                if size <= self.max_message_bytes:
+                    lines.append(line[1:] if line.startswith(b'>From ') else line)
+                else:
+                    lines = []
+
+            if position > start:
+                yield from self._mbox_message(f, start, position, lines, size)
+
+    def _mbox_message(self, f, start: int, end: int, lines: List[bytes],
+                      size: int) -> Iterator[Tuple[str, bytes, Dict[str, Any]]]:
+        mark = {'offset': end, 'head': self._mbox_head(f, end)}
+        if size > self.max_message_bytes:
+            self.logger.warning(f"Skipping {size / 1024 / 1024:.1f} MB message at offset {start} in {self.path}")
+            self._next_mark = mark
+            return
+        yield f"offset-{start}", b"".join(lines), mark
+
+    @staticmethod
+    def _mbox_head(f, end: int) -> str:
+        """Fingerprint of the file's first bytes (up to end), to notice a replaced mbox"""
+        return hashlib.sha1(os.pread(f.fileno(), min(4096, end), 0)).hexdigest()
+
+    def _maildir_messages(self) -> Iterator[Tuple[str, bytes, Dict[str, Any]]]:
+        """Read Maildir messages newer than the mark, oldest first"""
+        mark = (self.mark['mtime_ns'], self.mark['key']) if self.mark else None
+        entries = []
+        for sub in ('new', 'cur'):
+            with os.scandir(self.path / sub) as scan:
+                for entry in scan:
+                    if not entry.is_file() or entry.name.startswith('.'):
+                        continue
+                    # Flags after ':' change when mail is read; the unique key does not
+                    position = (entry.stat().st_mtime_ns, entry.name.split(':', 1)[0])
+                    if mark is None or position > mark:
+                        entries.append((position, sub, entry.name))
+        entries.sort()
+
+        for (mtime_ns, key), sub, name in entries:
+            message_path = self.path / sub / name
+            try:
+                size = message_path.stat().st_size
+                if size > self.max_message_bytes:
+                    self.logger.warning(f"Skipping {size / 1024 / 1024:.1f} MB message {name} in {self.path}")
+                    self._next_mark = {'mtime_ns': mtime_ns, 'key': key}
+                    continue
+                raw = message_path.read_bytes()
+            except FileNotFoundError:
+                continue  # moved between new/ and cur/ while listing; picked up next run
+            yield key, raw, {'mtime_ns': mtime_ns, 'key': key}
@@ -7,110 +7,178 @@ Main application entry point
 import os
 import sys
 import json
+import logging
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Callable, Iterable, Optional, Tuple
 import argparse
+import time
 from datetime import datetime
 
 from resume_parser import ResumeParser
 from job_analyzer import JobAnalyzer
 from candidate_ranker import CandidateRanker
+from archives import is_archive, iterate_archive
+from dedup import NearDuplicateDetector
+from export import EXPORT_FORMATS, XLSX_MAX_ROWS, export_rankings
+from extractors import NoTextExtractedError
+from knockout import KnockedOut, KnockoutRules, KnockoutReport
+from ocr import OCRLane
+from mail_source import MailboxSource
+from parse_pool import ParsePool
+from prefetch import Prefetcher
+from scheduling import WorkScheduler
+from score_store import ScoreStore, save_scores, parse_weights
+from run_history import RunHistory, score_distribution, stage_trend, PERIODS
+from results_index import write_indexed_results, ResultsReader, DEFAULT_PAGE_SIZE
+from sharding import parse_shard, shard_of, select_shard, build_partial, load_partials, merge_knockouts, merge_partials
+from text_corpus import TextCorpus, open_corpus, move_text_to_corpus
 from email_sender import EmailSender
-from utils import setup_logging, load_config
+from utils import setup_logging, load_config, PER_RESUME
 
 def main():
     """Main application entry point"""
-    parser = argparse.ArgumentParser(description='AI Resume Screening Agent')
+    if len(sys.argv) > 1 and sys.argv[1] in COMMANDS:
+        return COMMANDS[sys.argv[1]](sys.argv[2:])
+    
+    parser = argparse.ArgumentParser(description='AI Resume Screening Agent',
+                                     epilog=f"Other commands: {', '.join(COMMANDS)} (see '<command> --help')")
     parser.add_argument('--job-file', required=True, help='Path to job description JSON file')
-    parser.add_argument('--resume-folder', required=True, help='Path to folder containing resume PDFs')
+    add_source_arguments(parser)
     parser.add_argument('--output-folder', default='./output', help='Output folder for results')
     parser.add_argument('--send-email', action='store_true', help='Send email with results')
     parser.add_argument('--config', default='config.json', help='Configuration file path')
+    parser.add_argument('--shard', help="Process only shard i/N of the resume folder and write a partial "
+                                        "result for 'main.py merge' (e.g. 0/4)")
+    parser.add_argument('--top-k', type=int, help='Candidates kept in a shard partial result (0 keeps all)')
     
     args = parser.parse_args()
+    try:
+        shard = parse_shard(args.shard) if args.shard else None
+    except ValueError as e:
+        parser.error(str(e))
+    
+    # Load configuration
+    try:
+        config = load_config(args.config)
+    except Exception as e:
+        print(f"Could not load configuration from {args.config}: {str(e)}")
+        sys.exit(1)
     
     # Setup logging
-    logger = setup_logging()
+    logger = setup_logging(logging_config=config.get('logging', {}))
     logger.info("Starting Resume Screening Agent")
     
     try:
-        # Load configuration
-        config = load_config(args.config)
-        
         # Initialize components
-        resume_parser = ResumeParser(config)
-        job_analyzer = JobAnalyzer(config)
+        corpus = open_corpus(config, Path(args.output_folder) / f"corpus_{datetime.now().strftime('%Y%m%d_%H%M%S')}.bin")
+        resume_parser = ResumeParser(config, corpus)
+        job_analyzer = JobAnalyzer(config, corpus)
         candidate_ranker = CandidateRanker(config)
+        duplicate_detector = NearDuplicateDetector(config, corpus)
+        ocr_lane = OCRLane(config, resume_parser.extractors.cache) if OCRLane.is_enabled(config) else None
         email_sender = EmailSender(config) if args.send_email else None
         
         # Load job description
         logger.info(f"Loading job description from {args.job_file}")
         with open(args.job_file, 'r') as f:
             job_description = json.load(f)
+        knockout = KnockoutRules.from_job(job_description, config, resume_parser.taxonomy)
+        if knockout is not None:
+            logger.info(f"Checking {len(knockout.rules)} knockout rules before full parsing: {', '.join(knockout.ids)}")
         
-        # Process resumes
-        logger.info(f"Processing resumes from {args.resume_folder}")
-        resume_folder = Path(args.resume_folder)
-        pdf_files = list(resume_folder.glob("*.pdf"))
+        # Process resumes from a folder or straight out of archives
+        workers = parse_workers(args, config)
+        scheduler = work_scheduler(config, workers)
+        sources, total, mailbox = resume_sources(args, config, resume_parser.extractors.supported_extensions(),
+                                                 shard, scheduler)
         
-        if not pdf_files:
-            logger.error("No PDF files found in resume folder")
-            sys.exit(1)
+        # Parse all resumes; image-only PDFs are handed to the OCR lane
+        stage_timings = {}
+        stage_start = time.perf_counter()
+        candidates, knockouts = parse_resumes(sources, total, resume_parser, ocr_lane, config, workers,
+                                              mailbox.sender_for if mailbox else None, scheduler, knockout)
+        
+        # Rejections are a result too: an empty ranking is written with them and the mailbox mark moves on
+        all_rejected = not candidates and knockouts is not None and bool(knockouts.rejected)
+        if all_rejected:
+            logger.warning(f"All {len(knockouts.rejected)} resumes failed the knockout rules")
+        
+        if not candidates and mailbox is not None and shard is None and not all_rejected:
+            mailbox.commit()
+            logger.info("No new resume attachments in the mailbox")
+            return
         
-        logger.info(f"Found {len(pdf_files)} resume files")
-        
-        # Parse all resumes
-        candidates = []
-        for i, pdf_file in enumerate(pdf_files, 1):
-            logger.info(f"Processing resume {i}/{len(pdf_files)}: {pdf_file.name}")
-            try:
-                candidate_data = resume_parser.parse_resume(pdf_file)
-                candidate_data['resume_file'] = str(pdf_file)
-                candidates.append(candidate_data)
-            except Exception as e:
-                logger.error(f"Failed to process {pdf_file.name}: {str(e)}")
-                continue
-        
-        if not candidates:
+        # An empty shard still writes its (empty) partial result
+        if not candidates and shard is None and not all_rejected:
             logger.error("No resumes could be processed successfully")
             sys.exit(1)
         
         logger.info(f"Successfully processed {len(candidates)} resumes")
+        stage_timings['parse'] = time.perf_counter() - stage_start
         
-        # Analyze candidates against job requirements
-        logger.info("Analyzing candidates against job requirements")
+        # Fold near-duplicate resumes so each cluster is scored once
+        stage_start = time.perf_counter()
+        candidates, duplicates = duplicate_detector.deduplicate(candidates)
+        stage_timings['dedup'] = time.perf_counter() - stage_start
+        
+        # Score candidates against job requirements; only the shortlist is explained, once ranked
+        logger.info("Scoring candidates against job requirements")
+        stage_start = time.perf_counter()
         analyzed_candidates = []
         for candidate in candidates:
-            analysis = job_analyzer.analyze_candidate(candidate, job_description)
+            analysis = job_analyzer.score_candidate(candidate, job_description)
             analyzed_candidates.append(analysis)
+        stage_timings['score'] = time.perf_counter() - stage_start
         
-        # Rank candidates
-        logger.info("Ranking candidates")
-        ranked_results = candidate_ranker.rank_candidates(analyzed_candidates, job_description)
-        
-        # Generate output
         output_folder = Path(args.output_folder)
         output_folder.mkdir(exist_ok=True)
         
-        # Save detailed results
-        results_file = output_folder / f"screening_results_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
-        with open(results_file, 'w') as f:
-            json.dump(ranked_results, f, indent=2, default=str)
-        
-        # Generate summary report
-        summary_file = output_folder / f"summary_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.txt"
-        generate_summary_report(ranked_results, job_description, summary_file)
-        
-        logger.info(f"Results saved to {results_file}")
-        logger.info(f"Summary report saved to {summary_file}")
-        
-        # Print top 3 candidates to console
-        print_top_candidates(ranked_results)
+        if shard is not None:
+            # Shards only write a partial result; 'main.py merge' produces the final outputs
+            top_k = args.top_k if args.top_k is not None else config.get('sharding', {}).get('top_k', 100)
+            partial = build_partial(analyzed_candidates, job_description, shard, top_k, duplicates,
+                                    time.time() - candidate_ranker.start_time, duplicate_detector.signatures,
+                                    duplicate_detector.folded)
+            if knockouts is not None:
+                # The merge writes the rejections file of the whole run, so the shards pass theirs on
+                partial['knockouts'] = knockouts.to_dict(rejections=True)
+            partial['stage_timings'] = stage_timings
+            partial_file = output_folder / f"partial_{shard[0]}of{shard[1]}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+            with open(partial_file, 'w') as f:
+                json.dump(partial, f, indent=2, default=str)
+            logger.info(f"Partial result for shard {shard[0]}/{shard[1]} saved to {partial_file}")
+        else:
+            # Rank candidates
+            logger.info("Ranking candidates")
+            stage_start = time.perf_counter()
+            ranked_results = candidate_ranker.rank_candidates(analyzed_candidates, job_description)
+            stage_timings['rank'] = time.perf_counter() - stage_start
+            ranked_results['duplicates'] = duplicates
+            ranked_results['stage_timings'] = stage_timings
+            ranked_results['workers'] = workers
+            if corpus is not None:
+                ranked_results['corpus_file'] = str(corpus.path)
+            if knockouts is not None:
+                ranked_results['knockouts'] = knockouts.to_dict()
+            
+            # Persist sub-scores so rankings can be recomputed under new weights
+            scores_file = output_folder / f"scores_{datetime.now().strftime('%Y%m%d_%H%M%S')}.npz"
+            save_scores(scores_file, analyzed_candidates, job_analyzer.weights, job_description)
+            logger.info(f"Score breakdowns saved to {scores_file}")
+            
+            write_results(ranked_results, job_description, output_folder, config, knockouts)
+            
+            # Sharded runs leave the mailbox mark alone; a failed shard must be able to rerun
+            if mailbox is not None:
+                mailbox.commit()
+            
+            # Send email if requested
+            if email_sender and args.send_email:
+                logger.info("Sending email with results")
+                email_sender.send_results_email(ranked_results, job_description)
         
-        # Send email if requested
-        if email_sender and args.send_email:
-            logger.info("Sending email with results")
-            email_sender.send_results_email(ranked_results, job_description)
+        if corpus is not None:
+            corpus.close()
         
         logger.info("Resume screening completed successfully")
         
@@ -118,6 +186,554 @@ def main():
         logger.error(f"Application error: {str(e)}")
         sys.exit(1)
 
+def parse_resumes(sources: Iterable[Tuple[Path, Optional[bytes], Optional[Exception]]], total: Optional[int],
+                  resume_parser: ResumeParser, ocr_lane: Optional[OCRLane], config: Dict[str, Any],
+                  workers: int = 1, email_fallback: Optional[Callable[[Path], Optional[str]]] = None,
+                  scheduler: Optional[WorkScheduler] = None, knockout: Optional[KnockoutRules] = None
+                  ) -> Tuple[List[Dict[str, Any]], Optional[KnockoutReport]]:
+    """Parse resumes from (path, data, read_error) sources; image-only PDFs are handed to the OCR lane
+    
+    email_fallback supplies a contact address (e.g. the mail sender) for resumes that state none.
+    scheduler, if given, learns parse times for ordering later runs.
+    knockout rules, if given, reject resumes from their first pages; the rejections are
+    returned as a report alongside the candidates (None without rules).
+    """
+    logger = logging.getLogger(__name__)
+    report = KnockoutReport(knockout.ids) if knockout is not None else None
+    
+    start = time.perf_counter()
+    pool = None
+    if workers > 1:
+        pool = ParsePool(config, workers, scheduler, knockout, resume_parser.corpus)
+        parsed = pool.parse(sources)
+    else:
+        parsed = parse_sequentially(sources, resume_parser, knockout)
+    
+    candidates = []
+    ocr_jobs = []
+    for i, (resume_file, data, candidate_data, error) in enumerate(parsed, 1):
+        logger.info("Processing resume %d/%s: %s", i, total or '?', resume_file.name,
+                    extra=dict(PER_RESUME, file=resume_file.name))
+        fallback_email = email_fallback(resume_file) if email_fallback else None
+        if isinstance(error, NoTextExtractedError):
+            future = ocr_lane.submit(data, resume_file.name) if ocr_lane else None
+            if future is not None:
+                logger.info(f"Queued {resume_file.name} for OCR")
+                ocr_jobs.append((resume_file, future, fallback_email))
+            else:
+                logger.error(f"Failed to process {resume_file.name}: {str(error)}")
+        elif isinstance(error, KnockedOut):
+            logger.info("Rejected %s: %s", resume_file.name, error, extra=dict(PER_RESUME, file=resume_file.name))
+            report.add(resume_file, error)
+        elif error is not None:
+            logger.error(f"Failed to process {resume_file.name}: {str(error)}")
+        else:
+            candidate_data['resume_file'] = str(resume_file)
+            candidate_data['email'] = candidate_data.get('email') or fallback_email
+            candidates.append(move_text_to_corpus(candidate_data, resume_parser.corpus))
+    
+    if report is not None:
+        # Workers only count time spent on successful parses; here the loop's time includes rejections
+        if pool is not None:
+            report.parsed_seconds = sum(worker['busy_seconds'] for worker in pool.utilization)
+        else:
+            report.parsed_seconds = max(0.0, time.perf_counter() - start - report.rejected_seconds)
+    
+    # Collect OCR results once the text-based resumes are done
+    ocr_parse_seconds = 0.0
+    for resume_file, future, fallback_email in ocr_jobs:
+        try:
+            text = future.result()
+            if not text:
+                raise NoTextExtractedError("OCR produced no text")
+            parse_start = time.perf_counter()
+            contact = resume_parser.check_knockout(text, knockout).get('contact') if knockout is not None else None
+            candidate_data = resume_parser.parse_text(text, resume_file.name, str(resume_file), contact)
+            candidate_data['resume_file'] = str(resume_file)
+            candidate_data['email'] = candidate_data.get('email') or fallback_email
+            candidate_data['ocr'] = True
+            candidates.append(candidate_data)
+            ocr_parse_seconds += time.perf_counter() - parse_start
+        except KnockedOut as e:
+            logger.info(f"Rejected {resume_file.name}: {str(e)}")
+            report.add(resume_file, e)
+        except Exception as e:
+            logger.error(f"Failed to process {resume_file.name} with OCR: {str(e)}")
+    
+    if ocr_lane is not None:
+        ocr_lane.shutdown()
+    
+    if report is not None:
+        # Resumes parsed from OCR text count too; the OCR itself is not parse time
+        report.parsed = len(candidates)
+        report.parsed_seconds += ocr_parse_seconds
+    
+    # Workers finish out of order; a fixed order keeps dedup and tie-breaking reproducible
+    candidates.sort(key=lambda candidate: candidate['resume_file'])
+    make_ids_unique(candidates)
+    return candidates, report
+
+def make_ids_unique(candidates: List[Dict[str, Any]]):
+    """Suffix repeated candidate IDs, e.g. of a zip holding two members under the same path"""
+    seen: Dict[str, int] = {}
+    for candidate in candidates:
+        count = seen.get(candidate['id'], 0) + 1
+        seen[candidate['id']] = count
+        if count > 1:
+            candidate['id'] = f"{candidate['id']}_{count}"
+
+def parse_sequentially(sources: Iterable[Tuple[Path, Optional[bytes], Optional[Exception]]],
+                       resume_parser: ResumeParser, knockout: Optional[KnockoutRules] = None):
+    """Parse resumes one by one in this process, yielding (path, data, candidate, error)"""
+    for resume_file, data, read_error in sources:
+        if read_error is not None:
+            yield resume_file, data, None, read_error
+            continue
+        try:
+            yield resume_file, data, resume_parser.parse_resume(resume_file, data, knockout), None
+        except Exception as e:
+            yield resume_file, data, None, e
+
+def add_source_arguments(parser: argparse.ArgumentParser):
+    """Add the resume input options shared by screening and indexing"""
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument('--resume-folder', help='Path to folder containing resume files (or a zip/tar archive)')
+    source.add_argument('--resume-archive', nargs='+',
+                        help='zip/tar(.gz/.bz2/.xz) archives of resumes, read without unpacking')
+    source.add_argument('--mailbox', help='mbox file or Maildir folder to read resume attachments from')
+    parser.add_argument('--mailbox-rescan', action='store_true',
+                        help='Ignore the saved high-water mark and read the whole mailbox')
+    parser.add_argument('--workers', type=int, help='Parser processes (default: processing.workers)')
+
+def parse_workers(args: argparse.Namespace, config: Dict[str, Any]) -> int:
+    """Number of parser processes to use"""
+    workers = args.workers if args.workers is not None else config.get('processing', {}).get('workers', 1)
+    return max(1, workers)
+
+def work_scheduler(config: Dict[str, Any], workers: int) -> Optional[WorkScheduler]:
+    """Cost-ordered scheduling for parallel runs; one process gains nothing from reordering"""
+    return WorkScheduler(config) if workers > 1 and WorkScheduler.is_enabled(config) else None
+
+def resume_sources(args: argparse.Namespace, config: Dict[str, Any], extractable: List[str],
+                   shard: Optional[Tuple[int, int]] = None, scheduler: Optional[WorkScheduler] = None
+                   ) -> Tuple[Iterable[Tuple[Path, Optional[bytes], Optional[Exception]]], Optional[int],
+                              Optional[MailboxSource]]:
+    """Resolve the resume input options into (path, data, error) sources
+    
+    Also returns the number of resumes if known up front, and the mailbox source if reading mail.
+    Folder resumes are ordered longest first when a scheduler is given; streamed ones cannot be.
+    """
+    logger = logging.getLogger(__name__)
+    processing_config = config.get('processing', {})
+    supported_formats = processing_config.get('supported_formats', ['pdf'])
+    extensions = sorted({fmt.lower().lstrip('.') for fmt in supported_formats} & set(extractable))
+    
+    if args.mailbox:
+        # Attachments stream from new messages only; the mark is saved once results are written
+        mailbox = MailboxSource(Path(args.mailbox), config, extensions, rescan=args.mailbox_rescan)
+        logger.info(f"Reading resume attachments from {'Maildir' if mailbox.maildir else 'mbox'} {mailbox.path}"
+                    + (" (all mail)" if mailbox.mark is None else " (new mail since last run)"))
+        keep = (lambda path: shard_of(path.name, shard[1]) == shard[0]) if shard is not None else None
+        return mailbox.iterate(keep), None, mailbox
+    
+    archives = [Path(path) for path in args.resume_archive or []]
+    folder = Path(args.resume_folder) if args.resume_folder else None
+    if folder is not None and is_archive(folder):
+        archives.append(folder)
+        folder = None
+    
+    if archives:
+        # Members stream straight from the archives; their count is not known up front
+        max_bytes = int(processing_config.get('max_resume_size_mb', 10) * 1024 * 1024)
+        logger.info(f"Reading resumes from {len(archives)} archive(s): {', '.join(map(str, archives))}")
+        members = (member for archive in archives for member in iterate_archive(archive, extensions, max_bytes))
+        if shard is not None:
+            members = (member for member in members if shard_of(member[0].name, shard[1]) == shard[0])
+        return members, None, None
+    
+    logger.info(f"Processing resumes from {folder}")
+    resume_files = discover_resumes(folder, supported_formats, extractable)
+    if not resume_files:
+        logger.error(f"No resume files ({', '.join(supported_formats)}) found in resume folder")
+        sys.exit(1)
+    
+    logger.info(f"Found {len(resume_files)} resume files")
+    
+    if shard is not None:
+        resume_files = select_shard(resume_files, *shard)
+        logger.info(f"Shard {shard[0]}/{shard[1]}: processing {len(resume_files)} resume files")
+    
+    if scheduler is not None:
+        resume_files = scheduler.order(resume_files)
+    
+    return Prefetcher(config).iterate(resume_files), len(resume_files), None
+
+def write_results(ranked_results: Dict[str, Any], job_description: Dict[str, Any], output_folder: Path,
+                  config: Dict[str, Any], knockouts: Optional[KnockoutReport] = None):
+    """Explain the shortlist, save results JSON and summary report, and print the top candidates
+    
+    Knockout rejections, if any, go to their own file; the results only keep counts per rule.
+    """
+    logger = logging.getLogger(__name__)
+    results_config = config.get('results', {})
+    
+    # Narratives are only written for candidates someone will read; the job is kept so
+    # others can be explained on request ('main.py results --explain')
+    job_analyzer = JobAnalyzer(config)
+    job_analyzer.explain_shortlist(ranked_results, job_description, results_config.get('explain_top', 25))
+    ranked_results['job_description'] = job_description
+    
+    if knockouts is not None and knockouts.rejected:
+        rejections_file = output_folder / f"knockout_rejections_{datetime.now().strftime('%Y%m%d_%H%M%S')}.jsonl"
+        knockouts.write_rejections(rejections_file)
+        ranked_results['knockouts']['rejections_file'] = str(rejections_file)
+        logger.info(f"{len(knockouts.rejected)} knockout rejections saved to {rejections_file}")
+    
+    # Save detailed results
+    results_file = output_folder / f"screening_results_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+    with open(results_file, 'w') as f:
+        json.dump(ranked_results, f, indent=2, default=str)
+    
+    # Paginated copy with a sidecar index, so readers can fetch one page or candidate
+    if results_config.get('indexed', True):
+        data_file, index_file = write_indexed_results(ranked_results, results_file)
+        logger.info(f"Indexed results saved to {data_file} ({index_file.name})")
+    
+    # Spreadsheet of the full ranking for HR
+    export_format = results_config.get('export')
+    if export_format:
+        export_file = results_file.with_suffix(f'.{export_format}')
+        rows = export_rankings(ranked_results['candidates'], export_file, ranked_results,
+                               lambda candidate: job_analyzer.explain_candidate(dict(candidate), job_description))
+        logger.info(f"Exported {rows} ranked candidates to {export_file}")
+    
+    # Generate summary report
+    summary_file = output_folder / f"summary_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.txt"
+    generate_summary_report(ranked_results, job_description, summary_file)
+    
+    logger.info(f"Results saved to {results_file}")
+    logger.info(f"Summary report saved to {summary_file}")
+    
+    # Queryable history of runs for 'main.py history'; a failure here must not fail the run
+    if RunHistory.is_enabled(config):
+        try:
+            RunHistory(config).append(ranked_results, job_description)
+        except Exception as e:
+            logger.warning(f"Could not record the run in the history: {str(e)}")
+    
+    # Print top 3 candidates to console
+    print_top_candidates(ranked_results)
+
+def merge_command(argv: List[str]):
+    """Combine shard partial results into final screening results"""
+    parser = argparse.ArgumentParser(prog='main.py merge',
+                                     description='Merge partial results written by --shard runs')
+    parser.add_argument('partials', nargs='+', help='partial_*.json files, one per shard')
+    parser.add_argument('--output-folder', default='./output', help='Output folder for results')
+    parser.add_argument('--send-email', action='store_true', help='Send email with results')
+    parser.add_argument('--config', default='config.json', help='Configuration file path')
+    args = parser.parse_args(argv)
+    
+    config = load_config(args.config)
+    logger = setup_logging(logging_config=config.get('logging', {}))
+    
+    try:
+        partials = load_partials([Path(path) for path in args.partials])
+    except (OSError, ValueError) as e:
+        logger.error(f"Cannot merge partial results: {str(e)}")
+        sys.exit(1)
+    
+    ranked_results = merge_partials(partials, config)
+    job_description = partials[0]['job_description']
+    
+    output_folder = Path(args.output_folder)
+    output_folder.mkdir(exist_ok=True)
+    write_results(ranked_results, job_description, output_folder, config, merge_knockouts(partials))
+    
+    if args.send_email:
+        logger.info("Sending email with results")
+        EmailSender(config).send_results_email(ranked_results, job_description)
+
+def results_command(argv: List[str]):
+    """Print the summary, a page or one candidate of an indexed results file as JSON"""
+    parser = argparse.ArgumentParser(prog='main.py results',
+                                     description='Read an indexed screening results file')
+    parser.add_argument('results', help='screening_results_*.jsonl file (or its .json/.idx sibling)')
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument('--page', type=int, help='0-based page of candidates in rank order')
+    group.add_argument('--candidate', help='Candidate ID to look up')
+    group.add_argument('--details', action='store_true', help='Duplicate clusters and agent reasoning')
+    parser.add_argument('--page-size', type=int, default=DEFAULT_PAGE_SIZE, help='Candidates per page')
+    parser.add_argument('--explain', action='store_true',
+                        help='Add strengths, concerns and a summary to candidates outside the shortlist')
+    parser.add_argument('--config', default='config.json', help='Configuration file path')
+    args = parser.parse_args(argv)
+    
+    with ResultsReader(Path(args.results)) as reader:
+        explain = None
+        if args.explain:
+            explain = results_explainer(reader.summary(), load_config(args.config))
+            if explain is None:
+                parser.error(f"{args.results} was written without its job description and cannot be explained")
+        
+        if args.page is not None:
+            candidates = reader.page(args.page, args.page_size)
+            output = {'page': args.page, 'page_size': args.page_size,
+                      'pages': reader.page_count(args.page_size), 'total': len(reader),
+                      'candidates': [explain(c) for c in candidates] if explain else candidates}
+        elif args.candidate is not None:
+            output = reader.candidate(args.candidate)
+            if output is None:
+                print(f"Candidate {args.candidate} not found", file=sys.stderr)
+                sys.exit(1)
+            if explain:
+                output = explain(output)
+        elif args.details:
+            output = reader.details()
+        else:
+            output = dict(reader.summary(), top_matches=reader.top_matches())
+    
+    print(json.dumps(output, indent=2, default=str))
+
+def results_explainer(summary: Dict[str, Any], config: Dict[str, Any]
+                      ) -> Optional[Callable[[Dict[str, Any]], Dict[str, Any]]]:
+    """Explain stored candidates against the job saved with their results, if it was saved"""
+    job_description = summary.get('job_description')
+    if job_description is None:
+        return None
+    job_analyzer = JobAnalyzer(config)
+    return lambda candidate: job_analyzer.explain_candidate(candidate, job_description)
+
+def export_command(argv: List[str]):
+    """Stream an indexed results file into an Excel workbook or CSV file"""
+    parser = argparse.ArgumentParser(prog='main.py export',
+                                     description='Export ranked candidates to a spreadsheet')
+    parser.add_argument('results', help='screening_results_*.jsonl file (or its .json/.idx sibling)')
+    parser.add_argument('--output', help='.xlsx or .csv file (default: next to the results; '
+                                         'CSV when the pool does not fit one Excel sheet)')
+    parser.add_argument('--config', default='config.json', help='Configuration file path')
+    args = parser.parse_args(argv)
+    
+    config = load_config(args.config)
+    logger = setup_logging(logging_config=config.get('logging', {}))
+    
+    with ResultsReader(Path(args.results)) as reader:
+        if args.output:
+            output = Path(args.output)
+            if output.suffix.lower().lstrip('.') not in EXPORT_FORMATS:
+                parser.error(f"--output must end in {' or '.join('.' + fmt for fmt in EXPORT_FORMATS)}")
+        else:
+            output = reader.data_path.with_suffix('.csv' if len(reader) >= XLSX_MAX_ROWS else '.xlsx')
+        
+        # Candidates past the explained shortlist get their narrative as their row is written
+        summary = reader.summary()
+        start = time.perf_counter()
+        rows = export_rankings(reader.iter_candidates(), output, summary, results_explainer(summary, config))
+    
+    logger.info(f"Exported {rows} ranked candidates to {output} ({time.perf_counter() - start:.1f}s)")
+
+def history_command(argv: List[str]):
+    """Query the run history: past runs, score distributions and stage timings"""
+    parser = argparse.ArgumentParser(prog='main.py history',
+                                     description='Aggregate queries over past screening runs')
+    parser.add_argument('query', choices=['runs', 'scores', 'timings'],
+                        help='runs: one row per run; scores: match score distribution; '
+                             'timings: per-resume stage times')
+    parser.add_argument('--title', help='Only jobs whose title contains this text (case-insensitive)')
+    parser.add_argument('--since', help=f"ISO date, or the start of the current {'/'.join(PERIODS)}")
+    parser.add_argument('--by', help="Group by a column or by month/quarter/year "
+                                     "(default: job_title for scores, parser_version for timings)")
+    parser.add_argument('--json', action='store_true', help='Print JSON records instead of a table')
+    parser.add_argument('--config', default='config.json', help='Configuration file path')
+    args = parser.parse_args(argv)
+    
+    config = load_config(args.config)
+    history = RunHistory(config)
+    try:
+        if args.query == 'runs':
+            table = history.runs(args.since, args.title)
+        elif args.query == 'scores':
+            table = score_distribution(history, args.since, args.title, args.by or 'job_title')
+        else:
+            table = stage_trend(history, args.since, args.title, args.by or 'parser_version')
+    except KeyError as e:
+        parser.error(f"Unknown column for --by: {str(e)}")
+    except ValueError as e:
+        parser.error(str(e))
+    
+    if table.empty:
+        print(f"No runs recorded in {history.path} match the query")
+    elif args.json:
+        # Grouped tables carry the group in their index; the runs table has a plain row number
+        table = table.reset_index() if table.index.name else table
+        print(table.to_json(orient='records', date_format='iso', indent=2))
+    else:
+        print(table.to_string())
+
+def index_command(argv: List[str]):
+    """Parse a resume folder and build the candidate vector index"""
+    # scikit-learn is only imported by the index commands, keeping screening startup unchanged
+    from candidate_index import CORPUS_FILE, CandidateIndex, candidate_document
+    
+    parser = argparse.ArgumentParser(prog='main.py index',
+                                     description='Build a nearest-neighbor index of parsed candidates')
+    add_source_arguments(parser)
+    parser.add_argument('--index-dir', help='Where to store the index (default: candidate_index.path)')
+    parser.add_argument('--config', default='config.json', help='Configuration file path')
+    args = parser.parse_args(argv)
+    
+    config = load_config(args.config)
+    logger = setup_logging(logging_config=config.get('logging', {}))
+    index_config = config.get('candidate_index', {})
+    index_dir = Path(args.index_dir or index_config.get('path', './output/candidate_index'))
+    
+    # The index keeps its own corpus, replaced on every build
+    corpus = open_corpus(config, index_dir / CORPUS_FILE)
+    resume_parser = ResumeParser(config, corpus)
+    ocr_lane = OCRLane(config, resume_parser.extractors.cache) if OCRLane.is_enabled(config) else None
+    
+    workers = parse_workers(args, config)
+    scheduler = work_scheduler(config, workers)
+    sources, total, mailbox = resume_sources(args, config, resume_parser.extractors.supported_extensions(),
+                                             scheduler=scheduler)
+    candidates, _ = parse_resumes(sources, total, resume_parser, ocr_lane, config, workers,
+                                  mailbox.sender_for if mailbox else None, scheduler)
+    candidates, _ = NearDuplicateDetector(config, corpus).deduplicate(candidates)
+    if not candidates:
+        logger.error("No resumes could be processed successfully")
+        sys.exit(1)
+    
+    start = time.perf_counter()
+    skill_weight = index_config.get('skill_weight', 3)
+    index = CandidateIndex.build([candidate_document(c, corpus, skill_weight) for c in candidates], config)
+    index.save(index_dir, candidates)
+    if mailbox is not None:
+        mailbox.commit()
+    logger.info(f"Indexed {len(candidates)} candidates in {len(index.centroids)} lists "
+                f"({time.perf_counter() - start:.1f}s) at {index_dir}")
+    
+    if corpus is not None:
+        corpus.close()
+
+def search_command(argv: List[str]):
+    """Shortlist indexed candidates for a job by vector search, then score the shortlist exactly"""
+    from candidate_index import CORPUS_FILE, CandidateIndex, job_document
+    
+    parser = argparse.ArgumentParser(prog='main.py search',
+                                     description='Screen a job against a candidate index')
+    parser.add_argument('--job-file', required=True, help='Path to job description JSON file')
+    parser.add_argument('--index-dir', help='Index built by main.py index (default: candidate_index.path)')
+    parser.add_argument('--shortlist', type=int, help='Nearest candidates to score exactly')
+    parser.add_argument('--nprobe', type=int, help='Inverted lists to scan per query')
+    parser.add_argument('--recall', action='store_true', help='Also run brute-force search and report recall')
+    parser.add_argument('--output-folder', default='./output', help='Output folder for results')
+    parser.add_argument('--config', default='config.json', help='Configuration file path')
+    args = parser.parse_args(argv)
+    
+    config = load_config(args.config)
+    logger = setup_logging(logging_config=config.get('logging', {}))
+    index_config = config.get('candidate_index', {})
+    index_dir = Path(args.index_dir or index_config.get('path', './output/candidate_index'))
+    shortlist = args.shortlist or index_config.get('shortlist', 2000)
+    nprobe = args.nprobe or index_config.get('nprobe', 32)
+    
+    with open(args.job_file, 'r') as f:
+        job_description = json.load(f)
+    
+    # Candidates indexed with the corpus enabled reference texts in the index's corpus
+    corpus = TextCorpus(str(index_dir / CORPUS_FILE)) if (index_dir / CORPUS_FILE).exists() else None
+    job_analyzer = JobAnalyzer(config, corpus)
+    index = CandidateIndex.load(index_dir)
+    
+    start = time.perf_counter()
+    query = index.embedder.transform([job_document(job_description, job_analyzer.taxonomy,
+                                                   index_config.get('skill_weight', 3))])[0]
+    rows, _ = index.search(query, shortlist, nprobe)
+    search_seconds = time.perf_counter() - start
+    
+    search_stats = {'pool_size': len(index), 'shortlisted': len(rows), 'nprobe': nprobe,
+                    'search_ms': round(search_seconds * 1000, 2)}
+    if args.recall:
+        start = time.perf_counter()
+        exact, _ = index.brute_force(query, shortlist)
+        search_stats['brute_force_ms'] = round((time.perf_counter() - start) * 1000, 2)
+        search_stats['recall'] = len(set(rows.tolist()) & set(exact.tolist())) / max(1, len(exact))
+    logger.info("Vector search: " + ", ".join(f"{key}={value}" for key, value in search_stats.items()))
+    
+    # Only the shortlist is loaded and scored exactly
+    analyzed_candidates = [job_analyzer.score_candidate(candidate, job_description)
+                           for candidate in index.candidates(rows)]
+    ranked_results = CandidateRanker(config).rank_candidates(analyzed_candidates, job_description)
+    ranked_results['index_search'] = search_stats
+    index.close()
+    
+    output_folder = Path(args.output_folder)
+    output_folder.mkdir(exist_ok=True)
+    write_results(ranked_results, job_description, output_folder, config)
+    
+    if corpus is not None:
+        corpus.close()
+
+def rerank_command(argv: List[str]):
+    """Recompute rankings from stored sub-scores under new weights"""
+    parser = argparse.ArgumentParser(prog='main.py rerank',
+                                     description='Re-rank a previous run under new scoring weights')
+    parser.add_argument('--scores', required=True, help='scores_*.npz file written by a screening run')
+    parser.add_argument('--weights', default='',
+                        help='Comma-separated overrides, e.g. experience=0.4,skills=0.3')
+    parser.add_argument('--top', type=int, default=3, help='Number of candidates to show')
+    parser.add_argument('--output-folder', help='Write reranked results JSON for all candidates here')
+    parser.add_argument('--config', default='config.json', help='Configuration file path')
+    args = parser.parse_args(argv)
+    
+    config = load_config(args.config)
+    store = ScoreStore(Path(args.scores))
+    try:
+        weights = parse_weights(args.weights, store.weights)
+    except ValueError as e:
+        parser.error(str(e))
+    if abs(sum(weights.values()) - 1.0) > 1e-6:
+        print(f"Note: weights sum to {sum(weights.values()):.2f}; scores are capped at 100")
+    
+    start = time.perf_counter()
+    scores = store.match_scores(weights)
+    order = store.rank(weights)
+    statistics = store.statistics(scores)
+    elapsed = time.perf_counter() - start
+    
+    # Only shown/exported candidates are materialized as dicts
+    positions = order if args.output_folder else order[:args.top]
+    candidates = store.candidates(scores, positions)
+    
+    job_analyzer = JobAnalyzer(config)
+    job_analyzer.weights = weights
+    for candidate in candidates[:args.top]:
+        job_analyzer.explain_candidate(candidate, store.job_description)
+    
+    ranker_config = dict(config, scoring={f"{name}_weight": value for name, value in weights.items()})
+    results = CandidateRanker(ranker_config).rank_candidates(candidates, store.job_description)
+    results['total_resumes'] = len(store)
+    results['statistics'] = statistics
+    results['weights_used'] = weights
+    
+    print(f"Re-ranked {len(store)} candidates in {elapsed * 1000:.1f} ms with weights "
+          + ", ".join(f"{name}={value:g}" for name, value in weights.items()))
+    print_top_candidates(results, args.top)
+    
+    if args.output_folder:
+        output_folder = Path(args.output_folder)
+        output_folder.mkdir(exist_ok=True)
+        results_file = output_folder / f"reranked_results_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+        with open(results_file, 'w') as f:
+            json.dump(results, f, indent=2, default=str)
+        print(f"Reranked results saved to {results_file}")
+
+def discover_resumes(resume_folder: Path, formats: List[str], extractable: List[str]) -> List[Path]:
+    """Find resume files whose format is both configured and extractable"""
+    extensions = {fmt.lower().lstrip('.') for fmt in formats} & set(extractable)
+    return sorted(path for path in resume_folder.iterdir()
+                  if path.is_file() and path.suffix.lower().lstrip('.') in extensions)
+
 def generate_summary_report(results: Dict[str, Any], job_description: Dict[str, Any], output_file: Path):
     """Generate a human-readable summary report"""
     with open(output_file, 'w') as f:
@@ -153,10 +769,32 @@ def generate_summary_report(results: Dict[str, Any], job_description: Dict[str,
             f.write(f"\nSummary: {candidate.get('summary', 'N/A')}\n")
             f.write("\n" + "-" * 50 + "\n\n")
         
+        if results.get('duplicates'):
+            f.write("NEAR-DUPLICATE RESUMES FOLDED:\n")
+            f.write("-" * 50 + "\n")
+            for cluster in results['duplicates']:
+                f.write(f"{cluster['name']} ({cluster['kept_file']}): {', '.join(cluster['folded_files'])}\n")
+            f.write("\n")
+        
+        if results.get('knockouts'):
+            knockouts = results['knockouts']
+            f.write("KNOCKOUT FILTER:\n")
+            f.write("-" * 50 + "\n")
+            f.write(f"Rejected {knockouts['rejected']} of {knockouts['checked']} resumes before full parsing\n")
+            for rule, count in knockouts['by_rule'].items():
+                f.write(f"  {rule}: {count}\n")
+            if knockouts['estimated_speedup'] is None:
+                f.write(f"Rejections took {knockouts['rejected_ms_per_resume']} ms per resume; "
+                        f"no resume passed to compare against a full parse\n\n")
+            else:
+                f.write(f"Rejections took {knockouts['rejected_ms_per_resume']} ms per resume against "
+                        f"{knockouts['parsed_ms_per_resume']} ms for a resume that passed "
+                        f"(estimated {knockouts['estimated_speedup']}x faster)\n\n")
+        
         f.write("AGENT REASONING:\n")
         f.write("-" * 20 + "\n")
         f.write("The autonomous agent processed each resume through the following steps:\n")
-        f.write("1. PDF text extraction and parsing\n")
+        f.write("1. Resume text extraction (PDF, DOCX, TXT, HTML) and parsing\n")
         f.write("2. Information extraction using NLP patterns\n")
         f.write("3. Skill matching against job requirements\n")
         f.write("4. Experience level analysis\n")
@@ -167,13 +805,13 @@ def generate_summary_report(results: Dict[str, Any], job_description: Dict[str,
         f.write(f"The agent autonomously completed this analysis in {results['processing_time']:.2f} seconds,\n")
         f.write("providing HR teams with actionable insights for hiring decisions.\n")
 
-def print_top_candidates(results: Dict[str, Any]):
+def print_top_candidates(results: Dict[str, Any], count: int = 3):
     """Print top candidates to console"""
     print("\n" + "=" * 80)
-    print("TOP 3 CANDIDATES - SCREENING RESULTS")
+    print(f"TOP {count} CANDIDATES - SCREENING RESULTS")
     print("=" * 80)
     
-    for i, candidate in enumerate(results['top_matches'][:3], 1):
+    for i, candidate in enumerate(results['candidates'][:count], 1):
         print(f"\n#{i} - {candidate['name']} ({candidate['match_score']}% Match)")
         print(f"Contact: {candidate.get('email', 'N/A')} | {candidate.get('phone', 'N/A')}")
         print(f"Experience: {candidate.get('experience', 'N/A')} years")
@@ -187,5 +825,15 @@ def print_top_candidates(results: Dict[str, Any]):
         
         print("-" * 80)
 
+COMMANDS = {
+    'export': export_command,
+    'history': history_command,
+    'index': index_command,
+    'merge': merge_command,
+    'rerank': rerank_command,
+    'results': results_command,
+    'search': search_command
+}
+
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,149 @@
+"""
+OCR Module
+Bounded Tesseract fallback lane for image-only PDF resumes
+"""
+
+import io
+import time
+import shutil
+import logging
+import tempfile
+import threading
+import subprocess
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, Any, Optional
+
+import PyPDF2
+
+from extractors import ExtractionCache
+
+try:
+    import pypdfium2
+except ImportError:
+    pypdfium2 = None
+
+
+class OCRLane:
+    """Runs OCR on a fixed number of worker threads, apart from the text-PDF path"""
+
+    def __init__(self, config: Dict[str, Any], cache: Optional[ExtractionCache] = None):
+        self.config = config
+        self.logger = logging.getLogger(__name__)
+        self.cache = cache
+
+        ocr_config = config.get('ocr', {})
+        self.tesseract_cmd = ocr_config.get('tesseract_cmd', 'tesseract')
+        self.language = ocr_config.get('language', 'eng')
+        self.dpi = ocr_config.get('dpi', 300)
+        self.max_pages = ocr_config.get('max_pages', 5)
+        self.page_timeout = ocr_config.get('page_timeout_seconds', 30)
+
+        # Bounds both the worker count and how many documents may wait for OCR
+        self._executor = ThreadPoolExecutor(max_workers=ocr_config.get('workers', 1),
+                                            thread_name_prefix='ocr')
+        self._slots = threading.BoundedSemaphore(ocr_config.get('max_pending', 16))
+
+    @staticmethod
+    def is_enabled(config: Dict[str, Any]) -> bool:
+        """Return True if OCR is enabled and Tesseract is installed"""
+        ocr_config = config.get('ocr', {})
+        if not ocr_config.get('enabled', False):
+            return False
+        if shutil.which(ocr_config.get('tesseract_cmd', 'tesseract')) is None:
+            logging.getLogger(__name__).warning("OCR is enabled but Tesseract was not found; OCR fallback disabled")
+            return False
+        return True
+
+    def submit(self, data: bytes, file_name: str) -> Optional[Future]:
+        """Queue a document for OCR; returns None if the lane is full"""
+        if not self._slots.acquire(blocking=False):
+            self.logger.warning(f"OCR lane is full, skipping {file_name}")
+            return None
+
+        try:
+            future = self._executor.submit(self._ocr_document, data, file_name)
+        except Exception:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+        return future
+
+    def shutdown(self, wait: bool = True):
+        """Stop the OCR workers"""
+        self._executor.shutdown(wait=wait, cancel_futures=not wait)
+
+    def _ocr_document(self, data: bytes, file_name: str) -> str:
+        """OCR up to max_pages pages of a PDF, caching the result by content hash"""
+        key = ExtractionCache.key_for(data)
+        if self.cache:
+            entry = self.cache.get(key)
+            if entry is not None:
+                return entry['text']
+
+        start = time.perf_counter()
+        pages = []
+        for page_number, image in enumerate(self._render_pages(data), 1):
+            try:
+                result = subprocess.run(
+                    [self.tesseract_cmd, 'stdin', 'stdout', '-l', self.language],
+                    input=image, capture_output=True, timeout=self.page_timeout, check=True
+                )
+            except subprocess.TimeoutExpired:
+                self.logger.warning(f"OCR timed out on page {page_number} of {file_name}")
+                continue
+            except subprocess.CalledProcessError as e:
+                self.logger.warning(f"OCR failed on page {page_number} of {file_name}: "
+                                    f"{e.stderr.decode('utf-8', 'replace').strip()}")
+                continue
+            pages.append(result.stdout.decode('utf-8', 'replace'))
+
+        text = "\n".join(pages).strip()
+        elapsed = time.perf_counter() - start
+        self.logger.info(f"OCR extracted {len(text)} characters from {file_name} in {elapsed:.1f}s")
+
+        if self.cache and text:
+            self.cache.put(key, text, format='ocr', extract_seconds=elapsed)
+        return text
+
+    def _render_pages(self, data: bytes):
+        """Yield page images (PGM/PNG bytes) for the first max_pages pages"""
+        if pypdfium2 is not None:
+            yield from self._render_with_pdfium(data)
+        else:
+            yield from self._render_with_pdftoppm(data)
+
+    def _render_with_pdfium(self, data: bytes):
+        document = pypdfium2.PdfDocument(data)
+        try:
+            for index in range(min(len(document), self.max_pages)):
+                page = document[index]
+                bitmap = page.render(scale=self.dpi / 72, grayscale=True)
+                # Tesseract reads PGM directly, so no imaging library is needed
+                rows = bytes(bitmap.buffer)
+                if bitmap.stride != bitmap.width:
+                    rows = b"".join(rows[row * bitmap.stride:row * bitmap.stride + bitmap.width]
+                                    for row in range(bitmap.height))
+                yield f"P5 {bitmap.width} {bitmap.height} 255\n".encode('ascii') + rows
+                bitmap.close()
+                page.close()
+        finally:
+            document.close()
+
+    def _render_with_pdftoppm(self, data: bytes):
+        page_count = len(PyPDF2.PdfReader(io.BytesIO(data)).pages)
+        with tempfile.TemporaryDirectory() as tmp:
+            pdf_path = Path(tmp) / 'input.pdf'
+            pdf_path.write_bytes(data)
+            for page_number in range(1, min(page_count, self.max_pages) + 1):
+                output = Path(tmp) / f'page{page_number}'
+                try:
+                    subprocess.run(
+                        ['pdftoppm', '-r', str(self.dpi), '-gray', '-png', '-singlefile',
+                         '-f', str(page_number), '-l', str(page_number), str(pdf_path), str(output)],
+                        capture_output=True, timeout=self.page_timeout, check=True
+                    )
+                except (subprocess.TimeoutExpired, subprocess.CalledProcessError) as e:
+                    self.logger.warning(f"Could not render page {page_number} for OCR: {str(e)}")
+                    continue
+                yield output.with_suffix('.png').read_bytes()
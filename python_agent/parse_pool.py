@@ -0,0 +1,150 @@
+"""
+Parse Pool Module
+Parses resumes in worker processes while the main process streams their bytes
+"""
+
+import os
+import time
+import logging
+import multiprocessing
+from collections import defaultdict
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Any, Optional, Tuple
+
+from knockout import KnockoutRules
+from record_codec import pack_candidate, unpack_candidate
+from resume_parser import ResumeParser
+from scheduling import WorkScheduler
+from skills_taxonomy import get_taxonomy
+from text_corpus import TextCorpus
+from utils import log_sampler, setup_logging
+
+# Per-process parser and knockout rules, set once by the pool initializer
+_parser: Optional[ResumeParser] = None
+_knockout: Optional[KnockoutRules] = None
+
+
+def _init_worker(config: Dict[str, Any], knockout: Optional[KnockoutRules], corpus_path: Optional[str], corpus_lock):
+    global _parser, _knockout
+    # The parent's log queue listener does not exist in workers, so they log synchronously;
+    # workers exit without running atexit, so the parent reports their sampled-out counts
+    setup_logging(logging_config=dict(config.get('logging', {}), **{'async': False}), sampling_summary=False)
+    # With a corpus, workers append texts to it themselves and only send back references
+    corpus = TextCorpus(corpus_path, corpus_lock) if corpus_path else None
+    _parser = ResumeParser(config, corpus)
+    _knockout = knockout
+
+
+def _sampled_since(before: Tuple[int, int]) -> Tuple[int, int]:
+    seen, suppressed = log_sampler().counts()
+    return seen - before[0], suppressed - before[1]
+
+
+def _parse(source: str, data: bytes) -> Tuple[bytes, int, float, Tuple[int, int]]:
+    start = time.perf_counter()
+    before = log_sampler().counts()
+    try:
+        candidate = _parser.parse_resume(Path(source), data, _knockout)
+    except Exception as e:
+        # Exceptions are pickled with their attributes, so failed parses report their log records too
+        e.log_sampled = _sampled_since(before)
+        raise
+    # A packed record instead of the dict keeps pickling out of both processes
+    return pack_candidate(candidate), os.getpid(), time.perf_counter() - start, _sampled_since(before)
+
+
+class ParsePool:
+    """Process pool for resume parsing with a bounded number of resumes in flight"""
+
+    def __init__(self, config: Dict[str, Any], workers: int, scheduler: Optional[WorkScheduler] = None,
+                 knockout: Optional[KnockoutRules] = None, corpus: Optional[TextCorpus] = None):
+        self.config = config
+        self.knockout = knockout
+        self.corpus = corpus
+        self.taxonomy = get_taxonomy(config)
+        self.logger = logging.getLogger(__name__)
+        self.workers = workers
+        self.max_in_flight = max(1, config.get('processing', {}).get('max_in_flight_per_worker', 4)) * workers
+        self.scheduler = scheduler
+        self.utilization: List[Dict[str, Any]] = []
+        self.bytes_received = 0
+
+    def parse(self, sources: Iterable[Tuple[Path, Optional[bytes], Optional[Exception]]]
+              ) -> Iterator[Tuple[Path, Optional[bytes], Optional[Dict[str, Any]], Optional[Exception]]]:
+        """Yield (path, data, candidate, error) as resumes finish, not in input order
+
+        Only max_in_flight resumes are read ahead, so an archive or folder of any
+        size is parsed in bounded memory. A slow resume holds up neither the
+        workers nor the results behind it.
+        """
+        pending: Dict[Future, Tuple[Path, Optional[bytes]]] = {}
+        busy = defaultdict(float)
+        files = defaultdict(int)
+        start = time.perf_counter()
+        # Worker processes sample their own records; their counts are added to this process's summary
+        sampler = log_sampler()
+
+        def finish(future: Future):
+            path, data = pending.pop(future)
+            try:
+                record, pid, seconds, sampled = future.result()
+            except Exception as e:
+                if sampler is not None and hasattr(e, 'log_sampled'):
+                    sampler.add(*e.log_sampled)
+                return path, data, None, e
+            if sampler is not None:
+                sampler.add(*sampled)
+            self.bytes_received += len(record)
+            candidate = unpack_candidate(record, self.taxonomy)
+            busy[pid] += seconds
+            files[pid] += 1
+            if self.scheduler is not None:
+                self.scheduler.record(path.name, len(data), seconds)
+            return path, data, candidate, None
+
+        self.bytes_received = 0
+        # Workers append texts to the parent's corpus, so appends are serialized while the pool runs
+        corpus_path = str(self.corpus.path) if self.corpus is not None else None
+        lock = multiprocessing.Lock() if self.corpus is not None else None
+        if self.corpus is not None:
+            self.corpus.lock = lock
+        try:
+            with ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker,
+                                     initargs=(self.config, self.knockout, corpus_path, lock)) as executor:
+                for path, data, error in sources:
+                    if error is not None:
+                        yield path, data, None, error
+                        continue
+                    # The full path, not just the name, so candidate IDs tell archive members apart
+                    pending[executor.submit(_parse, str(path), data)] = (path, data)
+                    while len(pending) >= self.max_in_flight:
+                        done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                        for future in done:
+                            yield finish(future)
+
+                while pending:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        yield finish(future)
+        finally:
+            if self.corpus is not None:
+                self.corpus.lock = None
+                self.corpus.refresh()
+
+        self._report(busy, files, time.perf_counter() - start)
+        if self.scheduler is not None:
+            self.scheduler.save()
+
+    def _report(self, busy: Dict[int, float], files: Dict[int, int], wall_seconds: float):
+        """Log how much of the run each worker spent parsing"""
+        self.utilization = [{'worker': pid, 'files': files[pid], 'busy_seconds': round(busy[pid], 3),
+                             'utilization': round(busy[pid] / wall_seconds, 3) if wall_seconds else 0.0}
+                            for pid in sorted(busy)]
+        if not self.utilization:
+            return
+        # Workers that never got a resume count as idle for the whole run
+        mean = sum(busy.values()) / (self.workers * wall_seconds) if wall_seconds else 0.0
+        self.logger.info(f"Parser utilization over {wall_seconds:.1f}s: {mean:.0%} mean; " + ", ".join(
+            f"worker {row['worker']} {row['files']} files {row['utilization']:.0%}" for row in self.utilization)
+            + f"; {self.bytes_received / 1024 / 1024:.1f} MB of candidate records received")
@@ -0,0 +1,159 @@
+"""
+PDF Backends Module
+Pluggable PDF text extraction backends with per-file fallback
+"""
+
+import io
+import logging
+from typing import Dict, List, Any, BinaryIO, Optional, Tuple
+
+import PyPDF2
+
+try:
+    import pypdfium2
+except ImportError:
+    pypdfium2 = None
+
+try:
+    from pdfminer.converter import TextConverter
+    from pdfminer.layout import LTChar
+    from pdfminer.pdfinterp import PDFResourceManager, PDFPageInterpreter
+    from pdfminer.pdfpage import PDFPage
+except ImportError:
+    TextConverter = None
+
+# Backends tried in this order when extraction.pdf_backend is "auto".
+# pdfminer is slower than PyPDF2 on typical resumes, so it is opt-in only.
+AUTO_ORDER = ['pypdfium2', 'pypdf2']
+
+
+class PDFBackend:
+    """Base class for PDF text extraction backends"""
+
+    name = 'base'
+
+    @classmethod
+    def available(cls) -> bool:
+        """Return True if the backend's library is importable"""
+        return True
+
+    def extract(self, stream: BinaryIO) -> str:
+        """Extract text from a PDF stream"""
+        return self.extract_pages(stream)[0]
+
+    def extract_pages(self, stream: BinaryIO, max_pages: Optional[int] = None) -> Tuple[str, int]:
+        """Extract text from the first max_pages pages (all if None); returns it with the page count"""
+        raise NotImplementedError
+
+
+class PyPDF2Backend(PDFBackend):
+    """Pure-Python extraction via PyPDF2 (always available)"""
+
+    name = 'pypdf2'
+
+    def extract_pages(self, stream: BinaryIO, max_pages: Optional[int] = None) -> Tuple[str, int]:
+        pdf_reader = PyPDF2.PdfReader(stream)
+        pages = [page.extract_text() or "" for page in pdf_reader.pages[:max_pages]]
+        return "\n".join(pages).strip(), len(pdf_reader.pages)
+
+
+class PdfiumBackend(PDFBackend):
+    """Native extraction via pypdfium2 (PDFium bindings)"""
+
+    name = 'pypdfium2'
+
+    @classmethod
+    def available(cls) -> bool:
+        return pypdfium2 is not None
+
+    def extract_pages(self, stream: BinaryIO, max_pages: Optional[int] = None) -> Tuple[str, int]:
+        document = pypdfium2.PdfDocument(stream.read())
+        pages = []
+        try:
+            page_count = len(document)
+            for index in range(page_count if max_pages is None else min(page_count, max_pages)):
+                page = document[index]
+                text_page = page.get_textpage()
+                pages.append(text_page.get_text_range())
+                text_page.close()
+                page.close()
+        finally:
+            document.close()
+        # PDFium reports line breaks as CRLF
+        return "\n".join(pages).replace("\r\n", "\n").replace("\r", "\n").strip(), page_count
+
+
+if TextConverter is not None:
+    class _LineBreakingTextConverter(TextConverter):
+        """TextConverter that restores line breaks when layout analysis is off"""
+
+        def receive_layout(self, ltpage):
+            last_y = None
+            for item in ltpage:
+                if isinstance(item, LTChar):
+                    # Without LAParams there are no text lines, so break on baseline changes
+                    if last_y is not None and abs(item.y0 - last_y) > 1:
+                        self.write_text("\n")
+                    last_y = item.y0
+                    self.write_text(item.get_text())
+            self.write_text("\n")
+
+
+class PdfminerBackend(PDFBackend):
+    """pdfminer.six extraction with layout analysis turned off"""
+
+    name = 'pdfminer'
+
+    @classmethod
+    def available(cls) -> bool:
+        return TextConverter is not None
+
+    def extract_pages(self, stream: BinaryIO, max_pages: Optional[int] = None) -> Tuple[str, int]:
+        output = io.StringIO()
+        resource_manager = PDFResourceManager(caching=True)
+        # laparams=None skips layout analysis, which dominates pdfminer's cost
+        device = _LineBreakingTextConverter(resource_manager, output, laparams=None)
+        interpreter = PDFPageInterpreter(resource_manager, device)
+        page_count = 0
+        try:
+            # Pages past the limit are only counted, not interpreted
+            for page in PDFPage.get_pages(stream, caching=True):
+                if max_pages is None or page_count < max_pages:
+                    interpreter.process_page(page)
+                page_count += 1
+        finally:
+            device.close()
+        return output.getvalue().strip(), page_count
+
+
+PDF_BACKENDS = {
+    backend.name: backend for backend in (PdfiumBackend, PdfminerBackend, PyPDF2Backend)
+}
+
+
+def available_backends() -> List[str]:
+    """Return the names of the installed PDF backends"""
+    return [name for name, backend in PDF_BACKENDS.items() if backend.available()]
+
+
+def get_pdf_backends(config: Dict[str, Any]) -> List[PDFBackend]:
+    """Build the ordered backend chain for the configured pdf_backend"""
+    logger = logging.getLogger(__name__)
+    preferred = config.get('extraction', {}).get('pdf_backend', 'auto')
+
+    if preferred == 'auto':
+        names = AUTO_ORDER
+    elif preferred in PDF_BACKENDS:
+        # PyPDF2 always stays last as the per-file fallback
+        names = [preferred] + (['pypdf2'] if preferred != 'pypdf2' else [])
+    else:
+        raise ValueError(f"Unknown PDF backend: {preferred} (expected 'auto' or one of {list(PDF_BACKENDS)})")
+
+    backends = []
+    for name in names:
+        if PDF_BACKENDS[name].available():
+            backends.append(PDF_BACKENDS[name]())
+        elif preferred == name:
+            logger.warning(f"PDF backend '{name}' is not installed, falling back to PyPDF2")
+
+    return backends
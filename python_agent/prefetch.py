@@ -0,0 +1,74 @@
+"""
+Prefetch Module
+Read-ahead I/O for resume folders on slow or network storage
+"""
+
+import os
+import logging
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Any, Optional, Tuple
+
+
+def read_file(path: Path) -> bytes:
+    """Read a whole file into memory"""
+    with open(path, 'rb') as f:
+        return f.read()
+
+
+class Prefetcher:
+    """Reads upcoming files in background threads while the current one is parsed"""
+
+    def __init__(self, config: Dict[str, Any], reader: Callable[[Path], bytes] = read_file):
+        self.config = config
+        self.logger = logging.getLogger(__name__)
+        self.reader = reader
+
+        io_config = config.get('io', {})
+        self.depth = max(1, io_config.get('prefetch_depth', 8))
+        self.workers = max(1, io_config.get('prefetch_workers', 4))
+        self.max_bytes = int(io_config.get('prefetch_max_mb', 256) * 1024 * 1024)
+        self.max_file_bytes = int(config.get('processing', {}).get('max_resume_size_mb', 10) * 1024 * 1024)
+
+    def iterate(self, paths: List[Path]) -> Iterator[Tuple[Path, Optional[bytes], Optional[Exception]]]:
+        """Yield (path, data, error) in input order, reading ahead up to depth files"""
+        queue = deque(paths)
+        pending: "deque[Tuple[Path, int, Future]]" = deque()
+        buffered_bytes = 0
+
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='prefetch') as executor:
+            def fill():
+                nonlocal buffered_bytes
+                # Reads are admitted in order, so the head of the queue never waits on later files
+                while queue and len(pending) < self.depth:
+                    try:
+                        size = os.stat(queue[0]).st_size
+                    except OSError:
+                        size = 0
+                    # Oversized files are refused from their size alone, without reading them
+                    if size > self.max_file_bytes:
+                        skipped: Future = Future()
+                        skipped.set_exception(ValueError(
+                            f"Resume exceeds maximum size of {self.max_file_bytes // (1024 * 1024)} MB"))
+                        pending.append((queue.popleft(), 0, skipped))
+                        continue
+                    # A file larger than the whole budget is still read once nothing else is buffered
+                    if pending and buffered_bytes + size > self.max_bytes:
+                        return
+                    path = queue.popleft()
+                    buffered_bytes += size
+                    pending.append((path, size, executor.submit(self.reader, path)))
+
+            fill()
+            while pending:
+                path, size, future = pending.popleft()
+                try:
+                    data, error = future.result(), None
+                except Exception as e:
+                    data, error = None, e
+
+                # The consumer holds at most this one buffer outside the budget
+                buffered_bytes -= size
+                fill()
+                yield path, data, error
@@ -0,0 +1,112 @@
+"""
+Record Codec Module
+Packs parsed candidates into compact binary records for transfer between processes
+"""
+
+import pickle
+import struct
+from array import array
+from typing import Dict, List, Any, Optional
+
+from skills_taxonomy import SkillsTaxonomy
+
+ENCODING = 'utf-8'
+
+# version, flags, experience (-1 if unknown), text offset, text length, skill and role counts, string bytes
+HEADER = struct.Struct('<BBiQQHHI')
+RECORD_VERSION = 1
+
+# Single-valued text fields, in record order; skill IDs and previous roles follow them
+STRING_FIELDS = ('id', 'name', 'email', 'phone', 'location', 'education', 'current_role', 'summary', 'file_name')
+NONE_LENGTH = 0xFFFFFFFF
+
+FLAG_TEXT_REF = 1     # text sits in the shared corpus at (offset, length)
+FLAG_INLINE_TEXT = 2  # text bytes follow the strings
+FLAG_EXTRA = 4        # fields outside the fixed layout follow, pickled
+
+# 'skills' is rebuilt from the skill IDs, so display names are never sent
+PACKED_FIELDS = set(STRING_FIELDS) | {'experience', 'skill_ids', 'skills', 'previous_roles', 'raw_text', 'text_ref'}
+
+
+def pack_candidate(candidate: Dict[str, Any]) -> bytes:
+    """Encode a parsed candidate as one flat record"""
+    skill_ids = candidate.get('skill_ids', [])
+    previous_roles = candidate.get('previous_roles', [])
+    values = [None if value is None else str(value)
+              for value in [candidate.get(field) for field in STRING_FIELDS] + skill_ids + previous_roles]
+    # Lengths are in characters, so the strings decode in one call and split by slicing
+    lengths = array('I', (NONE_LENGTH if value is None else len(value) for value in values))
+    strings = ''.join(value for value in values if value).encode(ENCODING)
+
+    flags, offset, length, text = 0, 0, 0, b''
+    if 'text_ref' in candidate:
+        flags |= FLAG_TEXT_REF
+        offset, length = candidate['text_ref']['offset'], candidate['text_ref']['length']
+    elif 'raw_text' in candidate:
+        flags |= FLAG_INLINE_TEXT
+        text = candidate['raw_text'].encode(ENCODING)
+        length = len(text)
+
+    extra = {key: value for key, value in candidate.items() if key not in PACKED_FIELDS}
+    if extra:
+        flags |= FLAG_EXTRA
+
+    experience = candidate.get('experience')
+    header = HEADER.pack(RECORD_VERSION, flags, -1 if experience is None else experience,
+                         offset, length, len(skill_ids), len(previous_roles), len(strings))
+    parts = [header, lengths.tobytes(), strings, text]
+    if extra:
+        parts.append(pickle.dumps(extra, protocol=pickle.HIGHEST_PROTOCOL))
+    return b''.join(parts)
+
+
+def unpack_candidate(record: bytes, taxonomy: SkillsTaxonomy) -> Dict[str, Any]:
+    """Decode a record from pack_candidate back into a candidate dict"""
+    version, flags, experience, offset, length, skill_count, role_count, strings_size = HEADER.unpack_from(record)
+    if version != RECORD_VERSION:
+        raise ValueError(f"Unsupported candidate record version {version}")
+
+    view = memoryview(record)
+    count = len(STRING_FIELDS) + skill_count + role_count
+    lengths = array('I')
+    lengths.frombytes(view[HEADER.size:HEADER.size + count * lengths.itemsize])
+    position = HEADER.size + count * lengths.itemsize
+    joined = str(view[position:position + strings_size], ENCODING)
+    position += strings_size
+
+    strings: List[Optional[str]] = []
+    start = 0
+    for size in lengths:
+        if size == NONE_LENGTH:
+            strings.append(None)
+            continue
+        strings.append(joined[start:start + size])
+        start += size
+
+    fields = dict(zip(STRING_FIELDS, strings))
+    skill_ids = strings[len(STRING_FIELDS):len(STRING_FIELDS) + skill_count]
+    # Same key order as ResumeParser.parse_text, so results files do not change
+    candidate = {
+        'id': fields['id'],
+        'name': fields['name'],
+        'email': fields['email'],
+        'phone': fields['phone'],
+        'location': fields['location'],
+        'skills': [taxonomy.name(skill_id) for skill_id in skill_ids],
+        'skill_ids': skill_ids,
+        'experience': None if experience < 0 else experience,
+        'education': fields['education'],
+        'current_role': fields['current_role'],
+        'previous_roles': strings[len(STRING_FIELDS) + skill_count:],
+        'summary': fields['summary'],
+        'file_name': fields['file_name']
+    }
+
+    if flags & FLAG_TEXT_REF:
+        candidate['text_ref'] = {'offset': offset, 'length': length}
+    elif flags & FLAG_INLINE_TEXT:
+        candidate['raw_text'] = str(view[position:position + length], ENCODING)
+        position += length
+    if flags & FLAG_EXTRA:
+        candidate.update(pickle.loads(view[position:]))
+    return candidate
@@ -0,0 +1,181 @@
+"""
+Results Index Module
+Paginated screening results with a binary sidecar index for the dashboard
+"""
+
+import os
+import json
+import mmap
+import struct
+import hashlib
+import logging
+from array import array
+from pathlib import Path
+from typing import Dict, Iterator, List, Any, Optional, Tuple
+
+INDEX_MAGIC = b'RSIX'
+INDEX_VERSION = 1
+
+# magic, version, reserved, candidate count; followed by Q-aligned tables
+INDEX_HEADER = struct.Struct('=4sHHQ')
+
+DEFAULT_PAGE_SIZE = 25
+
+# Result keys whose size grows with the pool (or that only reports need); they go to a
+# details line after the candidates, so the summary header stays small
+DETAIL_KEYS = ('top_matches', 'duplicates', 'agent_reasoning')
+
+
+def _id_hash(candidate_id: str) -> int:
+    return int.from_bytes(hashlib.blake2b(candidate_id.encode('utf-8'), digest_size=8).digest(), 'little')
+
+
+def write_indexed_results(results: Dict[str, Any], path: Path) -> Tuple[Path, Path]:
+    """Write results as JSON lines (summary header, candidates by rank, details) plus an index
+
+    The header holds job metadata and statistics, with the top matches as ranks
+    into the candidate lines; duplicate clusters and the agent reasoning follow
+    the last candidate. The index holds the byte offset of every rank and a
+    sorted table of (id hash, rank) pairs, so readers never parse more than they return.
+    """
+    data_path = Path(path).with_suffix('.jsonl')
+    index_path = Path(path).with_suffix('.idx')
+    candidates = results.get('candidates', [])
+
+    summary = {key: value for key, value in results.items() if key != 'candidates' and key not in DETAIL_KEYS}
+    if 'top_matches' in results:
+        # Top matches lead the ranking, so only the first lines are searched
+        ranks = {candidate.get('id'): rank for rank, candidate in enumerate(candidates[:len(results['top_matches'])])}
+        summary['top_match_ranks'] = [ranks[match.get('id')] for match in results['top_matches']
+                                      if match.get('id') in ranks]
+    if 'duplicates' in results:
+        summary['duplicate_clusters'] = len(results['duplicates'])
+    details = {key: results[key] for key in DETAIL_KEYS if key in results and key != 'top_matches'}
+    offsets = array('Q')
+    id_table = []
+
+    with open(data_path, 'wb') as f:
+        f.write(json.dumps(summary, default=str).encode('utf-8') + b'\n')
+        for rank, candidate in enumerate(candidates):
+            offsets.append(f.tell())
+            f.write(json.dumps(candidate, default=str).encode('utf-8') + b'\n')
+            id_table.append((_id_hash(str(candidate.get('id'))), rank))
+        offsets.append(f.tell())
+        f.write(json.dumps(details, default=str).encode('utf-8') + b'\n')
+
+    ids = array('Q')
+    for id_hash, rank in sorted(id_table):
+        ids.extend((id_hash, rank))
+
+    with open(index_path, 'wb') as f:
+        f.write(INDEX_HEADER.pack(INDEX_MAGIC, INDEX_VERSION, 0, len(candidates)))
+        f.write(offsets.tobytes())
+        f.write(ids.tobytes())
+
+    return data_path, index_path
+
+
+class ResultsReader:
+    """Random access to an indexed results file; opening it does not depend on its size"""
+
+    def __init__(self, path: Path):
+        self.logger = logging.getLogger(__name__)
+        self.data_path = Path(path).with_suffix('.jsonl')
+        self.index_path = Path(path).with_suffix('.idx')
+
+        self._data = open(self.data_path, 'rb')
+        with open(self.index_path, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, _, self._count = INDEX_HEADER.unpack_from(self._mmap)
+        if magic != INDEX_MAGIC or version != INDEX_VERSION:
+            self.close()
+            raise ValueError(f"{self.index_path} is not a results index of version {INDEX_VERSION}")
+
+        self._views = [memoryview(self._mmap)[INDEX_HEADER.size:]]
+        self._views.append(self._views[0].cast('Q'))
+        self._offsets = self._views[1][:self._count + 1]
+        self._ids = self._views[1][self._count + 1:]
+        self._views += [self._offsets, self._ids]
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __enter__(self) -> 'ResultsReader':
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def summary(self) -> Dict[str, Any]:
+        """Job metadata and statistics, with the top matches as ranks; its size does not grow with the pool"""
+        return json.loads(self._read(0, self._offsets[0]))
+
+    def top_matches(self) -> List[Dict[str, Any]]:
+        """The top-ranked candidates named in the summary"""
+        summary = self.summary()
+        if 'top_match_ranks' not in summary:
+            # Written before the top matches became ranks
+            return summary.get('top_matches', [])
+        return [self.candidate_at(rank) for rank in summary['top_match_ranks']]
+
+    def details(self) -> Dict[str, Any]:
+        """Duplicate clusters and agent reasoning, stored after the last candidate"""
+        end = os.fstat(self._data.fileno()).st_size
+        data = self._read(self._offsets[self._count], end)
+        return json.loads(data) if data.strip() else {}
+
+    def page_count(self, page_size: int = DEFAULT_PAGE_SIZE) -> int:
+        return -(-self._count // page_size)
+
+    def page(self, page: int, page_size: int = DEFAULT_PAGE_SIZE) -> List[Dict[str, Any]]:
+        """Candidates on a 0-based page, in rank order"""
+        start = page * page_size
+        if page < 0 or start >= self._count:
+            return []
+        end = min(start + page_size, self._count)
+        data = self._read(self._offsets[start], self._offsets[end])
+        return [json.loads(line) for line in data.splitlines()]
+
+    def iter_candidates(self, page_size: int = 1000) -> Iterator[Dict[str, Any]]:
+        """All candidates in rank order, read one page at a time"""
+        for page in range(self.page_count(page_size)):
+            yield from self.page(page, page_size)
+
+    def candidate_at(self, rank: int) -> Dict[str, Any]:
+        """Candidate at a 0-based rank"""
+        if not 0 <= rank < self._count:
+            raise IndexError(rank)
+        return json.loads(self._read(self._offsets[rank], self._offsets[rank + 1]))
+
+    def candidate(self, candidate_id: str) -> Optional[Dict[str, Any]]:
+        """Look up a candidate by ID, or None if it is not in the results"""
+        target = _id_hash(candidate_id)
+
+        # Binary search the (hash, rank) pairs for the first entry with this hash
+        low, high = 0, self._count
+        while low < high:
+            middle = (low + high) // 2
+            if self._ids[2 * middle] < target:
+                low = middle + 1
+            else:
+                high = middle
+
+        # Hash collisions are resolved by comparing the stored ID
+        while low < self._count and self._ids[2 * low] == target:
+            candidate = self.candidate_at(self._ids[2 * low + 1])
+            if candidate.get('id') == candidate_id:
+                return candidate
+            low += 1
+        return None
+
+    def _read(self, start: int, end: int) -> bytes:
+        return os.pread(self._data.fileno(), end - start, start)
+
+    def close(self):
+        """Release the index mapping and data file"""
+        # The mapping can only be closed once every view onto it is released
+        for view in reversed(getattr(self, '_views', [])):
+            view.release()
+        self._mmap.close()
+        self._data.close()
@@ -1,22 +1,91 @@
 """
 Resume Parser Module
-Handles PDF parsing and information extraction from resumes
+Handles resume text extraction and information extraction from resumes
 """
 
 import re
+import time
+import hashlib
 import logging
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, List, Any, Optional
-import PyPDF2
+from typing import Dict, List, Any, Optional, Pattern, Tuple
 import spacy
 from datetime import datetime
 
+from extractors import ExtractorRegistry, NoTextExtractedError
+from knockout import KnockedOut, KnockoutRules
+from text_corpus import TextCorpus
+from skills_taxonomy import get_taxonomy
+from utils import PER_RESUME
+
+# Bump when a parser change alters extracted fields or parse cost; recorded with each run in the history
+PARSER_VERSION = '3'
+
+# Two-letter US state codes, so that "Python AWS" is not taken for a city and state
+US_STATES = ('AL', 'AK', 'AZ', 'AR', 'CA', 'CO', 'CT', 'DE', 'DC', 'FL', 'GA', 'HI', 'ID', 'IL', 'IN', 'IA',
+             'KS', 'KY', 'LA', 'ME', 'MD', 'MA', 'MI', 'MN', 'MS', 'MO', 'MT', 'NE', 'NV', 'NH', 'NJ', 'NM',
+             'NY', 'NC', 'ND', 'OH', 'OK', 'OR', 'PA', 'RI', 'SC', 'SD', 'TN', 'TX', 'UT', 'VT', 'VA', 'WA',
+             'WV', 'WI', 'WY', 'PR')
+_STATE = '(?:' + '|'.join(US_STATES) + ')'
+# Countries and regions accepted after "City, " outside the US; processing.location_regions replaces them.
+# Two-letter codes that are also US states (e.g. IN for India) are left out.
+LOCATION_REGIONS = ('UK', 'United Kingdom', 'England', 'Scotland', 'Wales', 'Ireland', 'Canada', 'ON', 'BC', 'QC',
+                    'AB', 'MB', 'NS', 'Germany', 'France', 'Spain', 'Portugal', 'Italy', 'Netherlands', 'Belgium',
+                    'Switzerland', 'Austria', 'Sweden', 'Norway', 'Denmark', 'Finland', 'Poland', 'Czech Republic',
+                    'Romania', 'Ukraine', 'Israel', 'UAE', 'India', 'Pakistan', 'Singapore', 'Japan', 'China',
+                    'Hong Kong', 'South Korea', 'Philippines', 'Vietnam', 'Australia', 'New Zealand', 'Brazil',
+                    'Mexico', 'Argentina', 'Colombia', 'Chile', 'Nigeria', 'Kenya', 'South Africa', 'Egypt')
+
+# Every repeat is bounded, so crafted input (long lines, digit floods) is scanned in linear time
+EMAIL_PATTERN = r'\b[A-Za-z0-9._%+-]{1,64}@[A-Za-z0-9.-]{1,253}\.[A-Za-z]{2,24}\b'
+PHONE_PATTERN = (r'(?<!\d)\+?1?[-.\s]?\(?(?P<area>\d{3})\)?[-.\s]?(?P<exchange>\d{3})[-.\s]?'
+                 r'(?P<line>\d{4})(?!\d)')
+
+
+def location_pattern(regions: Tuple[str, ...]) -> str:
+    """"City, ST" or "City ST" at the end of a line for US states, "City, Region" for the given regions
+
+    Cities have up to three capitalized words (Latin-1 letters, e.g. "Zürich").
+    """
+    city = r'\b[A-ZÀ-Ý][a-zß-ÿ]{1,30}(?:[ ][A-ZÀ-Ý][a-zß-ÿ]{1,30}){0,2}'
+    us = rf'(?:,[ ]?|[ ](?={_STATE}[ \t]{{0,8}}$)){_STATE}\b'
+    if not regions:
+        return city + us
+    # Longest first, so "South Africa" is not cut short by a shorter name
+    region = '|'.join(re.escape(name) for name in sorted(regions, key=len, reverse=True))
+    return rf'{city}(?:{us}|,[ ]?(?:{region})\b)'
+
+
+@lru_cache(maxsize=8)
+def contact_patterns(regions: Tuple[str, ...]) -> Tuple[Dict[str, Pattern], Pattern]:
+    """Per-field patterns and the combined header scan for a set of location regions"""
+    location = location_pattern(regions)
+    fields = {
+        'email': re.compile(EMAIL_PATTERN),
+        'phone': re.compile(PHONE_PATTERN),
+        'location': re.compile(location, re.MULTILINE),
+    }
+    # One pass over the resume header finds all three
+    scan = re.compile(f"(?P<email>{EMAIL_PATTERN})|(?P<phone>{PHONE_PATTERN})|(?P<location>{location})",
+                      re.MULTILINE)
+    return fields, scan
+
+
+CONTACT_FIELDS, CONTACT_SCAN = contact_patterns(LOCATION_REGIONS)
+EXPERIENCE_PATTERNS = [re.compile(pattern) for pattern in (
+    r'(?<!\d)(\d{1,2})\+?\s{0,10}years?\s{0,10}(?:of\s{0,10})?experience',
+    r'(?<!\d)(\d{1,2})\+?\s{0,10}yrs?\s{0,10}(?:of\s{0,10})?experience',
+    r'experience[:\s]{0,10}(\d{1,2})\+?\s{0,10}years?',
+)]
+
 class ResumeParser:
-    """Parses PDF resumes and extracts structured information"""
+    """Parses resumes and extracts structured information"""
     
-    def __init__(self, config: Dict[str, Any]):
+    def __init__(self, config: Dict[str, Any], corpus: Optional[TextCorpus] = None):
         self.config = config
         self.logger = logging.getLogger(__name__)
+        self.corpus = corpus
         
         # Load spaCy model for NLP
         try:
@@ -25,90 +94,121 @@ class ResumeParser:
             self.logger.warning("spaCy model not found. Install with: python -m spacy download en_core_web_sm")
             self.nlp = None
         
-        # Common skills database
-        self.common_skills = self._load_skills_database()
+        # Format-specific text extractors
+        self.extractors = ExtractorRegistry(config)
         
-    def _load_skills_database(self) -> List[str]:
-        """Load common technical skills for matching"""
-        return [
-            # Programming Languages
-            'Python', 'JavaScript', 'Java', 'C++', 'C#', 'PHP', 'Ruby', 'Go', 'Rust', 'Swift',
-            'TypeScript', 'Kotlin', 'Scala', 'R', 'MATLAB', 'Perl', 'Shell', 'Bash',
-            
-            # Web Technologies
-            'React', 'Angular', 'Vue.js', 'Node.js', 'Express.js', 'Django', 'Flask', 'Spring',
-            'HTML', 'CSS', 'SASS', 'LESS', 'Bootstrap', 'Tailwind CSS', 'jQuery',
-            
-            # Databases
-            'SQL', 'MySQL', 'PostgreSQL', 'MongoDB', 'Redis', 'SQLite', 'Oracle', 'Cassandra',
-            'DynamoDB', 'Elasticsearch', 'Neo4j',
-            
-            # Cloud & DevOps
-            'AWS', 'Azure', 'GCP', 'Docker', 'Kubernetes', 'Jenkins', 'GitLab CI', 'GitHub Actions',
-            'Terraform', 'Ansible', 'Chef', 'Puppet',
-            
-            # Tools & Frameworks
-            'Git', 'GitHub', 'GitLab', 'Bitbucket', 'JIRA', 'Confluence', 'Slack',
-            'REST API', 'GraphQL', 'Microservices', 'API Gateway',
-            
-            # Methodologies
-            'Agile', 'Scrum', 'Kanban', 'DevOps', 'CI/CD', 'TDD', 'BDD',
-            
-            # Data & AI
-            'Machine Learning', 'Deep Learning', 'AI', 'Data Science', 'Analytics',
-            'Pandas', 'NumPy', 'TensorFlow', 'PyTorch', 'Scikit-learn',
-            
-            # Operating Systems
-            'Linux', 'Unix', 'Windows', 'macOS', 'Ubuntu', 'CentOS'
-        ]
-    
-    def parse_resume(self, file_path: Path) -> Dict[str, Any]:
-        """Parse a PDF resume and extract structured information"""
-        self.logger.info(f"Parsing resume: {file_path.name}")
+        # Shared skills taxonomy (compiled once per process, hot-reloaded on change)
+        self.taxonomy = get_taxonomy(config)
+        
+        # Contact details sit at the top of a resume; the rest is only scanned for missing ones
+        self.contact_header_chars = config.get('processing', {}).get('contact_header_chars', 2048)
+        regions = config.get('processing', {}).get('location_regions')
+        self.contact_fields, self.contact_scan = contact_patterns(
+            LOCATION_REGIONS if regions is None else tuple(regions))
+        
+    def parse_resume(self, file_path: Path, data: Optional[bytes] = None,
+                     knockout: Optional[KnockoutRules] = None) -> Dict[str, Any]:
+        """Parse a resume file (or its already-read bytes) and extract structured information
+        
+        With knockout rules, the first pages are checked first and a failing resume
+        raises KnockedOut without being extracted or parsed in full.
+        """
+        self.logger.debug("Parsing resume: %s", file_path.name, extra=PER_RESUME)
+        start = time.perf_counter()
         
         try:
-            # Extract text from PDF
-            text = self._extract_pdf_text(file_path)
+            # Extract text using the extractor registered for the file format
+            contact = None
+            if knockout is not None:
+                if data is None:
+                    data = self.extractors.read_file(file_path)
+                text, complete = self.extractors.extract_partial(data, file_path.name, knockout.partial_pages)
+                if text.strip():
+                    facts = self.check_knockout(text, knockout, start)
+                    if complete:
+                        contact = facts.get('contact')
+                if not complete:
+                    text = self.extractors.extract_bytes(data, file_path.name)
+            elif data is not None:
+                text = self.extractors.extract_bytes(data, file_path.name)
+            else:
+                text = self.extractors.extract_file(file_path)
             
             if not text.strip():
-                raise ValueError("No text could be extracted from PDF")
-            
-            # Parse information from text
-            candidate_data = {
-                'id': f"candidate_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{file_path.stem}",
-                'name': self._extract_name(text, file_path.stem),
-                'email': self._extract_email(text),
-                'phone': self._extract_phone(text),
-                'location': self._extract_location(text),
-                'skills': self._extract_skills(text),
-                'experience': self._extract_experience_years(text),
-                'education': self._extract_education(text),
-                'current_role': self._extract_current_role(text),
-                'previous_roles': self._extract_previous_roles(text),
-                'summary': self._extract_summary(text),
-                'raw_text': text,
-                'file_name': file_path.name
-            }
+                raise NoTextExtractedError("No text could be extracted from resume")
             
-            self.logger.info(f"Successfully parsed resume for {candidate_data['name']}")
-            return candidate_data
+            return self.parse_text(text, file_path.name, str(file_path), contact)
             
+        except (NoTextExtractedError, KnockedOut):
+            # Callers route these to OCR or the knockout report, so they are not logged as failures here
+            raise
         except Exception as e:
             self.logger.error(f"Failed to parse resume {file_path.name}: {str(e)}")
             raise
     
-    def _extract_pdf_text(self, file_path: Path) -> str:
-        """Extract text from PDF file"""
-        text = ""
-        try:
-            with open(file_path, 'rb') as file:
-                pdf_reader = PyPDF2.PdfReader(file)
-                for page in pdf_reader.pages:
-                    text += page.extract_text() + "\n"
-        except Exception as e:
-            raise ValueError(f"Could not extract text from PDF: {str(e)}")
+    def parse_text(self, text: str, file_name: str, source: Optional[str] = None,
+                   contact: Optional[Dict[str, Optional[str]]] = None) -> Dict[str, Any]:
+        """Extract structured information from already-extracted resume text
+        
+        source is the full path the resume came from (archive/member for archive members);
+        the candidate ID carries a digest of it, since file stems repeat across folders and formats.
+        contact is the result of an earlier contact scan of the same text, if there was one.
+        """
+        file_stem = Path(file_name).stem
+        source_digest = hashlib.blake2b((source or file_name).encode('utf-8'), digest_size=4).hexdigest()
+        
+        # Parse information from text
+        skill_ids = self._extract_skill_ids(text)
+        if contact is None:
+            contact = self._extract_contact(text)
+        candidate_data = {
+            'id': f"candidate_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{file_stem}_{source_digest}",
+            'name': self._extract_name(text, file_stem),
+            'email': contact['email'],
+            'phone': contact['phone'],
+            'location': contact['location'],
+            'skills': [self.taxonomy.name(skill_id) for skill_id in skill_ids],
+            'skill_ids': skill_ids,
+            'experience': self._extract_experience_years(text),
+            'education': self._extract_education(text),
+            'current_role': self._extract_current_role(text),
+            'previous_roles': self._extract_previous_roles(text),
+            'summary': self._extract_summary(text),
+            'file_name': file_name
+        }
+        
+        # Large pools keep texts in the on-disk corpus instead of in memory
+        if self.corpus is not None:
+            offset, length = self.corpus.append(text)
+            candidate_data['text_ref'] = {'offset': offset, 'length': length}
+        else:
+            candidate_data['raw_text'] = text
+        
+        self.logger.info("Successfully parsed resume for %s", candidate_data['name'],
+                         extra=dict(PER_RESUME, file=file_name))
+        return candidate_data
+    
+    def check_knockout(self, text: str, knockout: KnockoutRules, start: Optional[float] = None) -> Dict[str, Any]:
+        """Raise KnockedOut if the start of a resume fails a knockout rule, else return the facts checked
         
-        return text.strip()
+        Only the facts the rules need are extracted, from at most partial_kb of text. When
+        that was the whole text, the contact scan is returned for parse_text to reuse.
+        """
+        whole = len(text) <= knockout.partial_chars
+        text = text[:knockout.partial_chars]
+        facts: Dict[str, Any] = {'text': text}
+        if 'skill_ids' in knockout.needs:
+            self.taxonomy = get_taxonomy(self.config)
+            facts['skill_ids'] = self.taxonomy.find_ids(text)
+        if 'experience' in knockout.needs:
+            facts['experience'] = self._extract_experience_years(text)
+        if 'location' in knockout.needs:
+            contact = self._extract_contact(text)
+            facts['location'] = contact['location']
+            if whole:
+                facts['contact'] = contact
+        knockout.check(facts, time.perf_counter() - start if start is not None else 0.0)
+        return facts
     
     def _extract_name(self, text: str, filename: str) -> str:
         """Extract candidate name from resume text"""
@@ -129,67 +229,49 @@ class ResumeParser:
         # Fallback to filename
         return filename.replace('_', ' ').replace('-', ' ').title()
     
-    def _extract_email(self, text: str) -> Optional[str]:
-        """Extract email address from text"""
-        email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-        matches = re.findall(email_pattern, text)
-        return matches[0] if matches else None
-    
-    def _extract_phone(self, text: str) -> Optional[str]:
-        """Extract phone number from text"""
-        phone_patterns = [
-            r'\+?1?[-.\s]?\(?([0-9]{3})\)?[-.\s]?([0-9]{3})[-.\s]?([0-9]{4})',
-            r'\b\d{3}[-.]?\d{3}[-.]?\d{4}\b'
-        ]
-        
-        for pattern in phone_patterns:
-            matches = re.findall(pattern, text)
-            if matches:
-                if isinstance(matches[0], tuple):
-                    return f"({matches[0][0]}) {matches[0][1]}-{matches[0][2]}"
-                else:
-                    return matches[0]
+    def _extract_contact(self, text: str) -> Dict[str, Optional[str]]:
+        """Extract email, phone and location, scanning the header first and the full text only for missing ones"""
+        header = text
+        if len(text) > self.contact_header_chars:
+            # Cut at a line break so no match is split by the header boundary
+            cut = text.rfind('\n', 0, self.contact_header_chars)
+            header = text[:cut if cut > 0 else self.contact_header_chars]
         
-        return None
-    
-    def _extract_location(self, text: str) -> Optional[str]:
-        """Extract location from text"""
-        location_patterns = [
-            r'([A-Z][a-z]+,?\s+[A-Z]{2})',  # City, State
-            r'([A-Z][a-z]+\s+[A-Z][a-z]+,?\s+[A-Z]{2})',  # City Name, State
-        ]
+        found: Dict[str, Optional[re.Match]] = dict.fromkeys(self.contact_fields)
+        for match in self.contact_scan.finditer(header):
+            field = match.lastgroup
+            if found[field] is None:
+                found[field] = match
+                if all(found.values()):
+                    break
         
-        for pattern in location_patterns:
-            matches = re.findall(pattern, text)
-            if matches:
-                return matches[0]
+        if header is not text:
+            for field, pattern in self.contact_fields.items():
+                if found[field] is None:
+                    found[field] = pattern.search(text)
         
-        return None
+        phone = found['phone']
+        return {
+            'email': found['email'].group(0) if found['email'] else None,
+            'phone': f"({phone.group('area')}) {phone.group('exchange')}-{phone.group('line')}" if phone else None,
+            'location': found['location'].group(0) if found['location'] else None
+        }
     
-    def _extract_skills(self, text: str) -> List[str]:
-        """Extract technical skills from text"""
-        found_skills = []
-        text_lower = text.lower()
-        
-        for skill in self.common_skills:
-            if skill.lower() in text_lower:
-                found_skills.append(skill)
+    def _extract_skill_ids(self, text: str) -> List[str]:
+        """Extract canonical IDs of technical skills (including aliases) from text"""
+        self.taxonomy = get_taxonomy(self.config)
+        skill_ids = self.taxonomy.find_ids(text)
         
-        # Remove duplicates and sort
-        return sorted(list(set(found_skills)))
+        # Sort by display name to keep the previous skills ordering
+        return sorted(skill_ids, key=self.taxonomy.name)
     
     def _extract_experience_years(self, text: str) -> Optional[int]:
         """Extract years of experience from text"""
-        experience_patterns = [
-            r'(\d+)\+?\s*years?\s*(?:of\s*)?experience',
-            r'(\d+)\+?\s*yrs?\s*(?:of\s*)?experience',
-            r'experience[:\s]*(\d+)\+?\s*years?',
-        ]
-        
-        for pattern in experience_patterns:
-            matches = re.findall(pattern, text.lower())
-            if matches:
-                return int(matches[0])
+        text = text.lower()
+        for pattern in EXPERIENCE_PATTERNS:
+            match = pattern.search(text)
+            if match:
+                return int(match.group(1))
         
         return None
     
@@ -0,0 +1,235 @@
+"""
+Run History Module
+Appends every screening run to a local Parquet history that can be queried across runs
+"""
+
+import uuid
+import logging
+from pathlib import Path
+from typing import Dict, List, Any, Optional
+
+from job_analyzer import SCORE_COMPONENTS
+from resume_parser import PARSER_VERSION
+
+# Stages timed by a screening run, stored as <stage>_seconds columns
+STAGES = ('parse', 'dedup', 'score', 'rank')
+PERIODS = {'month': 'M', 'quarter': 'Q', 'year': 'Y'}
+
+# Fixed column types, so a run with only missing values (e.g. no job location) writes the same
+# schema as the others and the files stay readable as one table
+RUN_TYPES = dict({'run_id': 'string', 'mode': 'string', 'job_title': 'string', 'company': 'string',
+                  'job_location': 'string', 'required_experience': 'float64', 'requirements': 'int64',
+                  'preferred_skills': 'int64', 'parser_version': 'string', 'workers': 'int64',
+                  'total_resumes': 'int64', 'ranked_candidates': 'int64', 'duplicates': 'int64',
+                  'knocked_out': 'int64', 'resumes_read': 'int64', 'processing_seconds': 'float64'},
+                 **{f"{stage}_seconds": 'float64' for stage in STAGES})
+CANDIDATE_TYPES = dict({'run_id': 'string', 'job_title': 'string', 'rank': 'int64', 'candidate_id': 'string',
+                        'file_name': 'string', 'match_score': 'float64'},
+                       **{f"{component}_score": 'float64' for component in SCORE_COMPONENTS},
+                       experience='float64', skills='int64', location='string', ocr='bool')
+
+
+def run_mode(results: Dict[str, Any]) -> str:
+    """How a results dict was produced: a screening run, a shard merge or an index search"""
+    if 'shards' in results:
+        return 'merge'
+    if 'index_search' in results:
+        return 'search'
+    return 'screen'
+
+
+def since_timestamp(value: str):
+    """Start of the current month/quarter/year, or an ISO date"""
+    import pandas as pd
+
+    if value in PERIODS:
+        return pd.Timestamp.now().to_period(PERIODS[value]).start_time
+    return pd.Timestamp(value)
+
+
+class RunHistory:
+    """Two Parquet tables under history.path: runs (one row per run) and candidates (one row per ranked candidate)
+
+    Each run adds one file to each table, so appending never rewrites earlier runs.
+    """
+
+    def __init__(self, config: Dict[str, Any]):
+        self.logger = logging.getLogger(__name__)
+        history_config = config.get('history', {})
+        self.path = Path(history_config.get('path', './output/history'))
+        # Many small files make every query pay per-file overhead, so they are merged past this count
+        self.compact_files = history_config.get('compact_files', 32)
+        self.workers = config.get('processing', {}).get('workers', 1)
+
+    @staticmethod
+    def is_enabled(config: Dict[str, Any]) -> bool:
+        """Return True if runs are recorded in the history"""
+        return config.get('history', {}).get('enabled', True)
+
+    def append(self, results: Dict[str, Any], job_description: Dict[str, Any]) -> str:
+        """Record a finished run and its ranked candidates; returns the run ID"""
+        import pandas as pd
+
+        timestamp = pd.Timestamp.now()
+        run_id = f"{timestamp.strftime('%Y%m%d_%H%M%S')}_{uuid.uuid4().hex[:6]}"
+        candidates = results.get('candidates', [])
+        stage_timings = results.get('stage_timings', {})
+        knockouts = results.get('knockouts') or {}
+
+        run = {
+            'run_id': run_id,
+            'timestamp': timestamp,
+            'mode': run_mode(results),
+            'job_title': job_description.get('title', 'Unknown Position'),
+            'company': job_description.get('company', 'Unknown Company'),
+            'job_location': job_description.get('location'),
+            'required_experience': job_description.get('experience'),
+            'requirements': len(job_description.get('requirements', [])),
+            'preferred_skills': len(job_description.get('preferredSkills', [])),
+            'parser_version': PARSER_VERSION,
+            'workers': results.get('workers', self.workers),
+            'total_resumes': results.get('total_resumes', len(candidates)),
+            'ranked_candidates': len(candidates),
+            'duplicates': sum(len(cluster.get('folded_files', [])) for cluster in results.get('duplicates', [])),
+            'knocked_out': knockouts.get('rejected', 0),
+            'processing_seconds': results.get('processing_time'),
+        }
+        # Every resume read was parsed, including those folded as duplicates or knocked out
+        run['resumes_read'] = run['total_resumes'] + run['duplicates'] + run['knocked_out']
+        for stage in STAGES:
+            run[f"{stage}_seconds"] = stage_timings.get(stage)
+        runs = pd.DataFrame([run]).astype(RUN_TYPES)
+
+        # Built column by column: one list per field rather than a dict per candidate
+        breakdowns = [candidate.get('score_breakdown', {}) for candidate in candidates]
+        columns = {
+            'run_id': run_id,
+            'timestamp': timestamp,
+            'job_title': run['job_title'],
+            'rank': range(1, len(candidates) + 1),
+            'candidate_id': [str(candidate.get('id')) for candidate in candidates],
+            'file_name': [candidate.get('file_name') for candidate in candidates],
+            'match_score': [float(candidate.get('match_score', 0)) for candidate in candidates],
+        }
+        for component in SCORE_COMPONENTS:
+            columns[f"{component}_score"] = [float(breakdown.get(component, 0)) for breakdown in breakdowns]
+        columns.update({
+            'experience': [candidate.get('experience') for candidate in candidates],
+            'skills': [len(candidate.get('skill_ids', candidate.get('skills', []))) for candidate in candidates],
+            'location': [candidate.get('location') for candidate in candidates],
+            'ocr': [bool(candidate.get('ocr')) for candidate in candidates],
+        })
+        ranked = pd.DataFrame(columns, index=pd.RangeIndex(len(candidates))).astype(CANDIDATE_TYPES)
+
+        self._write(runs, 'runs', run_id)
+        self._write(ranked, 'candidates', run_id)
+        self.logger.info(f"Run {run_id} recorded in {self.path} ({len(candidates)} candidates)")
+        return run_id
+
+    def _write(self, frame, table: str, run_id: str):
+        folder = self.path / table
+        folder.mkdir(parents=True, exist_ok=True)
+        # Readers skip dot-files, so a half-written file is never read
+        tmp_path = folder / f".{run_id}.parquet.tmp"
+        frame.to_parquet(tmp_path, index=False)
+        tmp_path.replace(folder / f"{run_id}.parquet")
+
+        # Two tiers: per-run files are merged into a compacted file, and compacted files into one
+        runs = sorted(path for path in folder.glob('*.parquet') if not path.name.startswith(('.', 'compact_')))
+        if len(runs) > self.compact_files:
+            self._merge(folder, runs, f"compact_{run_id}.parquet")
+        compacted = sorted(folder.glob('compact_*.parquet'))
+        if len(compacted) > self.compact_files:
+            self._merge(folder, compacted, f"compact_{run_id}.parquet")
+
+    def _merge(self, folder: Path, files: List[Path], name: str):
+        """Replace a table's files with one file holding their rows"""
+        import pandas as pd
+
+        frame = pd.concat([pd.read_parquet(path) for path in files], ignore_index=True)
+        tmp_path = folder / f".{name}.tmp"
+        frame.to_parquet(tmp_path, index=False)
+        tmp_path.replace(folder / name)
+        for path in files:
+            if path.name != name:
+                path.unlink()
+        self.logger.info(f"Compacted {len(files)} files of the {folder.name} history into {name}")
+
+    def runs(self, since: Optional[str] = None, title: Optional[str] = None):
+        """Runs table, optionally from a date on and for job titles containing some text"""
+        import pandas as pd
+
+        folder = self.path / 'runs'
+        if not folder.exists():
+            return pd.DataFrame(columns=['run_id', 'timestamp', 'job_title'])
+        runs = pd.read_parquet(folder, filters=self._filters(since))
+        if title:
+            runs = runs[runs['job_title'].str.contains(title, case=False, regex=False)]
+        return runs.sort_values('timestamp', ignore_index=True)
+
+    def candidates(self, since: Optional[str] = None, title: Optional[str] = None,
+                   columns: Optional[List[str]] = None):
+        """Candidates table, filtered like runs(); only the requested columns are read from disk"""
+        import pandas as pd
+
+        folder = self.path / 'candidates'
+        if not folder.exists():
+            return pd.DataFrame(columns=columns or ['run_id', 'timestamp', 'job_title'])
+        if columns is not None:
+            columns = list(dict.fromkeys(['run_id', 'timestamp', 'job_title'] + columns))
+        candidates = pd.read_parquet(folder, columns=columns, filters=self._filters(since))
+        if title:
+            candidates = candidates[candidates['job_title'].str.contains(title, case=False, regex=False)]
+        return candidates
+
+    @staticmethod
+    def _filters(since: Optional[str]):
+        # Pushed down to the Parquet reader, so files of older runs are skipped by their statistics
+        return [('timestamp', '>=', since_timestamp(since))] if since else None
+
+
+def add_period_column(frame, by: str):
+    """Add a month/quarter/year column derived from the timestamp, for grouping"""
+    if by in PERIODS:
+        frame[by] = frame['timestamp'].dt.to_period(PERIODS[by]).astype(str)
+    return frame
+
+
+def score_distribution(history: RunHistory, since: Optional[str] = None, title: Optional[str] = None,
+                       by: str = 'job_title'):
+    """Match score percentiles and mean sub-scores per group"""
+    import pandas as pd
+
+    sub_scores = [f"{component}_score" for component in SCORE_COMPONENTS]
+    candidates = history.candidates(since, title, ['match_score'] + sub_scores)
+    if candidates.empty:
+        return pd.DataFrame()
+    candidates = add_period_column(candidates, by)
+    grouped = candidates.groupby(by)
+    distribution = grouped['match_score'].describe(percentiles=[0.25, 0.5, 0.75, 0.9])
+    distribution = distribution.rename(columns={'count': 'candidates', 'mean': 'mean_score'})
+    distribution['candidates'] = distribution['candidates'].astype('int64')
+    distribution['runs'] = grouped['run_id'].nunique()
+    return distribution.join(grouped[sub_scores].mean().add_prefix('mean_')).round(1)
+
+
+def stage_trend(history: RunHistory, since: Optional[str] = None, title: Optional[str] = None,
+                by: str = 'parser_version'):
+    """Per-resume time of each stage, per group of runs"""
+    import pandas as pd
+
+    runs = history.runs(since, title)
+    if runs.empty:
+        return pd.DataFrame()
+    runs = add_period_column(runs, by)
+    resumes = runs['resumes_read'].where(runs['resumes_read'] > 0)
+    per_resume = [f"{stage}_ms_per_resume" for stage in STAGES]
+    for stage, column in zip(STAGES, per_resume):
+        runs[column] = runs[f"{stage}_seconds"] / resumes * 1000
+    grouped = runs.groupby(by)
+    trend = grouped[per_resume].median()
+    trend.insert(0, 'resumes', grouped['resumes_read'].sum())
+    trend.insert(0, 'runs', grouped['run_id'].count())
+    trend['first_run'] = grouped['timestamp'].min().dt.strftime('%Y-%m-%d')
+    trend['last_run'] = grouped['timestamp'].max().dt.strftime('%Y-%m-%d')
+    return trend.round(2)
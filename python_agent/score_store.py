@@ -0,0 +1,125 @@
+"""
+Score Store Module
+Persists per-candidate sub-scores so rankings can be recomputed under new weights
+"""
+
+import json
+import logging
+from pathlib import Path
+from typing import Dict, List, Any, Optional
+
+import numpy as np
+
+from job_analyzer import SCORE_COMPONENTS
+
+# Candidate fields kept for rebuilding ranked output without the original run;
+# strengths and concerns are re-derived from these and the sub-scores when shown
+STORED_FIELDS = ('id', 'name', 'email', 'phone', 'location', 'experience', 'current_role',
+                 'education', 'skills', 'file_name', 'resume_file')
+
+
+def save_scores(path: Path, candidates: List[Dict[str, Any]], weights: Dict[str, float],
+                job_description: Dict[str, Any]):
+    """Write sub-score breakdowns as a column matrix plus light candidate records"""
+    breakdowns = np.array([[c['score_breakdown'][component] for component in SCORE_COMPONENTS]
+                           for c in candidates], dtype=np.float64).reshape(-1, len(SCORE_COMPONENTS))
+    records = [{field: c.get(field) for field in STORED_FIELDS} for c in candidates]
+    # Position of each file name in sorted order, the tie-break used by ranking_key
+    names = [c.get('file_name') or '' for c in candidates]
+    name_order = np.empty(len(names), dtype=np.int64)
+    name_order[sorted(range(len(names)), key=names.__getitem__)] = np.arange(len(names))
+
+    np.savez(
+        path,
+        breakdowns=breakdowns,
+        weights=np.array([weights[component] for component in SCORE_COMPONENTS], dtype=np.float64),
+        name_order=name_order,
+        skills_counts=np.array([len(c.get('skills', [])) for c in candidates], dtype=np.int32),
+        experience=np.array([c.get('experience') or 0 for c in candidates], dtype=np.float64),
+        records=np.frombuffer(json.dumps(records, default=str).encode('utf-8'), dtype=np.uint8),
+        job=np.frombuffer(json.dumps(job_description, default=str).encode('utf-8'), dtype=np.uint8)
+    )
+
+
+class ScoreStore:
+    """Stored sub-scores of one screening run"""
+
+    def __init__(self, path: Path):
+        self.logger = logging.getLogger(__name__)
+        self._archive = np.load(path)
+        self.breakdowns = self._archive['breakdowns']
+        self.weights = dict(zip(SCORE_COMPONENTS, self._archive['weights'].tolist()))
+        self._records: Optional[List[Dict[str, Any]]] = None
+
+    def __len__(self) -> int:
+        return len(self.breakdowns)
+
+    @property
+    def job_description(self) -> Dict[str, Any]:
+        """Job description the run was scored against"""
+        return json.loads(self._archive['job'].tobytes())
+
+    @property
+    def records(self) -> List[Dict[str, Any]]:
+        """Light candidate records, decoded on first use"""
+        if self._records is None:
+            self._records = json.loads(self._archive['records'].tobytes())
+        return self._records
+
+    def match_scores(self, weights: Dict[str, float]) -> np.ndarray:
+        """Recompute all match scores for a set of weights"""
+        # Accumulate in the same order as JobAnalyzer so truncation gives identical integers
+        total = np.zeros(len(self.breakdowns), dtype=np.float64)
+        for column, component in enumerate(SCORE_COMPONENTS):
+            total += self.breakdowns[:, column] * weights[component]
+        return np.clip(np.trunc(total), 0, 100).astype(np.int64)
+
+    def rank(self, weights: Dict[str, float]) -> np.ndarray:
+        """Return candidate positions ordered by descending match score"""
+        # Ties are broken by file name, like CandidateRanker's ranking_key
+        return np.lexsort((self._archive['name_order'], -self.match_scores(weights)))
+
+    def statistics(self, scores: np.ndarray) -> Dict[str, Any]:
+        """Vectorized equivalent of CandidateRanker's statistics"""
+        if not len(scores):
+            return {}
+
+        experience = self._archive['experience']
+        with_experience = experience[experience > 0]
+        return {
+            'average_match_score': float(scores.mean()),
+            'highest_match_score': int(scores.max()),
+            'lowest_match_score': int(scores.min()),
+            'candidates_above_80': int((scores >= 80).sum()),
+            'candidates_above_60': int((scores >= 60).sum()),
+            'candidates_below_40': int((scores < 40).sum()),
+            'total_skills_identified': int(self._archive['skills_counts'].sum()),
+            'average_experience': float(with_experience.mean()) if len(with_experience) else 0
+        }
+
+    def candidates(self, scores: np.ndarray, positions: np.ndarray) -> List[Dict[str, Any]]:
+        """Build candidate dicts with updated scores for the given positions"""
+        candidates = []
+        for position in positions.tolist():
+            candidate = dict(self.records[position])
+            candidate['match_score'] = int(scores[position])
+            candidate['score_breakdown'] = dict(zip(SCORE_COMPONENTS, self.breakdowns[position].tolist()))
+            candidates.append(candidate)
+        return candidates
+
+
+def parse_weights(spec: str, base: Dict[str, float]) -> Dict[str, float]:
+    """Parse 'experience=0.4,skills=0.3' on top of a base set of weights"""
+    weights = dict(base)
+    for item in filter(None, (part.strip() for part in spec.split(','))):
+        name, _, value = item.partition('=')
+        name = name.strip()
+        if name.endswith('_weight'):
+            name = name[:-len('_weight')]
+        if name not in weights:
+            raise ValueError(f"Unknown weight '{name}' (expected one of {', '.join(SCORE_COMPONENTS)})")
+        try:
+            weights[name] = float(value)
+        except ValueError:
+            raise ValueError(f"Invalid value '{value}' for weight '{name}', expected a number")
+    return weights
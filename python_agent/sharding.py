@@ -0,0 +1,258 @@
+"""
+Sharding Module
+Deterministic resume sharding and mergeable partial results for multi-node runs
+"""
+
+import json
+import heapq
+import hashlib
+import logging
+from pathlib import Path
+from typing import Dict, List, Any, Optional, Set, Tuple
+
+import numpy as np
+
+from candidate_ranker import CandidateRanker, RankingStatistics, ranking_key
+from dedup import NearDuplicateDetector, decode_signature, encode_signature
+from knockout import KnockoutReport
+from text_corpus import candidate_text_length
+
+# Bump when the partial result layout changes
+PARTIAL_FORMAT_VERSION = 2
+
+
+def parse_shard(spec: str) -> Tuple[int, int]:
+    """Parse an 'i/N' shard spec (0 <= i < N)"""
+    try:
+        index, count = (int(part) for part in spec.split('/'))
+    except ValueError:
+        raise ValueError(f"Invalid shard '{spec}', expected i/N such as 0/4")
+    if count < 1 or not 0 <= index < count:
+        raise ValueError(f"Invalid shard '{spec}', index must be between 0 and {count - 1}")
+    return index, count
+
+
+def shard_of(file_name: str, count: int) -> int:
+    """Shard a resume belongs to; depends only on its file name, so every node agrees"""
+    digest = hashlib.blake2b(file_name.encode('utf-8'), digest_size=8).digest()
+    return int.from_bytes(digest, 'big') % count
+
+
+def select_shard(paths: List[Path], index: int, count: int) -> List[Path]:
+    """Keep the paths that belong to shard index of count"""
+    return [path for path in paths if shard_of(path.name, count) == index]
+
+
+class _Ranked:
+    """Heap entry whose smallest element is the worst-ranked candidate"""
+    __slots__ = ('key', 'candidate')
+
+    def __init__(self, candidate: Dict[str, Any]):
+        self.key = ranking_key(candidate)
+        self.candidate = candidate
+
+    def __lt__(self, other: '_Ranked') -> bool:
+        return self.key > other.key
+
+
+class TopCandidates:
+    """Bounded heap of the best-ranked candidates (top_k <= 0 keeps all)"""
+
+    def __init__(self, top_k: int):
+        self.top_k = top_k
+        self._heap: List[_Ranked] = []
+
+    def add(self, candidate: Dict[str, Any]):
+        entry = _Ranked(candidate)
+        if self.top_k <= 0 or len(self._heap) < self.top_k:
+            heapq.heappush(self._heap, entry)
+        elif self._heap[0] < entry:
+            heapq.heapreplace(self._heap, entry)
+
+    def ranked(self) -> List[Dict[str, Any]]:
+        """Candidates in ranking order"""
+        return [entry.candidate for entry in sorted(self._heap, key=lambda entry: entry.key)]
+
+
+def fingerprint(candidate: Dict[str, Any], signature: np.ndarray, scored: bool = True) -> Dict[str, Any]:
+    """What merging needs of a shard candidate to fold it as a duplicate, top-K or not
+
+    Copies folded within the shard are fingerprinted too (scored=False), since a
+    cluster can join other shards' copies through any of its members.
+    """
+    entry = {
+        'id': candidate.get('id'),
+        'name': candidate.get('name'),
+        'file_name': candidate.get('file_name'),
+        'resume_file': candidate.get('resume_file'),
+        'text_length': candidate['text_length'] if 'text_length' in candidate else candidate_text_length(candidate),
+        'scored': scored,
+        'signature': encode_signature(signature)
+    }
+    if scored:
+        # Enough to take the candidate back out of the shard's statistics
+        entry.update(match_score=candidate.get('match_score', 0), skill_count=len(candidate.get('skills', [])),
+                     experience=candidate.get('experience'))
+    return entry
+
+
+def build_partial(candidates: List[Dict[str, Any]], job_description: Dict[str, Any],
+                  shard: Tuple[int, int], top_k: int, duplicates: List[Dict[str, Any]],
+                  processing_time: float, signatures: Optional[List[np.ndarray]] = None,
+                  folded: Optional[List[Tuple[Dict[str, Any], np.ndarray]]] = None) -> Dict[str, Any]:
+    """Summarize one shard's analyzed candidates as a mergeable partial result
+
+    signatures (aligned with candidates) and the folded copies with theirs, as
+    left by NearDuplicateDetector.deduplicate, let the merge fold resubmissions
+    that landed in different shards; without them only in-shard duplicates are folded.
+    """
+    top = TopCandidates(top_k)
+    statistics = RankingStatistics()
+    for candidate in candidates:
+        top.add(candidate)
+        statistics.add(candidate)
+
+    return {
+        'format': PARTIAL_FORMAT_VERSION,
+        'shard': list(shard),
+        'top_k': top_k,
+        'job_description': job_description,
+        'processing_time': processing_time,
+        'candidates': top.ranked(),
+        'statistics': statistics.to_dict(),
+        'duplicates': duplicates,
+        'fingerprints': ([fingerprint(candidate, signature) for candidate, signature in zip(candidates, signatures)] +
+                         [fingerprint(member, signature, scored=False) for member, signature in folded or []]
+                         if signatures else [])
+    }
+
+
+def load_partials(paths: List[Path]) -> List[Dict[str, Any]]:
+    """Load partial results and check they form one complete run"""
+    partials = []
+    for path in paths:
+        with open(path, 'r') as f:
+            partial = json.load(f)
+        if partial.get('format') != PARTIAL_FORMAT_VERSION:
+            raise ValueError(f"{path} is not a partial result of format {PARTIAL_FORMAT_VERSION}")
+        partials.append(partial)
+
+    if not partials:
+        raise ValueError("No partial results to merge")
+
+    counts = {partial['shard'][1] for partial in partials}
+    if len(counts) != 1:
+        raise ValueError(f"Partial results come from different shard counts: {sorted(counts)}")
+    count = counts.pop()
+
+    indices = sorted(partial['shard'][0] for partial in partials)
+    if indices != list(range(count)):
+        missing = sorted(set(range(count)) - set(indices))
+        duplicated = sorted({i for i in indices if indices.count(i) > 1})
+        raise ValueError(f"Incomplete set of {count} shards (missing: {missing or 'none'}, "
+                         f"duplicated: {duplicated or 'none'})")
+
+    jobs = {json.dumps(partial['job_description'], sort_keys=True) for partial in partials}
+    if len(jobs) != 1:
+        raise ValueError("Partial results were scored against different job descriptions")
+
+    return partials
+
+
+def fold_across_shards(partials: List[Dict[str, Any]], config: Dict[str, Any], statistics: RankingStatistics
+                       ) -> Tuple[Set[str], Dict[str, List[str]], List[Dict[str, Any]]]:
+    """Cluster every resume of every shard by MinHash signature, as a single-node run would
+
+    Returns the IDs of scored candidates folded into another copy, the folded
+    files of each kept candidate, and the duplicate clusters. Folded candidates
+    are taken back out of statistics.
+    """
+    detector = NearDuplicateDetector(config)
+    fingerprints = [entry for partial in partials for entry in partial.get('fingerprints', [])]
+    if not detector.enabled or not fingerprints:
+        return set(), {}, [cluster for partial in partials for cluster in partial.get('duplicates', [])]
+
+    # LSH buckets are verified against their first member, so the order matters: that of a single-node run
+    fingerprints.sort(key=lambda entry: entry['resume_file'] or '')
+    clusters = detector.cluster_signatures([decode_signature(entry['signature']) for entry in fingerprints])
+
+    folded_ids: Set[str] = set()
+    duplicate_files: Dict[str, List[str]] = {}
+    duplicates = []
+    for cluster in clusters:
+        if len(cluster) == 1:
+            continue
+        # Same choice as NearDuplicateDetector.deduplicate: most text, then the first in path order
+        members = sorted((fingerprints[i] for i in cluster),
+                         key=lambda entry: (-entry['text_length'], entry['resume_file'] or ''))
+        # Only scored copies can be kept; a copy folded in its shard is never longer than the one kept there
+        kept = next(entry for entry in members if entry['scored'])
+        files = [entry['file_name'] for entry in members if entry is not kept]
+        for entry in members:
+            if entry['scored'] and entry is not kept:
+                folded_ids.add(entry['id'])
+                statistics.remove(entry)
+        duplicate_files[kept['id']] = files
+        duplicates.append({'candidate_id': kept['id'], 'name': kept['name'],
+                           'kept_file': kept['file_name'], 'folded_files': files})
+    return folded_ids, duplicate_files, duplicates
+
+
+def merge_knockouts(partials: List[Dict[str, Any]]) -> Optional[KnockoutReport]:
+    """Combine the shards' knockout reports, or None if the job has no knockout rules"""
+    knockouts = None
+    for partial in partials:
+        if partial.get('knockouts'):
+            report = KnockoutReport.from_dict(partial['knockouts'])
+            if knockouts is None:
+                knockouts = report
+            else:
+                knockouts.merge(report)
+    return knockouts
+
+
+def merge_partials(partials: List[Dict[str, Any]], config: Dict[str, Any],
+                   top_k: Optional[int] = None) -> Dict[str, Any]:
+    """Combine shard partials into the results a single-node run would produce"""
+    logger = logging.getLogger(__name__)
+
+    # The merged list is exact for the top min(top_k) candidates of every shard
+    if top_k is None:
+        shard_limits = [partial['top_k'] for partial in partials if partial['top_k'] > 0]
+        top_k = min(shard_limits) if len(shard_limits) == len(partials) else 0
+
+    statistics = RankingStatistics()
+    for partial in partials:
+        statistics.merge(RankingStatistics.from_dict(partial['statistics']))
+    # Resubmissions under other names can land in different shards, so they are folded before the top-K merge
+    folded_ids, duplicate_files, duplicates = fold_across_shards(partials, config, statistics)
+
+    top = TopCandidates(top_k)
+    stage_timings: Dict[str, float] = {}
+    for partial in partials:
+        for candidate in partial['candidates']:
+            if candidate.get('id') in folded_ids:
+                continue
+            if candidate.get('id') in duplicate_files:
+                candidate['duplicate_files'] = duplicate_files[candidate['id']]
+            else:
+                candidate.pop('duplicate_files', None)
+            top.add(candidate)
+        for stage, seconds in partial.get('stage_timings', {}).items():
+            stage_timings[stage] = stage_timings.get(stage, 0.0) + seconds
+
+    job_description = partials[0]['job_description']
+    results = CandidateRanker(config).rank_candidates(top.ranked(), job_description, statistics)
+    # Shards run in parallel, so the slowest one bounds the run
+    results['processing_time'] = max(partial['processing_time'] for partial in partials)
+    results['duplicates'] = duplicates
+    results['shards'] = len(partials)
+    # Summed over shards: the work each stage took, not the wall time of the run
+    results['stage_timings'] = stage_timings
+    knockouts = merge_knockouts(partials)
+    if knockouts is not None:
+        results['knockouts'] = knockouts.to_dict()
+
+    logger.info(f"Merged {len(partials)} shards covering {statistics.count} candidates"
+                + (f", folding {len(folded_ids)} duplicates across shards" if folded_ids else ""))
+    return results
@@ -0,0 +1,182 @@
+"""
+Skills Taxonomy Module
+Loads the external skills taxonomy and matches skills and aliases to canonical IDs
+"""
+
+import re
+import json
+import time
+import pickle
+import logging
+import threading
+from pathlib import Path
+from typing import Dict, List, Any, Optional, Set
+
+# Bump when the compiled cache layout changes
+CACHE_FORMAT_VERSION = 1
+
+DEFAULT_TAXONOMY_FILE = Path(__file__).parent / 'skills_taxonomy.json'
+
+
+class SkillsTaxonomy:
+    """Compiled skills taxonomy: canonical skills, aliases and categories"""
+
+    def __init__(self, skills: List[Dict[str, Any]], version: Any = None):
+        self.version = version
+        self.skills: Dict[str, Dict[str, Any]] = {}
+        self._aliases: Dict[str, str] = {}
+        self._exact_aliases: Dict[str, str] = {}
+
+        for skill in skills:
+            skill_id = skill['id']
+            if skill_id in self.skills:
+                raise ValueError(f"Duplicate skill id in taxonomy: {skill_id}")
+            self.skills[skill_id] = {
+                'id': skill_id,
+                'name': skill['name'],
+                'category': skill.get('category', 'Other')
+            }
+
+            # Short or ambiguous names ('Go', 'R', 'LESS') only match with their exact casing
+            if skill.get('case_sensitive'):
+                self._exact_aliases[skill['name']] = skill_id
+            else:
+                self._aliases[skill['name'].lower()] = skill_id
+            for alias in skill.get('aliases', []):
+                self._aliases[alias.lower()] = skill_id
+
+        self._compile()
+
+    def _compile(self):
+        self._pattern = self._build_pattern(self._aliases, re.IGNORECASE)
+        self._exact_pattern = self._build_pattern(self._exact_aliases, 0)
+
+    @staticmethod
+    def _build_pattern(aliases: Dict[str, str], flags: int) -> Optional['re.Pattern']:
+        if not aliases:
+            return None
+        # Longest first so 'node.js' wins over 'node' and 'gitlab ci' over 'gitlab'
+        alternation = "|".join(re.escape(alias) for alias in sorted(aliases, key=len, reverse=True))
+        return re.compile(rf'(?<![\w.]){"(?:" + alternation + ")"}(?![\w+#])', flags)
+
+    def __getstate__(self):
+        # Compiled patterns are rebuilt on load; only the lookup tables are cached
+        state = self.__dict__.copy()
+        state.pop('_pattern')
+        state.pop('_exact_pattern')
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._compile()
+
+    def find_ids(self, text: str) -> Set[str]:
+        """Return the canonical IDs of all skills mentioned in a text"""
+        found = set()
+        if self._pattern is not None:
+            for match in self._pattern.finditer(text):
+                found.add(self._aliases[match.group(0).lower()])
+        if self._exact_pattern is not None:
+            for match in self._exact_pattern.finditer(text):
+                found.add(self._exact_aliases[match.group(0)])
+        return found
+
+    def normalize(self, skill: str) -> Optional[str]:
+        """Map a skill name or alias to its canonical ID"""
+        return self._exact_aliases.get(skill.strip()) or self._aliases.get(skill.strip().lower())
+
+    def name(self, skill_id: str) -> str:
+        """Return the display name of a canonical skill"""
+        return self.skills[skill_id]['name']
+
+    def category(self, skill_id: str) -> str:
+        """Return the category of a canonical skill"""
+        return self.skills[skill_id]['category']
+
+
+def _source_signature(path: Path) -> List[int]:
+    stat = path.stat()
+    return [stat.st_mtime_ns, stat.st_size]
+
+
+def load_taxonomy(path: Path, cache_path: Optional[Path] = None) -> SkillsTaxonomy:
+    """Load a taxonomy file, using the binary cache when it is up to date"""
+    logger = logging.getLogger(__name__)
+    signature = _source_signature(path)
+
+    if cache_path and cache_path.exists():
+        try:
+            with open(cache_path, 'rb') as f:
+                cached = pickle.load(f)
+            if cached['format'] == CACHE_FORMAT_VERSION and cached['source'] == signature:
+                return cached['taxonomy']
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable skills taxonomy cache: {str(e)}")
+
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    taxonomy = SkillsTaxonomy(data['skills'], data.get('version'))
+
+    if cache_path:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = cache_path.with_suffix('.tmp')
+        with open(tmp_path, 'wb') as f:
+            pickle.dump({'format': CACHE_FORMAT_VERSION, 'source': signature, 'taxonomy': taxonomy},
+                        f, protocol=pickle.HIGHEST_PROTOCOL)
+        tmp_path.replace(cache_path)
+
+    logger.info(f"Loaded skills taxonomy with {len(taxonomy.skills)} skills from {path}")
+    return taxonomy
+
+
+class _TaxonomyHandle:
+    """Process-wide taxonomy that reloads when its source file changes"""
+
+    def __init__(self, path: Path, cache_path: Optional[Path], reload_interval: float):
+        self.path = path
+        self.cache_path = cache_path
+        self.reload_interval = reload_interval
+        self.lock = threading.Lock()
+        self.signature = _source_signature(path)
+        self.taxonomy = load_taxonomy(path, cache_path)
+        self.checked_at = time.monotonic()
+
+    def get(self) -> SkillsTaxonomy:
+        if self.reload_interval <= 0 or time.monotonic() - self.checked_at < self.reload_interval:
+            return self.taxonomy
+
+        with self.lock:
+            self.checked_at = time.monotonic()
+            try:
+                signature = _source_signature(self.path)
+                if signature != self.signature:
+                    self.taxonomy = load_taxonomy(self.path, self.cache_path)
+                    self.signature = signature
+            except Exception as e:
+                # Keep serving the previous taxonomy if an edit is half-written or invalid
+                logging.getLogger(__name__).error(f"Skills taxonomy reload failed: {str(e)}")
+        return self.taxonomy
+
+
+_handles: Dict[Path, _TaxonomyHandle] = {}
+_handles_lock = threading.Lock()
+
+
+def get_taxonomy(config: Dict[str, Any]) -> SkillsTaxonomy:
+    """Return the shared taxonomy for a config, hot-reloading it when the file changes"""
+    skills_config = config.get('skills', {})
+
+    path = Path(skills_config.get('taxonomy_file', DEFAULT_TAXONOMY_FILE))
+    if not path.is_absolute() and not path.exists():
+        path = Path(__file__).parent / path
+    path = path.resolve()
+
+    with _handles_lock:
+        handle = _handles.get(path)
+        if handle is None:
+            cache_file = skills_config.get('cache_file')
+            handle = _TaxonomyHandle(path, Path(cache_file) if cache_file else None,
+                                     skills_config.get('reload_interval_seconds', 5))
+            _handles[path] = handle
+
+    return handle.get()
@@ -0,0 +1,146 @@
+"""
+Text Corpus Module
+Append-only, memory-mapped storage for extracted resume texts
+"""
+
+import os
+import mmap
+import logging
+from array import array
+from pathlib import Path
+from typing import Dict, Any, Optional, Tuple
+
+ENCODING = 'utf-8'
+
+
+class TextCorpus:
+    """Stores texts in one append-only file, indexed by (offset, length) pairs"""
+
+    def __init__(self, path: str, lock=None):
+        self.path = Path(path)
+        # A multiprocessing lock, set while other processes append to the same files
+        self.lock = lock
+        self.index_path = self.path.with_name(self.path.name + '.idx')
+        self.logger = logging.getLogger(__name__)
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._data = open(self.path, 'a+b')
+        self._index = open(self.index_path, 'a+b')
+        self._size = self._data.seek(0, os.SEEK_END)
+        self._count = self._index.seek(0, os.SEEK_END) // (2 * array('Q').itemsize)
+
+        self._mmap: Optional[mmap.mmap] = None
+        self._mapped_size = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    def append(self, text: str) -> Tuple[int, int]:
+        """Append a text and return its (offset, length) in bytes"""
+        encoded = text.encode(ENCODING)
+        if self.lock is None:
+            return self._append(encoded)
+        with self.lock:
+            # Other processes append too, so the end of the files is re-read under the lock
+            self.refresh()
+            return self._append(encoded)
+
+    def _append(self, encoded: bytes) -> Tuple[int, int]:
+        offset = self._size
+
+        self._data.write(encoded)
+        self._data.flush()
+        self._index.write(array('Q', (offset, len(encoded))).tobytes())
+        self._index.flush()
+
+        self._size += len(encoded)
+        self._count += 1
+        return offset, len(encoded)
+
+    def refresh(self):
+        """Pick up texts appended by other processes"""
+        self._size = os.fstat(self._data.fileno()).st_size
+        self._count = os.fstat(self._index.fileno()).st_size // (2 * array('Q').itemsize)
+
+    def view(self, offset: int, length: int) -> memoryview:
+        """Return a zero-copy view of a stored text's bytes"""
+        if offset + length > self._size:
+            self.refresh()
+        if offset < 0 or offset + length > self._size:
+            raise ValueError(f"Text reference ({offset}, {length}) is outside the corpus")
+
+        if offset + length > self._mapped_size:
+            self._remap()
+        return memoryview(self._mmap)[offset:offset + length]
+
+    def read(self, offset: int, length: int) -> str:
+        """Decode a stored text"""
+        with self.view(offset, length) as data:
+            return str(data, ENCODING)
+
+    def entry(self, position: int) -> Tuple[int, int]:
+        """Return the (offset, length) of the n-th appended text"""
+        if position >= self._count:
+            self.refresh()
+        if not 0 <= position < self._count:
+            raise IndexError(position)
+        entry = array('Q')
+        entry.frombytes(os.pread(self._index.fileno(), 2 * entry.itemsize, position * 2 * entry.itemsize))
+        return entry[0], entry[1]
+
+    def _remap(self):
+        # The file only grows, so the mapping is refreshed when a read passes its end
+        if self._mmap is not None:
+            self._mmap.close()
+        self._mmap = mmap.mmap(self._data.fileno(), self._size, access=mmap.ACCESS_READ)
+        self._mapped_size = self._size
+
+    def close(self):
+        """Close the mapping and underlying files"""
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+        self._data.close()
+        self._index.close()
+
+
+def open_corpus(config: Dict[str, Any], path: Path) -> Optional[TextCorpus]:
+    """Start an empty corpus at path for one run's texts, if the corpus section enables it
+
+    Each run or index build writes its own corpus next to its outputs, so texts are never
+    appended across runs and are deleted along with the results that reference them.
+    """
+    if not config.get('corpus', {}).get('enabled', False):
+        return None
+    path = Path(path)
+    for stale in (path, path.with_name(path.name + '.idx')):
+        if stale.exists():
+            stale.unlink()
+    return TextCorpus(str(path))
+
+
+def candidate_text(candidate: Dict[str, Any], corpus: Optional[TextCorpus] = None) -> str:
+    """Return a candidate's resume text, reading it from the corpus when stored there"""
+    if 'raw_text' in candidate:
+        return candidate['raw_text']
+
+    text_ref = candidate.get('text_ref')
+    if text_ref and corpus is not None:
+        return corpus.read(text_ref['offset'], text_ref['length'])
+
+    return ''
+
+
+def candidate_text_length(candidate: Dict[str, Any]) -> int:
+    """Return the size of a candidate's resume text without loading it"""
+    if 'raw_text' in candidate:
+        return len(candidate['raw_text'])
+    return candidate.get('text_ref', {}).get('length', 0)
+
+
+def move_text_to_corpus(candidate: Dict[str, Any], corpus: Optional[TextCorpus]) -> Dict[str, Any]:
+    """Replace a candidate's raw_text with a corpus reference (used for texts parsed elsewhere)"""
+    if corpus is not None and 'raw_text' in candidate:
+        offset, length = corpus.append(candidate.pop('raw_text'))
+        candidate['text_ref'] = {'offset': offset, 'length': length}
+    return candidate
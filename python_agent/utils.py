@@ -2,24 +2,159 @@
 Utility functions for the Resume Screening Agent
 """
 
+import atexit
 import logging
+import logging.handlers
 import json
+import queue
+import threading
 from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Any, Optional, Tuple
 
-def setup_logging(log_level: str = "INFO") -> logging.Logger:
-    """Setup logging configuration"""
-    logging.basicConfig(
-        level=getattr(logging, log_level.upper()),
-        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-        handlers=[
-            logging.FileHandler('resume_screening.log'),
-            logging.StreamHandler()
-        ]
-    )
+# Pass as extra= on log calls made once per resume so they can be sampled
+PER_RESUME = {'per_resume': True}
+
+TEXT_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+# Attributes every LogRecord has; anything else came in through extra=
+_STANDARD_RECORD_ATTRS = set(vars(logging.makeLogRecord({}))) | {'message', 'asctime', 'per_resume'}
+
+_listener: Optional[logging.handlers.QueueListener] = None
+_sampler: Optional['PerResumeSampler'] = None
+_sampling_summary = True
+
+class JsonFormatter(logging.Formatter):
+    """Formats log records as single-line JSON objects"""
+    
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            'time': self.formatTime(record),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage()
+        }
+        for key, value in vars(record).items():
+            if key not in _STANDARD_RECORD_ATTRS:
+                entry[key] = value
+        if record.exc_info:
+            entry['exception'] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+class PerResumeSampler(logging.Filter):
+    """Passes every Nth per-resume record below WARNING and counts the rest"""
+    
+    def __init__(self, every: int):
+        super().__init__()
+        self.every = max(1, every)
+        self.seen = 0
+        self.suppressed = 0
+        self._lock = threading.Lock()
+    
+    def filter(self, record: logging.LogRecord) -> bool:
+        if not getattr(record, 'per_resume', False) or record.levelno >= logging.WARNING:
+            return True
+        with self._lock:
+            self.seen += 1
+            if (self.seen - 1) % self.every == 0:
+                return True
+            self.suppressed += 1
+            return False
+    
+    def counts(self) -> Tuple[int, int]:
+        """Return (seen, suppressed)"""
+        with self._lock:
+            return self.seen, self.suppressed
+    
+    def add(self, seen: int, suppressed: int):
+        """Count records sampled in another process, e.g. a parser worker"""
+        with self._lock:
+            self.seen += seen
+            self.suppressed += suppressed
+
+class FanOutHandler(logging.Handler):
+    """Passes each record to several handlers, so a filter on it sees the record once"""
+    
+    def __init__(self, handlers):
+        super().__init__()
+        self.handlers = list(handlers)
+    
+    def emit(self, record: logging.LogRecord):
+        for handler in self.handlers:
+            if record.levelno >= handler.level:
+                handler.handle(record)
+    
+    def flush(self):
+        for handler in self.handlers:
+            handler.flush()
+    
+    def close(self):
+        for handler in self.handlers:
+            handler.close()
+        super().close()
+
+def setup_logging(log_level: str = "INFO", logging_config: Optional[Dict[str, Any]] = None,
+                  sampling_summary: bool = True) -> logging.Logger:
+    """Setup logging configuration
+    
+    Processes whose sampled-out counts are reported by a parent pass sampling_summary=False.
+    """
+    global _listener, _sampler, _sampling_summary
+    logging_config = logging_config or {}
+    log_level = logging_config.get('level', log_level)
+    
+    formatter = JsonFormatter() if logging_config.get('format') == 'json' else logging.Formatter(TEXT_FORMAT)
+    handlers = []
+    if logging_config.get('file', 'resume_screening.log'):
+        handlers.append(logging.FileHandler(logging_config.get('file', 'resume_screening.log')))
+    if logging_config.get('console', True):
+        handlers.append(logging.StreamHandler())
+    for handler in handlers:
+        handler.setFormatter(formatter)
+    
+    if _sampler is None:
+        atexit.register(_flush_logging)
+    _sampler = sampler = PerResumeSampler(logging_config.get('per_resume_sample_every', 1))
+    _sampling_summary = sampling_summary
+    
+    root = logging.getLogger()
+    root.setLevel(getattr(logging, log_level.upper()))
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+    
+    if logging_config.get('async', False):
+        # Hot-loop threads only enqueue; formatting and I/O happen on the listener thread
+        queue_handler = logging.handlers.QueueHandler(queue.SimpleQueue())
+        queue_handler.addFilter(sampler)
+        root.addHandler(queue_handler)
+        _listener = logging.handlers.QueueListener(queue_handler.queue, *handlers, respect_handler_level=True)
+        _listener.start()
+    elif handlers:
+        # One handler carries the sampler, so every record is counted once and reaches all outputs alike
+        fan_out = FanOutHandler(handlers)
+        fan_out.addFilter(sampler)
+        root.addHandler(fan_out)
     
     return logging.getLogger(__name__)
 
+def log_sampler() -> Optional[PerResumeSampler]:
+    """Return the per-resume sampler of the current logging setup"""
+    return _sampler
+
+def _flush_logging():
+    """Report sampled-out records and drain the async log queue"""
+    global _listener
+    if _sampling_summary and _sampler is not None and _sampler.suppressed:
+        logging.getLogger(__name__).info(
+            f"Sampled out {_sampler.suppressed} of {_sampler.seen} per-resume log records",
+            extra={'sampled_out': _sampler.suppressed, 'per_resume_records': _sampler.seen}
+        )
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
 def load_config(config_path: str) -> Dict[str, Any]:
     """Load configuration from JSON file"""
     config_file = Path(config_path)
@@ -44,8 +179,92 @@ def load_config(config_path: str) -> Dict[str, Any]:
             },
             "processing": {
                 "max_resume_size_mb": 10,
-                "supported_formats": ["pdf"],
-                "max_candidates": 100
+                "supported_formats": ["pdf", "docx", "txt", "html"],
+                "max_candidates": 100,
+                "workers": 1,
+                "max_in_flight_per_worker": 4,
+                "contact_header_chars": 2048,
+                "location_regions": None
+            },
+            "extraction": {
+                "pdf_backend": "auto",
+                "cache_enabled": True,
+                "cache_dir": "./cache/extractions",
+                "memory_cache_entries": 256
+            },
+            "dedup": {
+                "enabled": True,
+                "threshold": 0.85,
+                "num_perm": 64,
+                "bands": 16,
+                "shingle_size": 5
+            },
+            "corpus": {
+                "enabled": False
+            },
+            "skills": {
+                "taxonomy_file": "skills_taxonomy.json",
+                "cache_file": "./cache/skills_taxonomy.pkl",
+                "reload_interval_seconds": 5
+            },
+            "ocr": {
+                "enabled": False,
+                "tesseract_cmd": "tesseract",
+                "language": "eng",
+                "dpi": 300,
+                "workers": 1,
+                "max_pending": 16,
+                "max_pages": 5,
+                "page_timeout_seconds": 30
+            },
+            "mailbox": {
+                "state_file": "./cache/mailbox_state.json",
+                "max_message_mb": 50
+            },
+            "io": {
+                "prefetch_depth": 8,
+                "prefetch_workers": 4,
+                "prefetch_max_mb": 256
+            },
+            "scheduling": {
+                "enabled": True,
+                "history_file": "./cache/parse_costs.json",
+                "max_history_entries": 100000
+            },
+            "knockout": {
+                "enabled": True,
+                "partial_pages": 2,
+                "partial_kb": 16
+            },
+            "sharding": {
+                "top_k": 100
+            },
+            "results": {
+                "indexed": True,
+                "explain_top": 25,
+                "export": None
+            },
+            "history": {
+                "enabled": True,
+                "path": "./output/history",
+                "compact_files": 32
+            },
+            "candidate_index": {
+                "path": "./output/candidate_index",
+                "n_features": 32768,
+                "dimensions": 128,
+                "lists": 0,
+                "nprobe": 32,
+                "shortlist": 2000,
+                "skill_weight": 3
+            },
+            "logging": {
+                "level": "INFO",
+                "file": "resume_screening.log",
+                "console": True,
+                "format": "text",
+                "async": True,
+                "per_resume_sample_every": 100
             }
         }
         